@@ -0,0 +1,69 @@
+"""検索条件と外部キーのインデックス追加
+
+Revision ID: 8c3e1f5a7b29
+Revises: 5ce1a9d6f449
+Create Date: 2026-10-19 10:12:31.418205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3e1f5a7b29"
+down_revision: Union[str, Sequence[str], None] = "5ce1a9d6f449"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (インデックス名, テーブル名, カラム)
+_INDEXES = [
+    ("ix_daily_reports_report_date", "daily_reports", ["report_date"]),
+    ("ix_visit_records_daily_report_id", "visit_records", ["daily_report_id"]),
+    ("ix_visit_records_customer_id", "visit_records", ["customer_id"]),
+    ("ix_comments_daily_report_id", "comments", ["daily_report_id"]),
+]
+
+
+def _drop_invalid_index(name: str, table_name: str) -> None:
+    """CONCURRENTLY での作成に失敗して残った INVALID なインデックスを削除する。
+
+    INVALID なインデックスも IF NOT EXISTS では存在するものとして扱われ、
+    再実行しても作成されないため、先に削除しておく。
+    """
+    invalid = op.get_bind().exec_driver_sql(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = %(name)s AND NOT i.indisvalid",
+        {"name": name},
+    )
+    if invalid.first() is not None:
+        op.drop_index(name, table_name=table_name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 稼働中のテーブルへの書き込みを止めないよう CONCURRENTLY で作成する
+    # （トランザクション内では実行できないため autocommit で実行する）
+    with op.get_context().autocommit_block():
+        for name, table_name, columns in _INDEXES:
+            _drop_invalid_index(name, table_name)
+            op.create_index(
+                op.f(name),
+                table_name,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table_name, _ in reversed(_INDEXES):
+            op.drop_index(
+                op.f(name),
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
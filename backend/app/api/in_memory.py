@@ -0,0 +1,55 @@
+"""インメモリのリポジトリへの差し替え。
+
+各ルーターのサービスと認証のユーザー取得を dependency_overrides で差し替え、
+DBを使わずにAPIを動かす。REPOSITORY_BACKEND=memory での起動時と、
+DBを使わないテストで使用する。
+"""
+
+from fastapi import FastAPI
+
+from app.api.v1 import auth, customers, reports, users
+from app.core.dependencies import get_user_repository
+from app.read_models.in_memory import (
+    InMemoryCustomerReadModel,
+    InMemoryReportReadModel,
+    InMemoryUserReadModel,
+)
+from app.repositories.in_memory import (
+    InMemoryCommentRepository,
+    InMemoryCustomerRepository,
+    InMemoryReportRepository,
+    InMemoryStore,
+    InMemoryUserRepository,
+    InMemoryVisitRecordRepository,
+)
+from app.services.auth_service import AuthService
+from app.services.comment_service import CommentService
+from app.services.customer_service import CustomerService
+from app.services.report_service import ReportService
+from app.services.user_service import UserService
+
+
+def use_in_memory_repositories(application: FastAPI, store: InMemoryStore) -> None:
+    """アプリケーションのリポジトリを store を参照するものに差し替える。"""
+    application.dependency_overrides.update(
+        {
+            get_user_repository: lambda: InMemoryUserRepository(store),
+            auth._get_auth_service: lambda: AuthService(InMemoryUserRepository(store)),
+            reports._get_report_service: lambda: ReportService(
+                InMemoryReportRepository(store),
+                InMemoryVisitRecordRepository(store),
+                InMemoryReportReadModel(store),
+            ),
+            reports._get_comment_service: lambda: CommentService(
+                InMemoryCommentRepository(store), InMemoryReportRepository(store)
+            ),
+            customers._get_customer_service: lambda: CustomerService(
+                InMemoryCustomerRepository(store),
+                InMemoryCustomerReadModel(store),
+            ),
+            users._get_user_service: lambda: UserService(
+                InMemoryUserRepository(store),
+                InMemoryUserReadModel(store),
+            ),
+        }
+    )
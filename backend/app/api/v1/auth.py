@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.deadline import DeadlineRoute
 from app.core.dependencies import get_current_user
 from app.core.security import (
     COOKIE_NAME,
@@ -18,7 +19,7 @@ from app.schemas.auth import LoginRequest, LoginResponse, UserResponse
 from app.schemas.common import DataResponse
 from app.services.auth_service import AuthService
 
-router = APIRouter(prefix="/auth", tags=["認証"])
+router = APIRouter(prefix="/auth", tags=["認証"], route_class=DeadlineRoute)
 
 
 def _get_auth_service(
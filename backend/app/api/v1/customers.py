@@ -4,26 +4,27 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.deadline import DeadlineRoute
 from app.core.dependencies import get_current_user
 from app.models.user import User
+from app.read_models.customer_read_model import CustomerReadModel
 from app.repositories.customer_repository import CustomerRepository
 from app.schemas.common import DataResponse, create_paginated_response
 from app.schemas.customer import (
     CustomerCreateRequest,
-    CustomerListItemResponse,
     CustomerResponse,
     CustomerUpdateRequest,
 )
 from app.services.customer_service import CustomerService
 
-router = APIRouter(prefix="/customers", tags=["顧客"])
+router = APIRouter(prefix="/customers", tags=["顧客"], route_class=DeadlineRoute)
 
 
 def _get_customer_service(
     db: AsyncSession = Depends(get_db),  # noqa: B008
 ) -> CustomerService:
     """顧客サービスの依存注入。"""
-    return CustomerService(CustomerRepository(db))
+    return CustomerService(CustomerRepository(db), CustomerReadModel(db))
 
 
 @router.get("")
@@ -38,7 +39,7 @@ async def get_customers(
     current_user: User = Depends(get_current_user),  # noqa: B008
 ):
     """顧客一覧を取得する。"""
-    customers, total_count = await service.get_list(
+    rows, total_count = await service.get_list_rows(
         company_name=company_name,
         contact_name=contact_name,
         sort=sort,
@@ -47,10 +48,7 @@ async def get_customers(
         per_page=per_page,
     )
 
-    data = [
-        CustomerListItemResponse.model_validate(c).model_dump(mode="json")
-        for c in customers
-    ]
+    data = [row.to_response() for row in rows]
     return create_paginated_response(
         data=data,
         total_count=total_count,
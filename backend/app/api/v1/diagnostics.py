@@ -0,0 +1,107 @@
+"""診断エンドポイント（MANAGERのみ）。"""
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.allocation_tracker import allocation_tracker
+from app.core.deadline import DeadlineRoute
+from app.core.dependencies import require_role
+from app.core.loop_monitor import loop_monitor
+from app.core.query_metrics import query_metrics
+from app.core.retry import retry_stats
+from app.core.slow_query import slow_query_log
+from app.models.user import User, UserRole
+from app.schemas.common import DataResponse
+from app.schemas.diagnostics import (
+    BlockingCallResponse,
+    MemoryStatsResponse,
+    RetryStatResponse,
+    SlowQueryResponse,
+    SqlCacheStatsResponse,
+)
+
+router = APIRouter(prefix="/diagnostics", tags=["診断"], route_class=DeadlineRoute)
+
+
+@router.get(
+    "/slow-queries",
+    response_model=DataResponse[list[SlowQueryResponse]],
+)
+async def get_slow_queries(
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """スロークエリの集計を最大実行時間の降順で返す。"""
+    data = [SlowQueryResponse(**s) for s in slow_query_log.snapshot()]
+    return DataResponse(data=data)
+
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries(
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """スロークエリの集計を破棄する。"""
+    slow_query_log.clear()
+
+
+@router.get(
+    "/retries",
+    response_model=DataResponse[list[RetryStatResponse]],
+)
+async def get_retry_stats(
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """一時的なDB障害によるリトライの集計を返す。"""
+    data = [RetryStatResponse(**s) for s in retry_stats.snapshot()]
+    return DataResponse(data=data)
+
+
+@router.get("/sql-cache", response_model=DataResponse[SqlCacheStatsResponse])
+async def get_sql_cache_stats(
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """コンパイル済みSQLキャッシュのヒット率を返す。"""
+    return DataResponse(data=SqlCacheStatsResponse(**query_metrics.cache_snapshot()))
+
+
+@router.get("/memory", response_model=DataResponse[MemoryStatsResponse])
+async def get_memory_stats(
+    limit: int = Query(default=50, ge=1, le=1000),
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """tracemalloc によるルート・割り当て箇所ごとのメモリ割り当てを返す。
+
+    MEMORY_PROFILING_ENABLED を有効にして起動した場合のみ集計される。
+    """
+    return DataResponse(
+        data=MemoryStatsResponse(**allocation_tracker.snapshot(limit=limit))
+    )
+
+
+@router.delete("/memory", status_code=204)
+async def clear_memory_stats(
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """メモリ割り当ての集計を破棄する。"""
+    allocation_tracker.clear()
+
+
+@router.get(
+    "/blocking-calls",
+    response_model=DataResponse[list[BlockingCallResponse]],
+)
+async def get_blocking_calls(
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """イベントループをブロックしたスタックの集計をブロック時間の合計の降順で返す。
+
+    LOOP_BLOCKING_THRESHOLD_MS を 0 以上にして起動した場合のみ集計される。
+    """
+    data = [BlockingCallResponse(**s) for s in loop_monitor.snapshot()]
+    return DataResponse(data=data)
+
+
+@router.delete("/blocking-calls", status_code=204)
+async def clear_blocking_calls(
+    _current_user: User = Depends(require_role(UserRole.MANAGER)),  # noqa: B008
+):
+    """イベントループのブロックの集計を破棄する。"""
+    loop_monitor.clear()
@@ -6,8 +6,11 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.deadline import DeadlineRoute
 from app.core.dependencies import get_current_user
+from app.core.tracing import traced
 from app.models.user import User
+from app.read_models.report_read_model import ReportReadModel
 from app.repositories.comment_repository import CommentRepository
 from app.repositories.report_repository import ReportRepository
 from app.repositories.visit_record_repository import (
@@ -31,14 +34,18 @@ from app.schemas.report import (
 from app.services.comment_service import CommentService
 from app.services.report_service import ReportService
 
-router = APIRouter(prefix="/reports", tags=["日報"])
+router = APIRouter(prefix="/reports", tags=["日報"], route_class=DeadlineRoute)
 
 
 def _get_report_service(
     db: AsyncSession = Depends(get_db),  # noqa: B008
 ) -> ReportService:
     """日報サービスの依存注入。"""
-    return ReportService(ReportRepository(db), VisitRecordRepository(db))
+    return ReportService(
+        ReportRepository(db),
+        VisitRecordRepository(db),
+        ReportReadModel(db),
+    )
 
 
 def _get_comment_service(
@@ -65,6 +72,7 @@ def _build_list_item(report) -> dict:
     ).model_dump(mode="json")
 
 
+@traced("_build_detail_response")
 def _build_detail_response(report) -> ReportDetailResponse:
     """日報詳細レスポンスを構築する。"""
     visit_records = [
@@ -104,6 +112,7 @@ def _build_detail_response(report) -> ReportDetailResponse:
     )
 
 
+@traced("_build_create_update_response")
 def _build_create_update_response(
     report,
 ) -> ReportCreateUpdateResponse:
@@ -159,7 +168,7 @@ async def get_reports(
     current_user: User = Depends(get_current_user),  # noqa: B008
 ):
     """日報一覧を取得する。"""
-    reports, total_count = await service.get_list(
+    rows, total_count = await service.get_list_rows(
         current_user,
         date_from=date_from,
         date_to=date_to,
@@ -171,7 +180,7 @@ async def get_reports(
         per_page=per_page,
     )
 
-    data = [_build_list_item(r) for r in reports]
+    data = [row.to_response() for row in rows]
     return create_paginated_response(
         data=data,
         total_count=total_count,
@@ -0,0 +1,151 @@
+"""DBを使うリクエストの流入制御（アドミッションコントロール）。
+
+同時に処理するリクエスト数を参照系・更新系それぞれの枠でコネクションプールの
+容量以内に抑える。枠が埋まっている場合は短時間だけ待機させ、待機上限や
+待ち行列の上限を超えたリクエストは 503 と Retry-After で即座に拒否する。
+過負荷時にプール待ちのタイムアウトが連鎖するのではなく、処理できる分だけを
+処理して残りを速やかに返す。
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core.metrics import registry
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+class AdmissionBudget:
+    """同時実行数の上限と待ち行列を持つ1つの枠。"""
+
+    def __init__(self, name: str, *, limit: int, max_queue: int, max_wait_ms: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait_ms = max_wait_ms
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w.done())
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncGenerator[None]:
+        """枠を確保してから処理を実行する。確保できない場合は拒否する。"""
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        if self.waiting >= self.max_queue:
+            self._reject()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.max_wait_ms / 1000):
+                await waiter
+        except TimeoutError:
+            # タイムアウトと同時に枠を譲り受けていた場合はそのまま処理する
+            if waiter.done() and not waiter.cancelled():
+                return
+            self._waiters.remove(waiter)
+            self._reject()
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self) -> None:
+        # 待機中のリクエストがあれば、枠を解放せずにそのまま引き渡す
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise ServiceUnavailableError(
+            retry_after=settings.admission_retry_after_seconds
+        )
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionController:
+    """参照系と更新系の枠を HTTP メソッドで振り分ける。"""
+
+    def __init__(self, *, read: AdmissionBudget, write: AdmissionBudget):
+        self.read = read
+        self.write = write
+
+    def budget_for(self, method: str) -> AdmissionBudget:
+        return self.read if method in _READ_METHODS else self.write
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {"read": self.read.snapshot(), "write": self.write.snapshot()}
+
+
+admission = AdmissionController(
+    read=AdmissionBudget(
+        "read",
+        limit=settings.admission_read_limit,
+        max_queue=settings.admission_max_queue,
+        max_wait_ms=settings.admission_max_wait_ms,
+    ),
+    write=AdmissionBudget(
+        "write",
+        limit=settings.admission_write_limit,
+        max_queue=settings.admission_max_queue,
+        max_wait_ms=settings.admission_max_wait_ms,
+    ),
+)
+
+
+def _budget_samples(attribute: str) -> list[tuple[tuple[str], int]]:
+    return [
+        ((budget.name,), getattr(budget, attribute))
+        for budget in (admission.read, admission.write)
+    ]
+
+
+# プール待ちが起きないよう流入を制限しているため、waiting がプールの待ち数に相当する
+registry.gauge(
+    "admission_in_flight",
+    "枠を確保して処理中のリクエスト数",
+    ("budget",),
+    lambda: _budget_samples("in_flight"),
+)
+registry.gauge(
+    "admission_waiting",
+    "枠の空きを待っているリクエスト数",
+    ("budget",),
+    lambda: _budget_samples("waiting"),
+)
+registry.collected_counter(
+    "admission_rejected_total",
+    "過負荷のため 503 で拒否したリクエスト数",
+    ("budget",),
+    lambda: _budget_samples("rejected"),
+)
@@ -0,0 +1,233 @@
+"""tracemalloc によるルートごとのメモリ割り当ての追跡（診断モード）。
+
+memory_profiling_enabled を有効にすると、API リクエストの前後で tracemalloc の
+スナップショットを取り、次の値を集計する。
+
+- ルートごと: リクエスト中のピーク増加量と、リクエスト後に残った正味の増加量
+- 割り当て箇所ごと: リクエスト後に残ったメモリの量。箇所はトレースバックの中で
+  最も内側の app/ 配下のフレーム（site。ミドルウェアなど app/core/ の共通処理は
+  除く）と、実際に割り当てたフレーム（origin）の組で表す。ORM のアイデンティティ
+  マップや Pydantic の中間オブジェクトがどのルート・どのアプリケーションコード
+  から残っているかを確認できる。
+
+tracemalloc はプロセス全体の割り当てを追跡するため、他のリクエストの割り当てが
+混ざらないよう、有効な間は API リクエストを1件ずつ順に処理する。さらに
+スナップショットの取得と比較にはヒープの大きさに比例した時間がかかるため、
+スループットは大きく下がる。ステージングや負荷試験の環境でのみ有効にすること。
+"""
+
+import asyncio
+import functools
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import UNMATCHED_ROUTE
+from app.core.profiling import short_path
+
+# 集計する割り当て箇所の上限（超過分は記録しない）
+_MAX_SITES = 1000
+# 集計の取得・破棄自体は計測しない
+_DIAGNOSTICS_PREFIX = "/api/v1/diagnostics/"
+
+# 割り当てたフレームがこれらのファイルのトレースは集計しない（スナップショットなど）。
+# Snapshot.filter_traces は全トレースを fnmatch で照合して遅いため、差分の
+# トレースだけをファイル名の一致で除外する
+_EXCLUDED_FILES = frozenset(
+    {
+        tracemalloc.__file__,
+        __file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+        "<unknown>",
+    }
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _attribute(frames: tuple[tuple[str, int], ...]) -> tuple[str | None, str]:
+    """トレースバックを (site, origin) の表記にする。
+
+    frames は割り当てたフレームから順に並んだ (ファイル名, 行番号) のタプル。
+    """
+    labels = [(short_path(filename), lineno) for filename, lineno in frames]
+    site = next(
+        (
+            f"{path}:{lineno}"
+            for path, lineno in labels
+            if path.startswith("app/") and not path.startswith("app/core/")
+        ),
+        None,
+    )
+    path, lineno = labels[0]
+    return site, f"{path}:{lineno}"
+
+
+@dataclass(slots=True)
+class Measurement:
+    """追跡中のリクエストの開始時点の状態。"""
+
+    snapshot: tracemalloc.Snapshot
+    traced_bytes: int
+
+
+class _RouteStats:
+    """1ルート分の集計値。"""
+
+    __slots__ = ("route", "count", "peak_total", "peak_max", "net_total")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.count = 0
+        self.peak_total = 0
+        self.peak_max = 0
+        self.net_total = 0
+
+    def add(self, peak: int, net: int) -> None:
+        self.count += 1
+        self.peak_total += peak
+        self.peak_max = max(self.peak_max, peak)
+        self.net_total += net
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "route": self.route,
+            "count": self.count,
+            "avg_peak_bytes": self.peak_total // self.count,
+            "max_peak_bytes": self.peak_max,
+            "avg_net_bytes": self.net_total // self.count,
+            "total_net_bytes": self.net_total,
+        }
+
+
+class AllocationTracker:
+    """リクエスト前後のスナップショットの差分をルート・割り当て箇所ごとに集計する。"""
+
+    def __init__(self) -> None:
+        self._started = False
+        self._routes: dict[str, _RouteStats] = {}
+        # (ルート, site, origin) ごとの [残ったリクエスト数, バイト数, ブロック数]
+        self._sites: dict[tuple[str, str | None, str], list[int]] = {}
+
+    @property
+    def active(self) -> bool:
+        return self._started and tracemalloc.is_tracing()
+
+    def start(self, nframes: int) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+            self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def begin(self) -> Measurement:
+        """リクエストの計測を開始する。"""
+        snapshot = tracemalloc.take_snapshot()
+        traced_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        return Measurement(snapshot, traced_bytes)
+
+    def end(self, route: str, measurement: Measurement) -> None:
+        """リクエストの計測を終了し、開始時点との差分を集計する。"""
+        traced_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = _RouteStats(route)
+        stats.add(
+            peak_bytes - measurement.traced_bytes,
+            traced_bytes - measurement.traced_bytes,
+        )
+
+        # 開始時点になかったトレース（リクエスト中に割り当てられ、残っているもの）を
+        # 数える。公開 API の Trace は比較のたびにトレースバックを Python でハッシュし、
+        # 数万件のトレースでは秒単位かかるため、内部の (domain, size, traceback, ...)
+        # のタプルを C 実装の Counter と集合演算で比較する
+        before = Counter(measurement.snapshot.traces._traces)
+        after_counts = Counter(after.traces._traces)
+        retained: dict[tuple[str | None, str], list[int]] = {}
+        for trace, count in after_counts.items() - before.items():
+            count -= before.get(trace, 0)
+            frames = trace[2]
+            if count <= 0 or not frames or frames[0][0] in _EXCLUDED_FILES:
+                continue
+            totals = retained.setdefault(_attribute(frames), [0, 0])
+            totals[0] += trace[1] * count
+            totals[1] += count
+        for (site, origin), (size, blocks) in retained.items():
+            key = (route, site, origin)
+            values = self._sites.get(key)
+            if values is None:
+                if len(self._sites) >= _MAX_SITES:
+                    continue
+                values = self._sites[key] = [0, 0, 0]
+            values[0] += 1
+            values[1] += size
+            values[2] += blocks
+
+    def snapshot(self, limit: int = 50) -> dict[str, Any]:
+        """ルートを正味の増加量の平均の降順で、割り当て箇所を上位 limit 件で返す。"""
+        routes = sorted(
+            (s.to_dict() for s in self._routes.values()),
+            key=lambda r: r["avg_net_bytes"],
+            reverse=True,
+        )
+        sites = sorted(self._sites.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "enabled": self.active,
+            "tracked_requests": sum(s.count for s in self._routes.values()),
+            "routes": routes,
+            "sites": [
+                {
+                    "route": route,
+                    "site": site,
+                    "origin": origin,
+                    "requests": requests,
+                    "net_bytes": size,
+                    "net_blocks": blocks,
+                }
+                for (route, site, origin), (requests, size, blocks) in sites[:limit]
+            ],
+        }
+
+    def clear(self) -> None:
+        """集計結果を破棄する。"""
+        self._routes.clear()
+        self._sites.clear()
+
+
+allocation_tracker = AllocationTracker()
+
+
+class AllocationTrackingMiddleware:
+    """API リクエストの前後でメモリ割り当てを計測する ASGI ミドルウェア。"""
+
+    def __init__(self, app: ASGIApp, tracker: AllocationTracker = allocation_tracker):
+        self.app = app
+        self.tracker = tracker
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.tracker.active
+            or not scope["path"].startswith("/api/")
+            or scope["path"].startswith(_DIAGNOSTICS_PREFIX)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async with self._lock:
+            measurement = self.tracker.begin()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = scope.get("route")
+                route_path = route.path if route is not None else UNMATCHED_ROUTE
+                self.tracker.end(f"{scope['method']} {route_path}", measurement)
@@ -0,0 +1,129 @@
+"""DB接続のサーキットブレーカー。
+
+DBに接続できない状態で全リクエストが接続タイムアウトまで待つと、ワーカーと
+ソケットが枯渇する。接続の失敗が連続したらブレーカーを開き、一定時間は接続を
+試みずに 503 を即座に返す。時間経過後は半開状態として1件ずつ試行接続を通し、
+成功したら閉じる。
+
+接続の成否は do_connect イベントで新規接続の確立時にのみ判定するため、
+クエリ自体のエラーはブレーカーの状態に影響しない。
+"""
+
+import enum
+import logging
+import math
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+_UNAVAILABLE_MESSAGE = "データベースに接続できません。時間をおいて再度お試しください"
+
+
+class CircuitState(enum.StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """連続した接続失敗で開くサーキットブレーカー。"""
+
+    def __init__(self, *, failure_threshold: int, reset_timeout_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def check(self) -> None:
+        """開いている間はリクエストを即座に拒否する。"""
+        self._advance()
+        if self.state == CircuitState.OPEN:
+            raise self._unavailable()
+
+    def before_connect(self) -> None:
+        """新規接続の前に呼ぶ。半開状態では試行接続を1件に制限する。"""
+        self._advance()
+        if self.state == CircuitState.OPEN:
+            raise self._unavailable()
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                raise self._unavailable()
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state != CircuitState.CLOSED:
+            logger.info("DB接続が回復したためサーキットブレーカーを閉じました")
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                logger.error(
+                    "DB接続の失敗が続いたためサーキットブレーカーを開きました: "
+                    "failures=%d",
+                    self.consecutive_failures,
+                )
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict[str, Any]:
+        self._advance()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+    def _advance(self) -> None:
+        if self.state == CircuitState.OPEN and self._remaining_seconds() <= 0:
+            self.state = CircuitState.HALF_OPEN
+
+    def _remaining_seconds(self) -> float:
+        elapsed = time.monotonic() - self._opened_at
+        return self.reset_timeout_seconds - elapsed
+
+    def _unavailable(self) -> ServiceUnavailableError:
+        retry_after = max(1, math.ceil(self._remaining_seconds()))
+        return ServiceUnavailableError(_UNAVAILABLE_MESSAGE, retry_after=retry_after)
+
+    def install(self, engine: AsyncEngine) -> None:
+        """エンジンの新規接続をブレーカー経由にする。"""
+        event.listen(engine.sync_engine, "do_connect", self._connect)
+
+    def uninstall(self, engine: AsyncEngine) -> None:
+        event.remove(engine.sync_engine, "do_connect", self._connect)
+
+    def _connect(self, dialect, conn_rec, cargs, cparams):
+        self.before_connect()
+        try:
+            connection = dialect.connect(*cargs, **cparams)
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # キャンセル等は接続失敗として数えない
+            self._probe_in_flight = False
+            raise
+        self.record_success()
+        return connection
+
+
+db_circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.db_circuit_failure_threshold,
+    reset_timeout_seconds=settings.db_circuit_reset_timeout_seconds,
+)
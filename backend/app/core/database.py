@@ -1,22 +1,73 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session, raiseload
 
+from app.core.circuit_breaker import db_circuit_breaker
 from app.core.config import settings
+from app.core.leak_detector import LeakTrackingAsyncSession, leak_detector
+from app.core.metrics import install_pool_metrics
+from app.core.query_metrics import query_metrics
+from app.core.slow_query import slow_query_log
+from app.core.tracing import install_sql_tracing
 
-engine = create_async_engine(settings.database_url, echo=False)
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+)
+slow_query_log.install(engine)
+query_metrics.install(engine)
+install_pool_metrics(engine)
+install_sql_tracing(engine)
+db_circuit_breaker.install(engine)
 
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+if settings.leak_detection_enabled:
+    leak_detector.install(engine)
+
+async_session = async_sessionmaker(
+    engine,
+    class_=(
+        LeakTrackingAsyncSession if settings.leak_detection_enabled else AsyncSession
+    ),
+    expire_on_commit=False,
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+@event.listens_for(Session, "do_orm_execute")
+def _apply_strict_loading(orm_execute_state: ORMExecuteState) -> None:
+    """strict_loading が有効な場合、ORMのSELECTに raiseload("*") を付与する。
+
+    ローダーオプションで明示していないリレーションへのアクセスは遅延ロードせずに
+    例外となるため、想定外の N+1 や MissingGreenlet をテストで検出できる。
+    リフレッシュや遅延ロード自体のクエリは対象外とする。
+    """
+    if not settings.strict_loading:
+        return
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*")
+        )
+
+
 async def get_db() -> AsyncGenerator[AsyncSession]:
-    """FastAPI Depends 用の非同期ジェネレータ。"""
+    """FastAPI Depends 用の非同期ジェネレータ。
+
+    DB接続のサーキットブレーカーが開いている間はセッションを作らずに 503 を返す。
+    """
+    db_circuit_breaker.check()
     async with async_session() as session:
         yield session
 
@@ -0,0 +1,180 @@
+"""リクエストのデッドライン管理。
+
+ルートを一覧・詳細・更新系に分類し、種別ごとの上限時間をリクエストに設定する。
+上限はトランザクション開始時に残り時間を SET LOCAL statement_timeout として
+PostgreSQL にも伝播するため、クライアントが諦めた後もクエリがコネクションを
+握り続けることはない。クライアント切断時はハンドラをキャンセルし、
+asyncpg 経由で実行中のクエリもキャンセルする。
+"""
+
+import asyncio
+import enum
+import logging
+import time
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.exceptions import RequestTimeoutError
+from app.core.profiling import profile_handler
+from app.core.tracing import start_span, traced
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL の query_canceled（statement_timeout 超過・キャンセル要求）
+_QUERY_CANCELED_SQLSTATE = "57014"
+
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# 現在のリクエストのデッドライン（time.monotonic 基準の絶対時刻）
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class RouteKind(enum.StrEnum):
+    LIST = "LIST"
+    DETAIL = "DETAIL"
+    WRITE = "WRITE"
+
+
+def classify_route(route: APIRoute) -> RouteKind:
+    """HTTPメソッドとパスパラメータの有無からルート種別を判定する。"""
+    if route.methods & _WRITE_METHODS:
+        return RouteKind.WRITE
+    if route.param_convertors:
+        return RouteKind.DETAIL
+    return RouteKind.LIST
+
+
+def get_timeout_ms(route: APIRoute) -> int:
+    """ルートの上限時間（ミリ秒）を返す。ルート名での個別指定を優先する。"""
+    override = settings.request_timeout_overrides.get(route.name)
+    if override is not None:
+        return override
+    return {
+        RouteKind.LIST: settings.request_timeout_list_ms,
+        RouteKind.DETAIL: settings.request_timeout_detail_ms,
+        RouteKind.WRITE: settings.request_timeout_write_ms,
+    }[classify_route(route)]
+
+
+def remaining_ms() -> float | None:
+    """現在のリクエストの残り時間（ミリ秒）を返す。デッドライン外ではNone。"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return (deadline - time.monotonic()) * 1000
+
+
+def is_query_canceled(exc: BaseException) -> bool:
+    """statement_timeout 超過などでクエリがキャンセルされた例外か判定する。"""
+    if not isinstance(exc, DBAPIError):
+        return False
+    return getattr(exc.orig, "sqlstate", None) == _QUERY_CANCELED_SQLSTATE
+
+
+class DeadlineRoute(APIRoute):
+    """ルート種別ごとの上限時間でハンドラを実行する APIRoute。
+
+    トレース対象のリクエストでは、依存関係の解決・検証・シリアライズを含む
+    ハンドラ全体と、エンドポイント関数の実行をそれぞれスパンとして記録する。
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(
+            path, traced(f"endpoint {endpoint.__name__}")(endpoint), **kwargs
+        )
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        # プロファイル対象のリクエストではデッドライン内のハンドラ実行を計測する
+        handler = profile_handler(super().get_route_handler())
+
+        async def _handler(request: Request) -> Response:
+            timeout = get_timeout_ms(self) / 1000
+            token = _deadline.set(time.monotonic() + timeout)
+            try:
+                async with asyncio.timeout(timeout):
+                    with start_span(f"handler {self.name}"):
+                        return await handler(request)
+            except TimeoutError as err:
+                raise RequestTimeoutError() from err
+            except DBAPIError as err:
+                if is_query_canceled(err):
+                    raise RequestTimeoutError() from err
+                raise
+            finally:
+                _deadline.reset(token)
+
+        return _handler
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    """リクエスト内のトランザクションに残り時間の statement_timeout を設定する。"""
+    remaining = remaining_ms()
+    if remaining is None:
+        return
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {max(1, int(remaining))}"
+    )
+
+
+class CancelOnDisconnectMiddleware:
+    """クライアント切断時に処理中のリクエストをキャンセルするASGIミドルウェア。"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queue: asyncio.Queue[Message] = asyncio.Queue()
+        response_complete = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_complete
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_complete = True
+
+        app_task = asyncio.create_task(self.app(scope, queue.get, send_tracking))
+        disconnected = False
+
+        async def _watch_disconnect() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                queue.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    # レスポンスを送り終えた後の切断では後処理を中断しない
+                    if not app_task.done() and not response_complete:
+                        disconnected = True
+                        app_task.cancel()
+                    return
+
+        watcher = asyncio.create_task(_watch_disconnect())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+            logger.info(
+                "クライアント切断のためリクエストを中断しました: %s %s",
+                scope["method"],
+                scope["path"],
+            )
+        finally:
+            watcher.cancel()
+            if not app_task.done():
+                app_task.cancel()
@@ -1,17 +1,24 @@
 from collections.abc import Callable
 
 from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.security import COOKIE_NAME, decode_access_token
 from app.models.user import User, UserRole
+from app.repositories.user_repository import UserRepository
+
+
+def get_user_repository(
+    db: AsyncSession = Depends(get_db),  # noqa: B008
+) -> UserRepository:
+    """認証で使うユーザーリポジトリの依存注入。"""
+    return UserRepository(db)
 
 
 async def get_current_user(
     request: Request,
-    db: AsyncSession = Depends(get_db),  # noqa: B008
+    user_repository: UserRepository = Depends(get_user_repository),  # noqa: B008
 ) -> User:
     """CookieからJWTトークンを取得し、認証済みユーザーを返す。"""
     token = request.cookies.get(COOKIE_NAME)
@@ -28,14 +35,15 @@ async def get_current_user(
             detail="認証が必要です",
         )
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await user_repository.find_by_id(user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="認証が必要です",
         )
 
+    # アクセスログに記録する
+    request.state.user_id = user.id
     return user
 
 
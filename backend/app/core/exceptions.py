@@ -1,6 +1,6 @@
 """API仕様書に準拠したカスタム例外クラス。
 
-各HTTPステータスコード（400, 401, 403, 404, 409）に対応した例外を定義する。
+各HTTPステータスコード（400, 401, 403, 404, 409, 503, 504）に対応した例外を定義する。
 """
 
 
@@ -21,6 +21,11 @@ class AppError(Exception):
         self.details = details
         super().__init__(self.message)
 
+    @property
+    def headers(self) -> dict[str, str] | None:
+        """レスポンスに付与するHTTPヘッダー。"""
+        return None
+
 
 class ValidationError(AppError):
     """バリデーションエラー（400 Bad Request）。"""
@@ -60,3 +65,27 @@ class ConflictError(AppError):
     status_code = 409
     error_code = "CONFLICT"
     message = "リソースが競合しています"
+
+
+class ServiceUnavailableError(AppError):
+    """過負荷による受付拒否エラー（503 Service Unavailable）。"""
+
+    status_code = 503
+    error_code = "SERVICE_UNAVAILABLE"
+    message = "混み合っているため処理できませんでした。時間をおいて再度お試しください"
+
+    def __init__(self, message: str | None = None, *, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Retry-After": str(self.retry_after)}
+
+
+class RequestTimeoutError(AppError):
+    """処理時間の上限超過エラー（504 Gateway Timeout）。"""
+
+    status_code = 504
+    error_code = "REQUEST_TIMEOUT"
+    message = "処理がタイムアウトしました"
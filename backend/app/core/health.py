@@ -0,0 +1,145 @@
+"""ヘルスチェック（liveness / readiness）。
+
+- /health/live … プロセスが応答できるかだけを返す（再起動の判断用）
+- /health/ready … トラフィックを受けてよいかを返す（ルーティングの判断用）
+
+readiness は次のいずれかに当てはまる間 503 を返す。
+
+- 終了処理中（draining）
+- ウォームアップが完了していない
+- コネクションプールが飽和している（貸し出し中の接続数が上限に達している）
+- DB への ping が失敗した・タイムアウトした
+
+毎秒ポーリングされても DB の負荷にならないよう、ping の結果は
+health_db_cache_seconds の間キャッシュし、同時に来たチェックは1回の ping を
+共有する。プールが飽和している間は ping せず、前回の結果を返す。
+
+shutdown_drain_seconds を設定すると、SIGTERM を受けてから指定秒数は readiness
+だけを 503 にしてリクエストの処理を続け、その後に uvicorn の終了処理を始める。
+ロードバランサーがインスタンスを振り分け先から外すまでの猶予になる。
+"""
+
+import asyncio
+import logging
+import math
+import signal
+import threading
+import time
+from types import FrameType
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.warmup import warmup
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """readiness の判定と DB への ping の結果のキャッシュを管理する。"""
+
+    def __init__(self, *, db_engine: AsyncEngine = engine):
+        self.draining = False
+        self._db_engine = db_engine
+        self._db_error: str | None = None
+        self._db_checked_at = -math.inf
+        self._lock = asyncio.Lock()
+        self._previous_sigterm: Any = None
+
+    def start_draining(self) -> None:
+        if not self.draining:
+            self.draining = True
+            logger.info("終了処理のため readiness を 503 にしました")
+
+    async def _ping(self) -> str | None:
+        """DB に SELECT 1 を発行し、失敗した場合はその理由を返す。"""
+        try:
+            async with asyncio.timeout(settings.health_db_timeout_ms / 1000):
+                async with self._db_engine.connect() as conn:
+                    await conn.exec_driver_sql("SELECT 1")
+        except TimeoutError:
+            return "timeout"
+        except Exception as err:
+            return type(err).__name__
+        return None
+
+    async def check_database(self) -> str | None:
+        """キャッシュした ping の結果を返す。期限切れの場合は ping し直す。"""
+        async with self._lock:
+            elapsed = time.monotonic() - self._db_checked_at
+            if elapsed >= settings.health_db_cache_seconds:
+                self._db_error = await self._ping()
+                self._db_checked_at = time.monotonic()
+                if self._db_error is not None:
+                    logger.warning("DB の ping に失敗しました: %s", self._db_error)
+        return self._db_error
+
+    def _pool_status(self) -> dict[str, Any]:
+        pool = self._db_engine.sync_engine.pool
+        checked_out = pool.checkedout()
+        capacity = pool.size() + settings.db_max_overflow
+        saturated = checked_out >= capacity * settings.health_pool_saturation_ratio
+        return {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturated": saturated,
+        }
+
+    async def readiness(self) -> tuple[bool, dict[str, Any]]:
+        """トラフィックを受けてよいかと、その内訳を返す。"""
+        if self.draining:
+            return False, {"status": "draining"}
+        if settings.repository_backend == "memory":
+            return True, {"status": "ok"}
+        if settings.warmup_enabled and not warmup.ready:
+            return False, {"status": "starting"}
+
+        pool = self._pool_status()
+        if pool["saturated"]:
+            database = self._db_error
+        else:
+            database = await self.check_database()
+        ready = database is None and not pool["saturated"]
+        return ready, {
+            "status": "ok" if ready else "unavailable",
+            "database": database or "ok",
+            "pool": pool,
+        }
+
+    def install_drain_handler(self, delay_seconds: float) -> None:
+        """SIGTERM を受けたら draining にし、delay_seconds 後に元のハンドラを呼ぶ。
+
+        元のハンドラ（uvicorn の終了処理）がない場合やメインスレッド以外では
+        何もしない。
+        """
+        if delay_seconds <= 0 or threading.current_thread() is not (
+            threading.main_thread()
+        ):
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+        if not callable(previous):
+            return
+        loop = asyncio.get_running_loop()
+
+        def _handle_sigterm(signum: int, frame: FrameType | None) -> None:
+            if self.draining:
+                # 2回目の SIGTERM では待たずに終了する
+                previous(signum, frame)
+                return
+            self.start_draining()
+            loop.call_soon_threadsafe(
+                loop.call_later, delay_seconds, previous, signum, None
+            )
+
+        self._previous_sigterm = previous
+        signal.signal(signal.SIGTERM, _handle_sigterm)
+
+    def uninstall_drain_handler(self) -> None:
+        if self._previous_sigterm is not None:
+            signal.signal(signal.SIGTERM, self._previous_sigterm)
+            self._previous_sigterm = None
+
+
+health_checker = HealthChecker()
@@ -0,0 +1,190 @@
+"""コネクション・セッションのリーク検出（開発・ステージング用）。
+
+有効にすると、プールから取り出したコネクションと生成したセッションごとに
+取得時のスタックトレースを記録する。閾値を超えて保持され続けているものや、
+返却・close されずにガベージコレクトされたものをスタックトレース付きで警告する。
+本番ではリークは緩やかなプール枯渇として現れ原因を追いにくいため、取得箇所を
+特定できるようにする。
+
+スタックトレースの取得はコストが高いため、既定では無効にしている。
+"""
+
+import asyncio
+import logging
+import time
+import traceback
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# スタックトレースから除外する末尾のフレーム数（検出器自身の呼び出し）
+_SKIP_FRAMES = 2
+
+
+@dataclass
+class Acquisition:
+    """取得されたまま返却されていないコネクション・セッション。"""
+
+    kind: str
+    stack: str
+    acquired_at: float = field(default_factory=time.monotonic)
+    warned: bool = False
+
+    @property
+    def held_ms(self) -> float:
+        return (time.monotonic() - self.acquired_at) * 1000
+
+    def describe(self) -> str:
+        return f"{self.kind}（{self.held_ms:.0f}ms 保持）の取得箇所:\n{self.stack}"
+
+
+class LeakDetector:
+    """取得中のコネクション・セッションを追跡する。"""
+
+    def __init__(self, *, threshold_ms: float):
+        self.threshold_ms = threshold_ms
+        self._connections: dict[int, tuple[Acquisition, Any]] = {}
+        self._sessions: dict[int, Acquisition] = {}
+        self._finalizers: dict[int, weakref.finalize] = {}
+        self._monitor_task: asyncio.Task | None = None
+
+    # --- 登録 ---
+
+    def install(self, engine: AsyncEngine) -> None:
+        """エンジンのプールにチェックアウト・チェックインの追跡を登録する。"""
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+
+    def uninstall(self, engine: AsyncEngine) -> None:
+        event.remove(engine.sync_engine, "checkout", self._on_checkout)
+        event.remove(engine.sync_engine, "checkin", self._on_checkin)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        key = id(connection_record)
+        self._connections[key] = (
+            Acquisition("コネクション", _capture_stack()),
+            connection_record,
+        )
+        self._finalizers[key] = weakref.finalize(
+            connection_proxy, self._on_connection_collected, key
+        )
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        key = id(connection_record)
+        self._connections.pop(key, None)
+        finalizer = self._finalizers.pop(key, None)
+        if finalizer is not None:
+            finalizer.detach()
+
+    def _on_connection_collected(self, key: int) -> None:
+        self._finalizers.pop(key, None)
+        entry = self._connections.pop(key, None)
+        if entry is not None:
+            logger.warning("返却されずにガベージコレクトされた%s", entry[0].describe())
+
+    def track_session(self, session: AsyncSession) -> None:
+        key = id(session)
+        self._sessions[key] = Acquisition("セッション", _capture_stack())
+        self._finalizers[key] = weakref.finalize(
+            session, self._on_session_collected, key
+        )
+
+    def untrack_session(self, session: AsyncSession) -> None:
+        key = id(session)
+        self._sessions.pop(key, None)
+        finalizer = self._finalizers.pop(key, None)
+        if finalizer is not None:
+            finalizer.detach()
+
+    def _on_session_collected(self, key: int) -> None:
+        self._finalizers.pop(key, None)
+        acquisition = self._sessions.pop(key, None)
+        if acquisition is not None:
+            logger.warning(
+                "close されずにガベージコレクトされた%s", acquisition.describe()
+            )
+
+    # --- 検査 ---
+
+    def held(self) -> list[Acquisition]:
+        """取得中のコネクション・セッションを返す。"""
+        connections = [acquisition for acquisition, _ in self._connections.values()]
+        return [*connections, *self._sessions.values()]
+
+    def warn_long_held(self) -> list[Acquisition]:
+        """閾値を超えて保持されているものを1件につき1回だけ警告する。"""
+        long_held = [a for a in self.held() if a.held_ms >= self.threshold_ms]
+        for acquisition in long_held:
+            if not acquisition.warned:
+                acquisition.warned = True
+                logger.warning("長時間保持されている%s", acquisition.describe())
+        return long_held
+
+    def reclaim(self) -> list[Acquisition]:
+        """取得中のものを追跡から外し、コネクションは破棄して返す。
+
+        リークしたコネクションが保持するロックやトランザクションを解放するため、
+        テスト終了時などに使用する。
+        """
+        leaks = self.held()
+        for _, connection_record in self._connections.values():
+            connection_record.invalidate()
+        for finalizer in self._finalizers.values():
+            finalizer.detach()
+        self._connections.clear()
+        self._sessions.clear()
+        self._finalizers.clear()
+        return leaks
+
+    # --- 監視タスク ---
+
+    def start(self) -> None:
+        """閾値超過を定期的に警告する監視タスクを開始する。"""
+        if self._monitor_task is None:
+            self._monitor_task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+
+    async def _monitor(self) -> None:
+        interval = max(self.threshold_ms / 2, 100) / 1000
+        while True:
+            await asyncio.sleep(interval)
+            self.warn_long_held()
+
+
+def _capture_stack() -> str:
+    frames = traceback.extract_stack()[:-_SKIP_FRAMES]
+    # AsyncSession 経由の取得は greenlet 内で行われるため、呼び出し元の
+    # コルーチンは親 greenlet のスタックにある
+    parent = greenlet.getcurrent().parent
+    if parent is not None and parent.gr_frame is not None:
+        frames = traceback.extract_stack(parent.gr_frame) + frames
+    return "".join(traceback.format_list(frames))
+
+
+leak_detector = LeakDetector(threshold_ms=settings.leak_detection_threshold_ms)
+
+
+class LeakTrackingAsyncSession(AsyncSession):
+    """生成から close までを leak_detector で追跡する AsyncSession。"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        leak_detector.track_session(self)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            leak_detector.untrack_session(self)
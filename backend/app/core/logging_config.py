@@ -0,0 +1,139 @@
+"""ノンブロッキングなログ出力。
+
+ルートロガーには QueueHandler だけを登録し、整形と標準出力への書き込みは
+QueueListener のスレッドで行う。ログ出力でイベントループが I/O を待つことはない。
+
+標準出力への書き込みが詰まってキューがあふれた場合は、リクエスト処理を
+待たせずにレコードを破棄し、log_records_dropped_total に数える。
+
+log_format が json の場合は1レコード1行の JSON で出力する。extra={"fields": {...}}
+で渡した値はトップレベルのキーとして出力する（アクセスログなど）。
+
+uvicorn 自身のロガーは伝播しないため対象外。アクセスログは
+app.core.access_log が出力するため、uvicorn は --no-access-log で起動する。
+"""
+
+import json
+import logging
+import queue
+import sys
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from app.core.metrics import registry
+
+_TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+dropped_records = registry.counter(
+    "log_records_dropped_total",
+    "キューがあふれたため破棄したログレコード数",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """ログレコードを1行の JSON にする。"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """fields を「key=value」で末尾に付けるテキスト形式（ローカル開発用）。"""
+
+    def __init__(self) -> None:
+        super().__init__(_TEXT_FORMAT)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:  # noqa: N802
+        message = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        if not fields:
+            return message
+        pairs = " ".join(f"{key}={value}" for key, value in fields.items())
+        return f"{message} {pairs}"
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """キューがあふれた場合に待たずに破棄する QueueHandler。"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 同一プロセス内のキューのため、整形はリスナーのスレッドに任せる。
+        # 引数のオブジェクトが後から変更されても内容が変わらないよう、
+        # メッセージだけはここで確定する
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records.inc()
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # 停止時はキューがあふれていても終了の合図を確実に渡す
+        self.queue.put(self._sentinel)
+
+
+class LogQueue:
+    """ルートロガーの出力をキュー経由で別スレッドから書き込む。"""
+
+    def __init__(self) -> None:
+        self._listener: _Listener | None = None
+        self._handler: QueueHandler | None = None
+        self._previous_handlers: list[logging.Handler] = []
+        self._previous_level = logging.WARNING
+
+    @property
+    def active(self) -> bool:
+        return self._listener is not None
+
+    def start(self, *, level: str, fmt: str, queue_size: int) -> None:
+        if self._listener is not None:
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        records: queue.Queue[logging.LogRecord] = queue.Queue(queue_size)
+        self._handler = _DroppingQueueHandler(records)
+        self._listener = _Listener(records, output)
+
+        root = logging.getLogger()
+        self._previous_handlers = root.handlers[:]
+        self._previous_level = root.level
+        for handler in self._previous_handlers:
+            root.removeHandler(handler)
+        root.addHandler(self._handler)
+        root.setLevel(level.upper())
+        self._listener.start()
+
+    def stop(self) -> None:
+        """キューに残っているレコードを書き出してから元のハンドラに戻す。"""
+        if self._listener is None:
+            return
+        root = logging.getLogger()
+        root.removeHandler(self._handler)
+        for handler in self._previous_handlers:
+            root.addHandler(handler)
+        root.setLevel(self._previous_level)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.flush()
+        self._listener = None
+        self._handler = None
+        self._previous_handlers = []
+
+
+log_queue = LogQueue()
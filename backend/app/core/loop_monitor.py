@@ -0,0 +1,202 @@
+"""イベントループの遅延とブロッキング呼び出しの検出。
+
+バックグラウンドタスクが一定間隔で asyncio.sleep し、予定より遅れて再開した
+時間をイベントループの遅延として event_loop_lag_seconds に記録する。遅延は
+同期処理（bcrypt・jwt.decode・大きなレスポンスのシリアライズなど）が
+イベントループを占有している間、他のリクエストが待たされた時間に相当する。
+
+loop_blocking_threshold_ms を 0 以上にすると（デバッグモード）、監視スレッドが
+再開の遅れを閾値と比較し、超えた時点のイベントループのスレッドのスタックを
+取得する。スタックごとに回数とブロック時間を集計して警告ログに出力するため、
+ステージングで負荷をかけるだけでブロッキング呼び出しの箇所を特定できる。
+GIL を解放しない C 拡張の処理中は監視スレッドが動けないため、その間の
+ブロックは遅延としてのみ記録される。
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from datetime import UTC, datetime
+from types import CodeType, FrameType
+from typing import Any
+
+from app.core.metrics import registry
+from app.core.profiling import short_path
+
+logger = logging.getLogger(__name__)
+
+# 集計するスタックの上限（超過分は回数のみメトリクスに数える）
+_MAX_STACKS = 200
+# 1スタックに記録するフレーム数の上限（内側から）
+_MAX_DEPTH = 50
+
+_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    "イベントループの再開の遅れ（秒）",
+    (),
+    _LAG_BUCKETS,
+)
+event_loop_blocked = registry.counter(
+    "event_loop_blocked_total",
+    "閾値を超えてイベントループをブロックした回数（デバッグモードのみ）",
+)
+
+
+def _loop_stack(frame: FrameType, entry: CodeType) -> tuple[str, ...]:
+    """実行中のコールバックのスタックを内側から順に返す。
+
+    entry はイベントループがコールバックを呼び出すフレームのコード
+    （asyncio では Handle._run、uvloop では C 実装の呼び出し元）で、
+    それより外側は含めない。コールバックの実行中でなければ（I/O の待機中など）
+    空のタプルを返す。
+    """
+    stack: list[str] = []
+    while frame is not None:
+        if frame.f_code is entry:
+            return tuple(stack)
+        if len(stack) < _MAX_DEPTH:
+            code = frame.f_code
+            path = short_path(code.co_filename)
+            stack.append(f"{code.co_qualname} ({path}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ()
+
+
+class _BlockingStats:
+    """1スタック分の集計値。"""
+
+    __slots__ = ("stack", "count", "total_ms", "max_ms", "last_seen_at")
+
+    def __init__(self, stack: tuple[str, ...]):
+        self.stack = stack
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_seen_at: datetime | None = None
+
+    def add(self, blocked_ms: float) -> None:
+        self.count += 1
+        self.total_ms += blocked_ms
+        self.max_ms = max(self.max_ms, blocked_ms)
+        self.last_seen_at = datetime.now(UTC)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stack": list(self.stack),
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "last_seen_at": self.last_seen_at,
+        }
+
+
+class LoopMonitor:
+    """イベントループの遅延を計測し、デバッグモードではブロックしたスタックを集計する。"""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._interval = 0.1
+        # 直近に再開した時刻（time.monotonic）。監視スレッドから参照する
+        self._last_tick = 0.0
+        # 監視スレッドが取得し、まだ集計していないスタック
+        self._pending: tuple[str, ...] | None = None
+        # イベントループがコールバックを呼び出すフレームのコード（_run で特定する）
+        self._entry: CodeType | None = None
+        self._stats: dict[tuple[str, ...], _BlockingStats] = {}
+
+    @property
+    def active(self) -> bool:
+        return self._task is not None
+
+    def start(self, *, interval_seconds: float, block_threshold_seconds: float) -> None:
+        """計測を開始する。block_threshold_seconds が負の値の場合は検出しない。"""
+        if self._task is not None:
+            return
+        self._interval = interval_seconds
+        self._last_tick = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+        if block_threshold_seconds >= 0:
+            self._stopped.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(), block_threshold_seconds),
+                name="event-loop-watchdog",
+                daemon=True,
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._watchdog is not None:
+            self._stopped.set()
+            self._watchdog.join()
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        caller = sys._getframe().f_back
+        self._entry = caller.f_code if caller is not None else None
+        while True:
+            self._last_tick = time.monotonic()
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, time.monotonic() - self._last_tick - self._interval)
+            event_loop_lag.observe((), lag)
+            stack = self._pending
+            if stack is not None:
+                self._pending = None
+                self.record(stack, lag * 1000)
+
+    def _watch(self, thread_id: int, threshold: float) -> None:
+        captured_tick = None
+        while not self._stopped.wait(max(threshold / 4, 0.001)):
+            tick = self._last_tick
+            if tick == captured_tick:
+                continue
+            if time.monotonic() - tick - self._interval < threshold:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            entry = self._entry
+            if frame is None or entry is None:
+                continue
+            stack = _loop_stack(frame, entry)
+            if stack:
+                self._pending = stack
+                captured_tick = tick
+
+    def record(self, stack: tuple[str, ...], blocked_ms: float) -> None:
+        """ブロックしたスタックを集計する。"""
+        event_loop_blocked.inc()
+        logger.warning(
+            "イベントループが %.0f ms ブロックされました:\n%s",
+            blocked_ms,
+            "\n".join(f"  {frame}" for frame in stack),
+        )
+        stats = self._stats.get(stack)
+        if stats is None:
+            if len(self._stats) >= _MAX_STACKS:
+                return
+            stats = self._stats[stack] = _BlockingStats(stack)
+        stats.add(blocked_ms)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """集計結果をブロック時間の合計の降順で返す。"""
+        stats = sorted(self._stats.values(), key=lambda s: s.total_ms, reverse=True)
+        return [s.to_dict() for s in stats]
+
+    def clear(self) -> None:
+        """集計結果を破棄する。"""
+        self._stats.clear()
+
+
+loop_monitor = LoopMonitor()
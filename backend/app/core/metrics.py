@@ -0,0 +1,426 @@
+"""Prometheus のテキスト形式で公開するメトリクス。
+
+ルートテンプレート・メソッド・ステータスごとのレイテンシのヒストグラムと、
+リクエストあたりのSQL発行数のヒストグラムを MetricsMiddleware で記録する。
+プールやアドミッションコントロールの状態、キャッシュのヒット数などは
+スクレイプ時にコールバックで取得する。
+
+記録はイベントループのスレッドからのみ行うためロックを使わない。1回の記録は
+ラベルのタプルでの辞書参照と bisect、リスト要素の加算だけで、系列のリストは
+初回の記録時にのみ生成する。
+
+uvicorn を複数ワーカーで起動する場合は METRICS_MULTIPROCESS_DIR を指定する。
+各ワーカーは一定間隔で自分の値をディレクトリ内のファイルに書き出し、/metrics を
+受けたワーカーがすべてのファイルを合算して返す。カウンタとヒストグラムは終了した
+ワーカーの分も合算し、ゲージは稼働中のワーカーの値を pid ラベル付きで返す。
+ファイルの読み書きはイベントループをブロックしないよう別スレッドで行う。
+ディレクトリはデプロイごとに空にすること。
+
+/metrics は METRICS_TOKEN を指定した場合のみ公開し、Authorization ヘッダの
+Bearer トークンが一致するリクエストにだけ返す。
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.query_metrics import query_metrics, track_request_queries
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+# ルートに一致しなかったリクエストのラベル（生のパスはカーディナリティが際限なく増える）
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values, strict=True)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """単調増加するカウンタ。"""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> dict[Labels, Any]:
+        return dict(self._values)
+
+
+class Histogram:
+    """バケットごとの件数・合計値を持つヒストグラム。
+
+    系列ごとに [バケットごとの件数..., +Inf の件数, 合計値] のリストを保持し、
+    累積値への変換は出力時に行う。
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Labels, buckets: tuple[float, ...]
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> dict[Labels, Any]:
+        return {labels: list(series) for labels, series in self._series.items()}
+
+
+class Collected:
+    """スクレイプ時にコールバックで値を取得するメトリクス（ゲージ・外部のカウンタ）。"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels,
+        collect: Callable[[], Iterable[tuple[Labels, float]]],
+        *,
+        type: str = "gauge",
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.collect = collect
+        self.type = type
+
+    def samples(self) -> dict[Labels, Any]:
+        return dict(self.collect())
+
+
+Metric = Counter | Histogram | Collected
+
+
+def _render(metric: Metric, samples: dict[Labels, Any], labelnames: Labels) -> str:
+    lines = [
+        f"# HELP {metric.name} {metric.help}",
+        f"# TYPE {metric.name} {metric.type}",
+    ]
+    for labels, value in sorted(samples.items()):
+        if isinstance(metric, Histogram):
+            cumulative = 0
+            for bound, count in zip(
+                (*metric.buckets, float("inf")), value[:-1], strict=True
+            ):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    (*labelnames, "le"), (*labels, _format_value(bound))
+                )
+                lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+            formatted = _format_labels(labelnames, labels)
+            lines.append(f"{metric.name}_sum{formatted} {_format_value(value[-1])}")
+            lines.append(f"{metric.name}_count{formatted} {cumulative}")
+        else:
+            formatted = _format_labels(labelnames, labels)
+            lines.append(f"{metric.name}{formatted} {_format_value(value)}")
+    return "\n".join(lines)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """メトリクスの登録・出力と、複数ワーカー間の集約を行う。"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._directory: Path | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    def register[M: Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"メトリクス {metric.name} は登録済みです")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def counter(self, name: str, help: str, labelnames: Labels = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Labels, buckets: tuple[float, ...]
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels,
+        collect: Callable[[], Iterable[tuple[Labels, float]]],
+    ) -> Collected:
+        return self.register(Collected(name, help, labelnames, collect))
+
+    def collected_counter(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels,
+        collect: Callable[[], Iterable[tuple[Labels, float]]],
+    ) -> Collected:
+        """他のモジュールが保持している累計値をカウンタとして公開する。"""
+        return self.register(Collected(name, help, labelnames, collect, type="counter"))
+
+    def _snapshot(self) -> dict[str, dict[Labels, Any]]:
+        snapshot = {}
+        for name, metric in self._metrics.items():
+            try:
+                snapshot[name] = metric.samples()
+            except Exception:
+                logger.exception("メトリクス %s の取得に失敗しました", name)
+        return snapshot
+
+    async def render(self) -> str:
+        """テキスト形式で出力する。複数ワーカーの場合はすべてのワーカー分を合算する。"""
+        if self._directory is None:
+            merged = self._snapshot()
+            per_pid = False
+        else:
+            await asyncio.to_thread(self._write, self._snapshot())
+            merged = await asyncio.to_thread(self._merge)
+            per_pid = True
+
+        sections = []
+        for name, metric in self._metrics.items():
+            samples = merged.get(name, {})
+            labelnames = metric.labelnames
+            if per_pid and metric.type == "gauge":
+                labelnames = (*labelnames, "pid")
+            sections.append(_render(metric, samples, labelnames))
+        return "\n".join(sections) + "\n"
+
+    # --- 複数ワーカー ---
+
+    def start(self, directory: str, *, interval_seconds: float) -> None:
+        """自プロセスの値を一定間隔でディレクトリに書き出す。"""
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._flush_task = asyncio.create_task(self._flush_loop(interval_seconds))
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        if self._directory is not None:
+            await asyncio.to_thread(self._write, self._snapshot())
+            self._directory = None
+
+    async def _flush_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            snapshot = self._snapshot()
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except OSError:
+                logger.exception("メトリクスの書き出しに失敗しました")
+
+    def _path(self, pid: int) -> Path:
+        assert self._directory is not None
+        return self._directory / f"metrics-{pid}.json"
+
+    def _write(self, snapshot: dict[str, dict[Labels, Any]]) -> None:
+        path = self._path(os.getpid())
+        tmp = path.with_suffix(".tmp")
+        serialized = {
+            name: [[list(labels), value] for labels, value in samples.items()]
+            for name, samples in snapshot.items()
+        }
+        tmp.write_text(json.dumps(serialized), encoding="utf-8")
+        tmp.replace(path)
+
+    def _files(self) -> Iterator[tuple[int, dict[str, list]]]:
+        assert self._directory is not None
+        for path in self._directory.glob("metrics-*.json"):
+            pid = int(path.stem.removeprefix("metrics-"))
+            try:
+                yield pid, json.loads(path.read_text(encoding="utf-8"))
+            except OSError, ValueError:
+                logger.warning("メトリクスのファイルを読み込めません: %s", path)
+
+    def _merge(self) -> dict[str, dict[Labels, Any]]:
+        merged: dict[str, dict[Labels, Any]] = {}
+        for pid, snapshot in self._files():
+            alive = _pid_alive(pid)
+            for name, samples in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged.setdefault(name, {})
+                for labels, value in samples:
+                    if metric.type == "gauge":
+                        if alive:
+                            target[(*labels, str(pid))] = value
+                    elif isinstance(metric, Histogram):
+                        current = target.setdefault(tuple(labels), [0] * len(value))
+                        for i, v in enumerate(value):
+                            current[i] += v
+                    else:
+                        key = tuple(labels)
+                        target[key] = target.get(key, 0) + value
+        return merged
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "リクエストの処理時間（秒）。_count がリクエスト数",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+request_queries = registry.histogram(
+    "http_request_db_queries",
+    "リクエストあたりのSQL発行数",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "bcrypt によるパスワードのハッシュ化・照合の処理時間（秒）",
+    ("operation",),
+    LATENCY_BUCKETS,
+)
+registry.collected_counter(
+    "sqlalchemy_compiled_cache_total",
+    "SQL実行時のコンパイル済みキャッシュの利用結果",
+    ("result",),
+    lambda: (
+        ((result,), count) for result, count in query_metrics.cache_counts().items()
+    ),
+)
+
+# 名前ごとの functools.cache でキャッシュした関数
+_function_caches: dict[str, Callable[..., Any]] = {}
+
+
+def register_function_cache(name: str, function: Callable[..., Any]) -> None:
+    """functools.cache でキャッシュした関数のヒット数・ミス数を公開する。"""
+    _function_caches[name] = function
+
+
+def _function_cache_samples() -> Iterator[tuple[Labels, float]]:
+    for name, function in _function_caches.items():
+        info = function.cache_info()
+        yield (name, "hit"), info.hits
+        yield (name, "miss"), info.misses
+
+
+registry.collected_counter(
+    "function_cache_total",
+    "functools.cache でキャッシュした関数の呼び出し結果",
+    ("cache", "result"),
+    _function_cache_samples,
+)
+
+
+def install_pool_metrics(engine: AsyncEngine) -> None:
+    """コネクションプールの状態をゲージとして公開する。"""
+    pool = engine.sync_engine.pool
+    registry.gauge(
+        "db_pool_size",
+        "コネクションプールの常時保持する接続数",
+        (),
+        lambda: [((), pool.size())],
+    )
+    registry.gauge(
+        "db_pool_checked_out",
+        "貸し出し中の接続数",
+        (),
+        lambda: [((), pool.checkedout())],
+    )
+    registry.gauge(
+        "db_pool_overflow",
+        "pool_size を超えて作成している接続数（負の値は未作成の枠）",
+        (),
+        lambda: [((), pool.overflow())],
+    )
+
+
+class MetricsMiddleware:
+    """リクエストの処理時間とSQL発行数を記録する ASGI ミドルウェア。"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = asyncio.get_running_loop().time()
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with track_request_queries() as queries:
+            try:
+                await self.app(scope, receive, send_status)
+            finally:
+                elapsed = asyncio.get_running_loop().time() - started
+                route = scope.get("route")
+                route_path = route.path if route is not None else UNMATCHED_ROUTE
+                method = scope["method"]
+                request_duration.observe((method, route_path, str(status)), elapsed)
+                request_queries.observe((method, route_path), queries.count)
@@ -0,0 +1,52 @@
+"""1行1件の JSON（NDJSON）をローテーションするファイルに書き出すライター。
+
+トラフィックのキャプチャやトレースの出力など、リクエストごとに1行を追記する
+記録に使う。書き込みは QueueListener のスレッドで行い、イベントループを
+ブロックしない。
+"""
+
+import json
+import logging
+import queue
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+
+class NdjsonFileWriter:
+    """記録をキュー経由でローテーションするファイルに書き込む。"""
+
+    def __init__(self) -> None:
+        self._queue: queue.SimpleQueue[logging.LogRecord] | None = None
+        self._listener: QueueListener | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._listener is not None
+
+    def start(self, path: str, *, max_bytes: int, backup_count: int) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._queue = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+
+    def write(self, entry: dict[str, Any]) -> None:
+        """1件を JSON の1行としてキューに積む。開始前は何もしない。"""
+        if self._queue is None:
+            return
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        self._queue.put_nowait(logging.makeLogRecord({"msg": line}))
+
+    def stop(self) -> None:
+        """キューに残っている記録を書き出してから停止する。"""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+        self._queue = None
@@ -0,0 +1,216 @@
+"""リクエスト単位のオンデマンド CPU プロファイリング。
+
+X-Profile ヘッダ（またはクエリパラメータ profile）を付けたリクエストのハンドラ
+実行中、別スレッドからイベントループのスレッドのスタックを一定間隔で
+サンプリングする。サンプルは flamegraph.pl・speedscope・inferno で読み込める
+collapsed stack 形式（「関数;関数;関数 件数」）で出力する。
+
+- X-Profile: download … レスポンスの代わりにプロファイルを添付ファイルで返す
+- それ以外の値 … profiling_dir に保存し、ファイル名を X-Profile-File で返す
+
+サンプリングはハンドラのコルーチンがスタック上にある時点だけを関数の
+スタックとして数え、DB の応答待ちや他のリクエストの処理中は <waiting> として
+数える。そのため合計は CPU 時間ではなく処理時間の内訳になる。
+
+profiling_enabled を有効にした環境でのみ受け付ける。profiling_require_token が
+有効な場合（本番）は scripts.create_profiling_token で発行した署名付きトークンを
+X-Profile-Token で送ったリクエストだけを対象にする。オーバーヘッドを抑えるため、
+同時にプロファイルするのはプロセスごとに1リクエストまでとする。
+"""
+
+import datetime
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Coroutine
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from fastapi import Request, Response
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_FILE_HEADER = "X-Profile-File"
+DOWNLOAD = "download"
+WAITING = "<waiting>"
+
+_TOKEN_PURPOSE = "profile"
+
+Handler = Callable[[Request], Coroutine[Any, Any, Response]]
+
+
+def create_profiling_token(minutes: int) -> str:
+    """プロファイリングを許可する署名付きトークンを発行する。"""
+    expire = datetime.datetime.now(datetime.UTC) + datetime.timedelta(minutes=minutes)
+    payload = {"purpose": _TOKEN_PURPOSE, "exp": expire}
+    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+
+
+def verify_profiling_token(token: str) -> bool:
+    """トークンがプロファイリング用に発行された有効なものか判定する。"""
+    try:
+        payload = jwt.decode(
+            token, settings.secret_key, algorithms=[settings.algorithm]
+        )
+    except JWTError:
+        return False
+    return payload.get("purpose") == _TOKEN_PURPOSE
+
+
+@functools.lru_cache(maxsize=4096)
+def short_path(filename: str) -> str:
+    """sys.path 上のファイルはモジュールのパスに短縮する。"""
+    # 空文字はカレントディレクトリを表す
+    prefixes = {(path or os.getcwd()).rstrip("/") + "/" for path in sys.path}
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        if filename.startswith(prefix):
+            return filename[len(prefix) :]
+    return filename
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    path = short_path(code.co_filename)
+    label = f"{code.co_qualname} ({path}:{code.co_firstlineno})"
+    # collapsed stack 形式の区切り文字は関数名に含められない
+    return label.replace(";", ":")
+
+
+class StackSampler:
+    """指定スレッドのスタックを別スレッドから一定間隔でサンプリングする。
+
+    anchor のフレームがスタック上にあるサンプルは anchor から先のスタックを、
+    ない場合は WAITING を数える。
+    """
+
+    def __init__(self, thread_id: int, anchor: FrameType, interval_seconds: float):
+        self.thread_id = thread_id
+        self.anchor = anchor
+        self.interval_seconds = interval_seconds
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack: list[str] = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            if frame is self.anchor:
+                self.samples[";".join(reversed(stack))] += 1
+                return
+            frame = frame.f_back
+        self.samples[WAITING] += 1
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stopped.set()
+        self._thread.join()
+        return self.samples
+
+
+def render_collapsed(samples: Counter[str]) -> str:
+    """サンプルを collapsed stack 形式の文字列にする。"""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+def _requested_mode(request: Request) -> str | None:
+    """リクエストがプロファイリングを要求していればその値を返す。"""
+    mode = request.headers.get(PROFILE_HEADER) or request.query_params.get(
+        PROFILE_QUERY_PARAM
+    )
+    if not mode or not settings.profiling_enabled:
+        return None
+    if settings.profiling_require_token:
+        token = request.headers.get(PROFILE_TOKEN_HEADER, "")
+        if not verify_profiling_token(token):
+            logger.warning(
+                "プロファイリングのトークンが無効なため無視しました: %s %s",
+                request.method,
+                request.url.path,
+            )
+            return None
+    return mode
+
+
+def _save(request: Request, content: str) -> str:
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-")
+    timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y%m%dT%H%M%S%fZ")
+    filename = f"{timestamp}-{request.method}-{slug}.folded"
+    directory = Path(settings.profiling_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / filename).write_text(content, encoding="utf-8")
+    logger.info("プロファイルを保存しました: %s", directory / filename)
+    return filename
+
+
+_lock = threading.Lock()
+
+
+def profile_handler(handler: Handler) -> Handler:
+    """要求されたリクエストのハンドラ実行をサンプリングするようにラップする。"""
+
+    async def _handler(request: Request) -> Response:
+        mode = _requested_mode(request)
+        if mode is None or not _lock.acquire(blocking=False):
+            return await handler(request)
+
+        sampler = StackSampler(
+            threading.get_ident(),
+            sys._getframe(),
+            settings.profiling_interval_ms / 1000,
+        )
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = await handler(request)
+        except BaseException:
+            # エラーやタイムアウトになったリクエストも後から調べられるよう保存する
+            _save(request, render_collapsed(sampler.stop()))
+            raise
+        finally:
+            # stop は繰り返し呼んでもよい
+            sampler.stop()
+            _lock.release()
+
+        content = render_collapsed(sampler.samples)
+        logger.info(
+            "プロファイルを取得しました: %s %s（%d サンプル / %.1f ms）",
+            request.method,
+            request.url.path,
+            sampler.samples.total(),
+            (time.perf_counter() - started) * 1000,
+        )
+        if mode == DOWNLOAD:
+            return Response(
+                content,
+                media_type="text/plain; charset=utf-8",
+                headers={
+                    "Content-Disposition": 'attachment; filename="profile.folded"'
+                },
+            )
+        response.headers[PROFILE_FILE_HEADER] = _save(request, content)
+        return response
+
+    return _handler
@@ -0,0 +1,160 @@
+"""SQL実行のメトリクス。
+
+SQLAlchemy のコンパイル済みSQLキャッシュのヒット率を集計する。キャッシュミスが
+続く場合は、文の構造が呼び出しごとに変わっている（キャッシュキーが増え続けている）
+可能性がある。
+
+また count_queries の範囲内で実行されたSQLを記録し、track_request_queries の
+範囲内で実行されたSQLの件数と実行時間の合計を数える。範囲はコンテキスト変数で管理するため、
+同時に処理されている他のリクエストのSQLは含まれない。
+"""
+
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """count_queries の範囲内で実行されたSQL。"""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+_current_counter: ContextVar[QueryCounter | None] = ContextVar(
+    "query_counter", default=None
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """ブロック内で実行されたSQLを記録する。
+
+    ブロック内で生成したタスクにもコンテキストが引き継がれるため、
+    ミドルウェアが別タスクで実行するリクエスト処理のSQLも含まれる。
+    """
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+class RequestQueries:
+    """track_request_queries の範囲内で実行されたSQLの件数と実行時間（秒）の合計。"""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+_current_request: ContextVar[RequestQueries | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+@contextmanager
+def track_request_queries() -> Iterator[RequestQueries]:
+    """リクエスト単位でSQLの件数と実行時間を数える（メトリクス・アクセスログ用）。
+
+    count_queries と異なりSQL文を保持しないため、常時有効にしても負荷が小さい。
+    既に範囲内の場合は外側の集計をそのまま返す。
+    """
+    current = _current_request.get()
+    if current is not None:
+        yield current
+        return
+    queries = RequestQueries()
+    token = _current_request.set(queries)
+    try:
+        yield queries
+    finally:
+        _current_request.reset(token)
+
+
+class QueryMetrics:
+    """エンジン単位でSQL実行のメトリクスを集計する。"""
+
+    def __init__(self):
+        self._cache: Counter[CacheStats] = Counter()
+
+    def install(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def uninstall(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.remove(sync_engine, "before_cursor_execute", self._before_execute)
+        event.remove(sync_engine, "after_cursor_execute", self._after_execute)
+        event.remove(sync_engine, "handle_error", self._handle_error)
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        conn.info.setdefault("query_metrics_start", []).append(time.perf_counter())
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        started = conn.info["query_metrics_start"].pop()
+        self._cache[CacheStats(context.cache_hit)] += 1
+        counter = _current_counter.get()
+        if counter is not None:
+            counter.statements.append(statement)
+        queries = _current_request.get()
+        if queries is not None:
+            queries.count += 1
+            queries.duration += time.perf_counter() - started
+
+    def _handle_error(self, context) -> None:
+        # 失敗した SQL は after_cursor_execute が呼ばれないため、ここで開始時刻を破棄
+        starts = (
+            context.connection.info.get("query_metrics_start")
+            if context.connection
+            else None
+        )
+        if starts:
+            starts.pop()
+
+    def cache_counts(self) -> dict[str, int]:
+        """コンパイル済みキャッシュの利用結果ごとの累計実行数を返す。"""
+        hits = self._cache[CacheStats.CACHE_HIT]
+        misses = self._cache[CacheStats.CACHE_MISS]
+        return {
+            "hit": hits,
+            "miss": misses,
+            "uncached": sum(self._cache.values()) - hits - misses,
+        }
+
+    def cache_snapshot(self) -> dict[str, Any]:
+        """コンパイル済みキャッシュの利用状況を返す。"""
+        counts = self.cache_counts()
+        hits, misses = counts["hit"], counts["miss"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "uncached": counts["uncached"],
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,220 @@
+"""一時的なDB障害に対するサービス層の自動リトライ。
+
+デッドロック・シリアライゼーション失敗・コネクション切断（Supavisor によるアイドル
+接続の切断など）は、同じ処理をやり直せば成功する可能性が高い。サービスメソッドに
+transient_retry を付与すると、これらの例外をセッションのロールバック後に
+ジッター付き指数バックオフで再実行する。
+
+- 冪等でない処理は idempotent=False で明示し、再実行しない
+- 再実行はプロセス全体のリトライ予算の範囲内に限り、障害時の負荷増幅を防ぐ
+- リクエストのデッドラインを超える待機はしない
+- 再実行しても成功しない一時的な障害は 503 として返す
+"""
+
+import asyncio
+import enum
+import functools
+import logging
+import random
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.deadline import remaining_ms
+from app.core.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+_Method = Callable[..., Awaitable[Any]]
+
+_SERIALIZATION_FAILURE_SQLSTATE = "40001"
+_DEADLOCK_DETECTED_SQLSTATE = "40P01"
+# 08xxx: connection_exception / 57P01: admin_shutdown
+_CONNECTION_SQLSTATE_CLASS = "08"
+_ADMIN_SHUTDOWN_SQLSTATE = "57P01"
+
+
+class TransientReason(enum.StrEnum):
+    SERIALIZATION_FAILURE = "serialization_failure"
+    DEADLOCK = "deadlock"
+    CONNECTION = "connection"
+
+
+def classify_transient_error(exc: BaseException) -> TransientReason | None:
+    """再実行で回復が見込める例外であれば、その種別を返す。"""
+    if isinstance(exc, ConnectionError):
+        return TransientReason.CONNECTION
+    if not isinstance(exc, DBAPIError):
+        return None
+    if exc.connection_invalidated:
+        return TransientReason.CONNECTION
+
+    sqlstate = getattr(exc.orig, "sqlstate", None) or ""
+    if sqlstate == _SERIALIZATION_FAILURE_SQLSTATE:
+        return TransientReason.SERIALIZATION_FAILURE
+    if sqlstate == _DEADLOCK_DETECTED_SQLSTATE:
+        return TransientReason.DEADLOCK
+    if (
+        sqlstate.startswith(_CONNECTION_SQLSTATE_CLASS)
+        or sqlstate == _ADMIN_SHUTDOWN_SQLSTATE
+    ):
+        return TransientReason.CONNECTION
+    return None
+
+
+class RetryBudget:
+    """再実行回数を初回実行数の一定割合に抑えるトークンバケット。
+
+    初回実行ごとに ratio 分のトークンを積み、再実行ごとに1消費する。
+    DB全体の障害時に全リクエストが再実行して負荷を増幅させることを防ぐ。
+    """
+
+    def __init__(self, *, ratio: float, min_tokens: float):
+        self.ratio = ratio
+        self.min_tokens = min_tokens
+        self.max_tokens = max(min_tokens, 1.0) * 10
+        self._tokens = min_tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class RetryStats:
+    """操作ごとのリトライ結果の集計値。"""
+
+    def __init__(self):
+        self._counts: Counter[tuple[str, str]] = Counter()
+
+    def incr(self, operation: str, outcome: str) -> None:
+        self._counts[(operation, outcome)] += 1
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [
+            {"operation": operation, "outcome": outcome, "count": count}
+            for (operation, outcome), count in sorted(self._counts.items())
+        ]
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+retry_budget = RetryBudget(
+    ratio=settings.db_retry_budget_ratio,
+    min_tokens=settings.db_retry_budget_min_tokens,
+)
+retry_stats = RetryStats()
+
+
+def backoff_ms(attempt: int) -> float:
+    """attempt 回目の再実行前の待機時間（ミリ秒、フルジッター）を返す。"""
+    ceiling = min(
+        settings.db_retry_max_delay_ms,
+        settings.db_retry_base_delay_ms * 2 ** (attempt - 1),
+    )
+    return random.uniform(0, ceiling)
+
+
+def _sessions_of(service: Any) -> list[AsyncSession]:
+    """サービスが保持するリポジトリのセッションを重複なく返す。"""
+    sessions: dict[int, AsyncSession] = {}
+    for dependency in vars(service).values():
+        session = getattr(dependency, "db", None)
+        if isinstance(session, AsyncSession):
+            sessions[id(session)] = session
+    return list(sessions.values())
+
+
+async def _reset_sessions(
+    sessions: list[AsyncSession], args: tuple, kwargs: dict
+) -> None:
+    """セッションをロールバックし、引数で受け取ったORMインスタンスを再読み込みする。"""
+    for session in sessions:
+        await session.rollback()
+    # ロールバックで失効した current_user などを再実行前に読み込み直す
+    for value in (*args, *kwargs.values()):
+        state = inspect(value, raiseerr=False)
+        if state is None or not hasattr(state, "session"):
+            continue
+        for session in sessions:
+            if state.session is session.sync_session:
+                await session.refresh(value)
+
+
+def transient_retry(*, idempotent: bool = True) -> Callable[[_Method], _Method]:
+    """一時的なDB障害を再実行するサービスメソッド用デコレータ。
+
+    idempotent=False の処理は再実行せず、一時的な障害を 503 として返す。
+    """
+
+    def decorator(func: _Method) -> _Method:
+        operation = func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            retry_budget.deposit()
+            attempt = 0
+            while True:
+                try:
+                    if attempt:
+                        # ロールバックや再読み込み自体の失敗も同じ判定で扱う
+                        await _reset_sessions(_sessions_of(args[0]), args[1:], kwargs)
+                        await asyncio.sleep(backoff_ms(attempt) / 1000)
+                    result = await func(*args, **kwargs)
+                except Exception as err:
+                    reason = classify_transient_error(err)
+                    if reason is None:
+                        raise
+                    attempt += 1
+                    outcome = _next_outcome(attempt, idempotent=idempotent)
+                    retry_stats.incr(operation, f"{reason}:{outcome}")
+                    if outcome != "retried":
+                        logger.warning(
+                            "一時的なDB障害のため処理を中断しました: %s reason=%s",
+                            operation,
+                            reason,
+                        )
+                        raise ServiceUnavailableError(
+                            retry_after=settings.admission_retry_after_seconds
+                        ) from err
+
+                    logger.info(
+                        "一時的なDB障害のため再実行します: %s reason=%s attempt=%d",
+                        operation,
+                        reason,
+                        attempt,
+                    )
+                    continue
+
+                if attempt:
+                    retry_stats.incr(operation, "recovered")
+                return result
+
+        wrapper.idempotent = idempotent
+        return wrapper
+
+    return decorator
+
+
+def _next_outcome(attempt: int, *, idempotent: bool) -> str:
+    """失敗した attempt 回目の後に再実行するかを判定する。"""
+    if not idempotent:
+        return "not_idempotent"
+    if attempt >= settings.db_retry_max_attempts:
+        return "exhausted"
+    remaining = remaining_ms()
+    if remaining is not None and remaining < settings.db_retry_max_delay_ms:
+        return "deadline"
+    if not retry_budget.try_withdraw():
+        return "budget_exhausted"
+    return "retried"
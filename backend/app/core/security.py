@@ -1,9 +1,11 @@
 import datetime
+import time
 
 import bcrypt
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.core.metrics import password_hash_duration
 
 # Cookie 設定の定数
 COOKIE_NAME = "access_token"
@@ -14,15 +16,21 @@ COOKIE_SAMESITE = "lax"
 def hash_password(password: str) -> str:
     """平文パスワードをbcryptでハッシュ化する。"""
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    started = time.perf_counter()
+    hashed = bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+    password_hash_duration.observe(("hash",), time.perf_counter() - started)
+    return hashed
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """平文パスワードとハッシュ値を照合する。"""
-    return bcrypt.checkpw(
+    started = time.perf_counter()
+    verified = bcrypt.checkpw(
         plain_password.encode("utf-8"), hashed_password.encode("utf-8")
     )
+    password_hash_duration.observe(("verify",), time.perf_counter() - started)
+    return verified
 
 
 def create_access_token(user_id: int) -> str:
@@ -0,0 +1,302 @@
+"""スロークエリログ。
+
+閾値を超えたSQLをパラメータを除去したフィンガープリントに正規化し、
+件数・p50/p95/最大実行時間・最新の実行計画をメモリ上で集計する。
+WHERE句の組み合わせが異なるクエリは別のフィンガープリントになるため、
+find_list の検索条件の組み合わせごとの劣化を確認できる。
+
+実行計画は別コネクション（NullPool）で非同期に取得し、リクエスト処理を待たせない。
+取得は閾値に比例した statement_timeout で打ち切る。
+集計はプロセス単位で保持する。
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 1フィンガープリントあたりに保持する実行時間サンプル数
+_MAX_SAMPLES = 1000
+# 集計するフィンガープリントの上限（超過分は記録しない）
+_MAX_FINGERPRINTS = 500
+# 同一フィンガープリントの実行計画を再取得する最短間隔（秒）
+_EXPLAIN_INTERVAL_SECONDS = 300.0
+# EXPLAIN の statement_timeout（閾値に対する倍率と下限）。
+# ANALYZE は文を実際に実行するため、劣化したクエリで DB を占有し続けないよう打ち切る
+_EXPLAIN_TIMEOUT_FACTOR = 10
+_EXPLAIN_MIN_TIMEOUT_MS = 1000
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s|%s")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_RE = re.compile(r"\bVALUES\s*\(.*\)", re.IGNORECASE | re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# EXPLAIN ANALYZE は文を実際に実行するため、参照系の文に限定する
+_ANALYZABLE_PREFIXES = ("SELECT", "WITH")
+_EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQLからリテラル・バインドパラメータを除去して正規化する。"""
+    sql = _COMMENT_RE.sub(" ", statement)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _WHITESPACE_RE.sub(" ", sql).strip()
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub("VALUES (...)", sql)
+    return sql
+
+
+def fingerprint_sql(statement: str) -> str:
+    """正規化したSQLから短いフィンガープリントを生成する。"""
+    normalized = normalize_sql(statement)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _percentile(sorted_values: list[float], ratio: float) -> float:
+    """ソート済みの値から最近順位法でパーセンタイルを求める。"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(ratio * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _SlowQueryStats:
+    """1フィンガープリント分の集計値。"""
+
+    __slots__ = (
+        "fingerprint",
+        "statement",
+        "count",
+        "max_ms",
+        "samples",
+        "last_plan",
+        "last_explained_at",
+        "last_seen_at",
+    )
+
+    def __init__(self, fingerprint: str, statement: str):
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.count = 0
+        self.max_ms = 0.0
+        self.samples: deque[float] = deque(maxlen=_MAX_SAMPLES)
+        self.last_plan: Any = None
+        self.last_explained_at: float | None = None
+        self.last_seen_at: datetime | None = None
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.samples.append(duration_ms)
+        self.last_seen_at = datetime.now(UTC)
+
+    def to_dict(self) -> dict[str, Any]:
+        sorted_samples = sorted(self.samples)
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement,
+            "count": self.count,
+            "p50_ms": round(_percentile(sorted_samples, 0.50), 3),
+            "p95_ms": round(_percentile(sorted_samples, 0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "last_plan": self.last_plan,
+            "last_seen_at": self.last_seen_at,
+        }
+
+
+class SlowQueryLog:
+    """閾値を超えたSQLをフィンガープリント単位で集計するスロークエリログ。"""
+
+    def __init__(
+        self,
+        *,
+        threshold_ms: float,
+        explain: bool = True,
+        explain_url: str | None = None,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_url = explain_url
+        self._stats: dict[str, _SlowQueryStats] = {}
+        self._explain_engine: AsyncEngine | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms >= 0
+
+    def install(self, engine: AsyncEngine) -> None:
+        """エンジンに実行時間計測用のイベントリスナーを登録する。"""
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def uninstall(self, engine: AsyncEngine) -> None:
+        """install で登録したイベントリスナーを解除する。"""
+        sync_engine = engine.sync_engine
+        event.remove(sync_engine, "before_cursor_execute", self._before_execute)
+        event.remove(sync_engine, "after_cursor_execute", self._after_execute)
+        event.remove(sync_engine, "handle_error", self._handle_error)
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        started = conn.info["slow_query_start"].pop()
+        if not self.enabled:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= self.threshold_ms:
+            self.record(
+                statement,
+                None if executemany else parameters,
+                duration_ms,
+            )
+
+    def _handle_error(self, context) -> None:
+        # 失敗した SQL は after_cursor_execute が呼ばれないため、ここで開始時刻を破棄
+        starts = (
+            context.connection.info.get("slow_query_start")
+            if context.connection
+            else None
+        )
+        if starts:
+            starts.pop()
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+    ) -> None:
+        """スロークエリを1件記録し、必要に応じて実行計画の取得を予約する。"""
+        fingerprint = fingerprint_sql(statement)
+        stats = self._stats.get(fingerprint)
+        if stats is None:
+            if len(self._stats) >= _MAX_FINGERPRINTS:
+                return
+            stats = _SlowQueryStats(fingerprint, normalize_sql(statement))
+            self._stats[fingerprint] = stats
+        stats.add(duration_ms)
+
+        logger.warning(
+            "スロークエリを検出しました: fingerprint=%s duration_ms=%.1f",
+            fingerprint,
+            duration_ms,
+        )
+
+        if self._should_explain(stats, statement, parameters):
+            self._schedule_explain(stats, statement, parameters)
+
+    def _should_explain(
+        self, stats: _SlowQueryStats, statement: str, parameters: Any
+    ) -> bool:
+        if not self.explain or self.explain_url is None or parameters is None:
+            return False
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE_PREFIXES):
+            return False
+        if stats.last_explained_at is None:
+            return True
+        return time.monotonic() - stats.last_explained_at >= _EXPLAIN_INTERVAL_SECONDS
+
+    def _schedule_explain(
+        self, stats: _SlowQueryStats, statement: str, parameters: Any
+    ) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 同期エンジン（Alembic等）から呼ばれた場合は取得しない
+            return
+        stats.last_explained_at = time.monotonic()
+        task = loop.create_task(self._capture_plan(stats, statement, parameters))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _capture_plan(
+        self, stats: _SlowQueryStats, statement: str, parameters: Any
+    ) -> None:
+        """別コネクションで EXPLAIN を実行し、実行計画を保存する。"""
+        if statement.lstrip().upper().startswith(_ANALYZABLE_PREFIXES):
+            options = "ANALYZE, BUFFERS, FORMAT JSON"
+        else:
+            options = "FORMAT JSON"
+        try:
+            async with self._get_explain_engine().connect() as conn:
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {self._explain_timeout_ms()}"
+                )
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN ({options}) {statement}", parameters
+                )
+                stats.last_plan = result.scalar_one()
+                # ANALYZE で実行した文の副作用を残さない
+                await conn.rollback()
+        except Exception:
+            logger.warning(
+                "実行計画の取得に失敗しました: fingerprint=%s",
+                stats.fingerprint,
+                exc_info=True,
+            )
+
+    def _explain_timeout_ms(self) -> int:
+        return max(
+            round(self.threshold_ms * _EXPLAIN_TIMEOUT_FACTOR),
+            _EXPLAIN_MIN_TIMEOUT_MS,
+        )
+
+    def _get_explain_engine(self) -> AsyncEngine:
+        if self._explain_engine is None:
+            self._explain_engine = create_async_engine(
+                self.explain_url, poolclass=NullPool
+            )
+        return self._explain_engine
+
+    async def wait_for_explains(self) -> None:
+        """取得中の実行計画がすべて保存されるまで待機する。"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def close(self) -> None:
+        """取得中の実行計画を待ってから、EXPLAIN 用のエンジンを破棄する。"""
+        await self.wait_for_explains()
+        if self._explain_engine is not None:
+            await self._explain_engine.dispose()
+            self._explain_engine = None
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """集計結果を最大実行時間の降順で返す。"""
+        stats = sorted(self._stats.values(), key=lambda s: s.max_ms, reverse=True)
+        return [s.to_dict() for s in stats]
+
+    def clear(self) -> None:
+        """集計結果を破棄する。"""
+        self._stats.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    explain=settings.slow_query_explain,
+    explain_url=settings.database_url,
+)
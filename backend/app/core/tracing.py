@@ -0,0 +1,408 @@
+"""リクエスト単位の軽量なトレーシング。
+
+API リクエストごとにルートスパンを作り、その中のハンドラ・エンドポイント・
+サービス・リポジトリ・読み取りモデルのメソッドと SQL の実行を子スパンとして
+記録する。親子関係は ContextVar で伝播するため、BaseHTTPMiddleware などが
+作るタスクの中でも引き継がれる。
+
+サンプリングはルートスパンで決める（tracing_sample_rate）。サンプリング対象外の
+リクエストではスパンを作らず、計装したメソッドは ContextVar を1回参照するだけで
+元の処理を呼ぶ。W3C の traceparent ヘッダを受け取った場合はそのトレースIDと
+サンプリングの指定を引き継ぐ。
+
+完了したトレースは OTLP/JSON（ExportTraceServiceRequest）を1行1トレースで
+ローテーションするファイルに書き出す。OpenTelemetry Collector の
+otlpjsonfile レシーバーでそのまま読み込めるほか、jq などで直接集計できる。
+ファイルへの書き込みは app.core.ndjson_file のライターで行う。
+"""
+
+import enum
+import functools
+import inspect
+import logging
+import random
+import re
+import secrets
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import UNMATCHED_ROUTE
+from app.core.ndjson_file import NdjsonFileWriter
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "daily-report-api"
+
+# 1トレースに記録するスパンの上限（超過分は dropped_spans に数える）
+_MAX_SPANS_PER_TRACE = 1000
+# SQL スパンに記録する文の最大長
+_MAX_STATEMENT_LENGTH = 2000
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class SpanKind(enum.IntEnum):
+    """OTLP の Span.SpanKind。"""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class _Trace:
+    """1トレース分のスパンの集まり。"""
+
+    __slots__ = ("trace_id", "spans", "dropped_spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self.dropped_spans = 0
+
+
+class Span:
+    """処理1つ分の開始・終了時刻と属性。"""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_span_id",
+        "name",
+        "kind",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+    )
+
+    def __init__(
+        self,
+        trace: _Trace,
+        name: str,
+        *,
+        parent_span_id: str | None,
+        kind: SpanKind,
+        attributes: dict[str, Any] | None,
+    ):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+
+    def end(self, error: BaseException | None = None) -> None:
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = type(error).__name__
+
+
+def _child_span(
+    parent: Span,
+    name: str,
+    *,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: dict[str, Any] | None = None,
+) -> Span | None:
+    """子スパンを開始する。トレースのスパン数が上限に達した場合は None を返す。"""
+    trace = parent.trace
+    if len(trace.spans) >= _MAX_SPANS_PER_TRACE:
+        trace.dropped_spans += 1
+        return None
+    span = Span(
+        trace, name, parent_span_id=parent.span_id, kind=kind, attributes=attributes
+    )
+    trace.spans.append(span)
+    return span
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    """実行中のスパンを返す。トレース対象外では None。"""
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    *,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: dict[str, Any] | None = None,
+) -> Iterator[Span | None]:
+    """実行中のスパンの子スパンを開始し、with の間は実行中のスパンにする。
+
+    トレース対象外のリクエストでは何もせず None を返す。
+    """
+    parent = _current_span.get()
+    span = (
+        _child_span(parent, name, kind=kind, attributes=attributes)
+        if parent is not None
+        else None
+    )
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as err:
+        span.end(err)
+        raise
+    else:
+        span.end()
+    finally:
+        _current_span.reset(token)
+
+
+def traced[F: Callable[..., Any]](name: str) -> Callable[[F], F]:
+    """関数の呼び出しをスパンとして記録するデコレータ（同期・非同期の両方に対応）。
+
+    同じ名前で計装済みの関数はそのまま返す（include_router でルートを
+    作り直す場合など）。
+    """
+
+    def decorator(func: F) -> F:
+        if getattr(func, "__trace_name__", None) == name:
+            return func
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with start_span(name):
+                    return await func(*args, **kwargs)
+
+            async_wrapper.__trace_name__ = name  # type: ignore[attr-defined]
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with start_span(name):
+                return func(*args, **kwargs)
+
+        wrapper.__trace_name__ = name  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def trace_methods[C: type](cls: C) -> C:
+    """クラスの公開メソッド（非同期）をすべて「クラス名.メソッド名」のスパンで記録する。"""
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_") or not inspect.iscoroutinefunction(attr):
+            continue
+        setattr(cls, attr_name, traced(f"{cls.__name__}.{attr_name}")(attr))
+    return cls
+
+
+def _attribute_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON では int64 を文字列で表す
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _span_to_otlp(span: Span) -> dict[str, Any]:
+    otlp: dict[str, Any] = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": int(span.kind),
+        "startTimeUnixNano": str(span.start_ns),
+        # 終了していないスパン（エラー通知のなかった SQL など）は
+        # 書き出し時点で終了したとみなす
+        "endTimeUnixNano": str(span.end_ns or time.time_ns()),
+        "attributes": [
+            {"key": key, "value": _attribute_value(value)}
+            for key, value in span.attributes.items()
+        ],
+        "status": (
+            {"code": 2, "message": span.error} if span.error is not None else {}
+        ),
+    }
+    if span.parent_span_id is not None:
+        otlp["parentSpanId"] = span.parent_span_id
+    return otlp
+
+
+def to_otlp(trace: _Trace) -> dict[str, Any]:
+    """トレースを OTLP/JSON の ExportTraceServiceRequest に変換する。"""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {
+                            "key": "service.name",
+                            "value": _attribute_value(SERVICE_NAME),
+                        },
+                    ],
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [_span_to_otlp(span) for span in trace.spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(NdjsonFileWriter):
+    """完了したトレースをローテーションするファイルに書き込む。"""
+
+    def start(self, path: str, *, max_bytes: int, backup_count: int) -> None:
+        super().start(path, max_bytes=max_bytes, backup_count=backup_count)
+        logger.info("トレースの出力を開始しました: %s", path)
+
+    def export(self, trace: _Trace) -> None:
+        if not self.active:
+            return
+        if trace.dropped_spans:
+            logger.warning(
+                "スパン数が上限を超えたため一部を記録しませんでした: "
+                "trace_id=%s dropped=%d",
+                trace.trace_id,
+                trace.dropped_spans,
+            )
+        self.write(to_otlp(trace))
+
+
+span_exporter = SpanExporter()
+
+
+def _parse_traceparent(headers: list[tuple[bytes, bytes]]) -> tuple[str, str, bool]:
+    """traceparent ヘッダから (トレースID, 親スパンID, サンプリング指定) を返す。"""
+    for name, value in headers:
+        if name == b"traceparent":
+            match = _TRACEPARENT_RE.match(value.decode("latin-1").strip())
+            if match is not None and match[1] != "0" * 32:
+                return match[1], match[2], int(match[3], 16) & 1 == 1
+    return "", "", False
+
+
+class TracingMiddleware:
+    """サンプリングした API リクエストのルートスパンを作る ASGI ミドルウェア。"""
+
+    def __init__(self, app: ASGIApp, exporter: SpanExporter = span_exporter):
+        self.app = app
+        self.exporter = exporter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.exporter.active
+            or not scope["path"].startswith("/api/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_span_id, sampled = _parse_traceparent(scope["headers"])
+        if not sampled and random.random() >= settings.tracing_sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        trace = _Trace(trace_id or secrets.token_hex(16))
+        root = Span(
+            trace,
+            scope["method"],
+            parent_span_id=parent_span_id or None,
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "url.path": scope["path"]},
+        )
+        trace.spans.append(root)
+        status = 500
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_status)
+        except BaseException as err:
+            root.end(err)
+            raise
+        else:
+            root.end()
+        finally:
+            _current_span.reset(token)
+            route = scope.get("route")
+            route_path = route.path if route is not None else UNMATCHED_ROUTE
+            root.name = f"{scope['method']} {route_path}"
+            root.attributes["http.route"] = route_path
+            root.attributes["http.status_code"] = status
+            if status >= 500 and root.error is None:
+                root.error = f"HTTP {status}"
+            self.exporter.export(trace)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current_span.get()
+    span = None
+    if parent is not None:
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        span = _child_span(
+            parent,
+            f"SQL {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.statement": statement[:_MAX_STATEMENT_LENGTH],
+                "db.executemany": executemany,
+            },
+        )
+    conn.info.setdefault("tracing_spans", []).append(span)
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    span = conn.info["tracing_spans"].pop()
+    if span is not None:
+        span.end()
+
+
+def _handle_error(context) -> None:
+    spans = context.connection.info.get("tracing_spans") if context.connection else None
+    if spans:
+        span = spans.pop()
+        if span is not None:
+            span.end(context.original_exception)
+
+
+def install_sql_tracing(engine: AsyncEngine) -> None:
+    """エンジンに SQL の実行をスパンとして記録するイベントリスナーを登録する。"""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def uninstall_sql_tracing(engine: AsyncEngine) -> None:
+    """install_sql_tracing で登録したイベントリスナーを解除する。"""
+    sync_engine = engine.sync_engine
+    event.remove(sync_engine, "before_cursor_execute", _before_execute)
+    event.remove(sync_engine, "after_cursor_execute", _after_execute)
+    event.remove(sync_engine, "handle_error", _handle_error)
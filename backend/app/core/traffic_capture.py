@@ -0,0 +1,161 @@
+"""本番トラフィックのキャプチャ（オプトイン）。
+
+API リクエストをサンプリングし、メソッド・パス・ルート・クエリ・本文・
+ユーザーID・ステータス・処理時間を1行1件の JSON（NDJSON）としてローテーション
+するファイルに記録する。記録したファイルは scripts.replay_traffic で
+ステージング環境に再生できる。
+
+Cookie・Authorization ヘッダは記録しない。本文とクエリのキーに password を含む
+値は伏せ字にする。traffic_capture_bodies を無効にすると本文は SHA-256 のみを
+記録する（この場合は再生できず、リクエストの内訳の分析専用になる）。
+ファイルへの書き込みは app.core.ndjson_file のライターで行う。
+"""
+
+import hashlib
+import json
+import logging
+import random
+import time
+from datetime import UTC, datetime
+from http.cookies import SimpleCookie
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.ndjson_file import NdjsonFileWriter
+from app.core.security import COOKIE_NAME, decode_access_token
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "[REDACTED]"
+
+# これより大きい本文は SHA-256 のみを記録する
+_MAX_BODY_BYTES = 64 * 1024
+
+
+def _redact(value: Any) -> Any:
+    """キーに password を含む値を再帰的に伏せ字にする。"""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if "password" in k.lower() else _redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _redact_query(query_string: str) -> str:
+    pairs = parse_qsl(query_string, keep_blank_values=True)
+    return urlencode(
+        [(k, REDACTED if "password" in k.lower() else v) for k, v in pairs]
+    )
+
+
+def _user_id(headers: list[tuple[bytes, bytes]]) -> int | None:
+    """アクセストークンの Cookie からユーザーIDを取り出す。"""
+    for name, value in headers:
+        if name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(COOKIE_NAME)
+            if morsel is not None:
+                return decode_access_token(morsel.value)
+    return None
+
+
+def _body_fields(
+    body: bytes, size: int, sha256: str, content_type: str
+) -> dict[str, Any]:
+    if size == 0:
+        return {}
+    if (
+        settings.traffic_capture_bodies
+        and size <= _MAX_BODY_BYTES
+        and content_type.startswith("application/json")
+    ):
+        try:
+            return {"body": _redact(json.loads(body))}
+        except ValueError:
+            pass
+    return {"body_sha256": sha256}
+
+
+class TrafficRecorder(NdjsonFileWriter):
+    """キャプチャした記録をローテーションするファイルに書き込む。"""
+
+    def start(self, path: str, *, max_bytes: int, backup_count: int) -> None:
+        super().start(path, max_bytes=max_bytes, backup_count=backup_count)
+        logger.info("トラフィックのキャプチャを開始しました: %s", path)
+
+    def record(self, entry: dict[str, Any]) -> None:
+        self.write(entry)
+
+
+traffic_recorder = TrafficRecorder()
+
+
+class TrafficCaptureMiddleware:
+    """サンプリングした API リクエストを記録する ASGI ミドルウェア。"""
+
+    def __init__(self, app: ASGIApp, recorder: TrafficRecorder = traffic_recorder):
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.recorder.active
+            or not scope["path"].startswith("/api/")
+            or random.random() >= settings.traffic_capture_sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        started_at = datetime.now(UTC)
+        started = time.perf_counter()
+        body = bytearray()
+        size = 0
+        digest = hashlib.sha256()
+        status: int | None = None
+
+        async def receive_body() -> Message:
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                digest.update(chunk)
+                if size <= _MAX_BODY_BYTES:
+                    body.extend(chunk)
+            return message
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_status)
+        finally:
+            content_type = dict(scope["headers"]).get(b"content-type", b"")
+            route = scope.get("route")
+            self.recorder.record(
+                {
+                    "ts": started_at.isoformat(),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),
+                    "query": _redact_query(scope["query_string"].decode("latin-1")),
+                    "user_id": _user_id(scope["headers"]),
+                    **_body_fields(
+                        bytes(body),
+                        size,
+                        digest.hexdigest(),
+                        content_type.decode("latin-1"),
+                    ),
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+            )
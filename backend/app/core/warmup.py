@@ -0,0 +1,158 @@
+"""起動時のウォームアップ。
+
+デプロイ直後の初回リクエストが遅くならないよう、lifespan の起動処理で
+以下を事前に済ませる。
+
+- コネクションプールに接続（TLSハンドシェイク含む）を確立しておく
+- ORM マッパーを構成する
+- 主要なリポジトリクエリを一致0件の条件で実行し、コンパイル済みSQLをキャッシュする
+- Pydantic スキーマと OpenAPI スキーマを構築する
+
+DBに接続できない場合は起動を止めず、バックグラウンドで再試行する。
+完了するまでヘルスチェックは準備中を返す。
+"""
+
+import asyncio
+import importlib
+import inspect
+import logging
+import pkgutil
+import time
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import configure_mappers
+
+import app.schemas
+from app.core.config import settings
+from app.core.database import async_session, engine
+from app.models.daily_report import ReportStatus
+from app.models.user import UserRole
+from app.read_models.customer_read_model import CustomerReadModel
+from app.read_models.report_read_model import ReportReadModel
+from app.read_models.user_read_model import UserReadModel
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+# 失敗時に再試行するまでの待機時間（秒）
+_RETRY_INTERVAL_SECONDS = 5.0
+
+# 実在しないIDと検索語（一致0件の条件でクエリの形だけを実行する）
+_NO_MATCH_ID = 0
+_NO_MATCH_KEYWORD = "__warmup__"
+
+
+async def _open_pool_connections(db_engine: AsyncEngine, count: int) -> None:
+    """指定数の接続を同時に確立してプールに戻す。
+
+    一部の接続に失敗した場合も、確立できた接続をプールに戻してから送出する。
+    """
+    results = await asyncio.gather(
+        *(db_engine.connect().start() for _ in range(count)),
+        return_exceptions=True,
+    )
+    connections = [r for r in results if not isinstance(r, BaseException)]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for conn in connections:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            await conn.close()
+
+
+async def _run_hot_queries(session: AsyncSession) -> None:
+    """主要なクエリを一致0件の条件で実行し、コンパイル済みキャッシュを作る。"""
+    await ReportRepository(session).find_by_id(_NO_MATCH_ID)
+    await CustomerRepository(session).find_by_id(_NO_MATCH_ID)
+
+    users = UserRepository(session)
+    await users.find_by_email(_NO_MATCH_KEYWORD)
+    # get_current_user の認証クエリ
+    await users.find_by_id(_NO_MATCH_ID)
+    await users.find_list(role=UserRole.MANAGER)
+
+    report_rows = ReportReadModel(session)
+    await report_rows.find_list(salesperson_id=_NO_MATCH_ID)
+    await report_rows.find_list(
+        salesperson_id=_NO_MATCH_ID, status=ReportStatus.SUBMITTED
+    )
+    await CustomerReadModel(session).find_list(company_name=_NO_MATCH_KEYWORD)
+    await UserReadModel(session).find_list(role=UserRole.MANAGER)
+
+
+def _build_schemas(application: FastAPI) -> None:
+    """app.schemas 配下の Pydantic モデルと OpenAPI スキーマを構築する。"""
+    for module_info in pkgutil.iter_modules(app.schemas.__path__):
+        module = importlib.import_module(f"app.schemas.{module_info.name}")
+        for _, model in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(model, BaseModel) or model.__module__ != module.__name__:
+                continue
+            # 未パラメータ化のジェネリックモデルは対象外
+            if model.__pydantic_generic_metadata__["parameters"]:
+                continue
+            model.model_rebuild()
+            model.model_json_schema()
+    application.openapi()
+
+
+class Warmup:
+    """ウォームアップの実行と完了状態を管理する。"""
+
+    def __init__(self):
+        self.ready = False
+        self.duration_ms: float | None = None
+        self._retry_task: asyncio.Task | None = None
+
+    async def run(
+        self,
+        application: FastAPI,
+        *,
+        db_engine: AsyncEngine = engine,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+    ) -> None:
+        """ウォームアップを1回実行する。"""
+        started = time.perf_counter()
+
+        configure_mappers()
+        await _open_pool_connections(db_engine, settings.warmup_pool_connections)
+        async with session_factory() as session:
+            await _run_hot_queries(session)
+            await session.rollback()
+        _build_schemas(application)
+
+        self.duration_ms = (time.perf_counter() - started) * 1000
+        self.ready = True
+        logger.info("ウォームアップが完了しました: %.1fms", self.duration_ms)
+
+    async def start(self, application: FastAPI) -> None:
+        """起動時に実行する。失敗した場合はバックグラウンドで再試行する。"""
+        try:
+            await self.run(application)
+        except Exception:
+            logger.exception("ウォームアップに失敗しました。再試行します")
+            self._retry_task = asyncio.create_task(self._retry(application))
+
+    async def _retry(self, application: FastAPI) -> None:
+        while not self.ready:
+            await asyncio.sleep(_RETRY_INTERVAL_SECONDS)
+            try:
+                await self.run(application)
+            except Exception:
+                logger.warning("ウォームアップの再試行に失敗しました", exc_info=True)
+
+    async def stop(self) -> None:
+        """再試行中のタスクを停止する。"""
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            self._retry_task = None
+
+
+warmup = Warmup()
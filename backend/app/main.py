@@ -1,31 +1,115 @@
 import logging
+import secrets
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
+from app.api.in_memory import use_in_memory_repositories
 from app.api.v1.auth import router as auth_router
 from app.api.v1.customers import router as customers_router
+from app.api.v1.diagnostics import router as diagnostics_router
 from app.api.v1.reports import router as reports_router
 from app.api.v1.users import router as users_router
+from app.core.access_log import AccessLogMiddleware
+from app.core.admission import admission
+from app.core.allocation_tracker import (
+    AllocationTrackingMiddleware,
+    allocation_tracker,
+)
+from app.core.circuit_breaker import CircuitState, db_circuit_breaker
 from app.core.config import settings
-from app.core.exceptions import AppError
+from app.core.database import engine
+from app.core.deadline import CancelOnDisconnectMiddleware
+from app.core.exceptions import (
+    AppError,
+    NotFoundError,
+    ServiceUnavailableError,
+    UnauthorizedError,
+)
+from app.core.health import health_checker
+from app.core.leak_detector import leak_detector
+from app.core.logging_config import log_queue
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.slow_query import slow_query_log
+from app.core.tracing import TracingMiddleware, span_exporter
+from app.core.traffic_capture import TrafficCaptureMiddleware, traffic_recorder
+from app.core.warmup import warmup
+from app.repositories.in_memory import InMemoryStore, seed_master_data
 from app.schemas.common import ErrorBody, ErrorResponse
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncGenerator[None]:
+    """起動時にウォームアップを行い、終了時にコネクションプールを破棄する。
+
+    REPOSITORY_BACKEND=memory の場合はDBを使わないため、ウォームアップの代わりに
+    マスタデータを登録したインメモリのリポジトリに差し替える。
+    """
+    log_queue.start(
+        level=settings.log_level,
+        fmt=settings.log_format,
+        queue_size=settings.log_queue_size,
+    )
+    health_checker.install_drain_handler(settings.shutdown_drain_seconds)
+    if settings.repository_backend == "memory":
+        store = InMemoryStore()
+        seed_master_data(store)
+        use_in_memory_repositories(application, store)
+    elif settings.warmup_enabled:
+        await warmup.start(application)
+    if settings.leak_detection_enabled:
+        leak_detector.start()
+    if settings.loop_monitor_enabled:
+        loop_monitor.start(
+            interval_seconds=settings.loop_monitor_interval_ms / 1000,
+            block_threshold_seconds=settings.loop_blocking_threshold_ms / 1000,
+        )
+    if settings.metrics_multiprocess_dir:
+        registry.start(
+            settings.metrics_multiprocess_dir,
+            interval_seconds=settings.metrics_flush_interval_seconds,
+        )
+    if settings.memory_profiling_enabled:
+        allocation_tracker.start(settings.memory_profiling_frames)
+    if settings.tracing_enabled:
+        span_exporter.start(
+            settings.tracing_path,
+            max_bytes=settings.tracing_max_bytes,
+            backup_count=settings.tracing_backup_count,
+        )
+    if settings.traffic_capture_enabled:
+        traffic_recorder.start(
+            settings.traffic_capture_path,
+            max_bytes=settings.traffic_capture_max_bytes,
+            backup_count=settings.traffic_capture_backup_count,
+        )
+    yield
+    health_checker.start_draining()
+    health_checker.uninstall_drain_handler()
+    traffic_recorder.stop()
+    span_exporter.stop()
+    allocation_tracker.stop()
+    await registry.stop()
+    await loop_monitor.stop()
+    await leak_detector.stop()
+    await warmup.stop()
+    await slow_query_log.close()
+    await engine.dispose()
+    log_queue.stop()
+
+
 app = FastAPI(
     title="営業日報システム API",
     description="営業日報の作成・管理を行うREST API",
     version="0.1.0",
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allowed_origins.split(","),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    lifespan=lifespan,
 )
 
 
@@ -46,6 +130,17 @@ async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
     return JSONResponse(
         status_code=exc.status_code,
         content=error_response.model_dump(exclude_none=True),
+        headers=exc.headers,
+    )
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """コネクションプールの取得待ちタイムアウトを503として返す。"""
+    logger.warning("コネクションプールの取得待ちがタイムアウトしました")
+    return await app_error_handler(
+        request,
+        ServiceUnavailableError(retry_after=settings.admission_retry_after_seconds),
     )
 
 
@@ -68,12 +163,103 @@ async def catch_unhandled_exceptions(request: Request, call_next):
         )
 
 
+# アドミッション制御を通過したリクエストだけを順に処理するよう、内側に登録する
+app.add_middleware(AllocationTrackingMiddleware)
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """APIリクエストの同時実行数をコネクションプールの容量以内に制限する。
+
+    DBを使わない OPTIONS（CORS のプリフライト等）は対象外とする。
+    """
+    if request.method == "OPTIONS" or not request.url.path.startswith("/api/"):
+        return await call_next(request)
+    try:
+        async with admission.budget_for(request.method).admit():
+            return await call_next(request)
+    except ServiceUnavailableError as exc:
+        logger.warning(
+            "過負荷のためリクエストを拒否しました: %s %s",
+            request.method,
+            request.url.path,
+        )
+        return await app_error_handler(request, exc)
+
+
+# 過負荷での 503 や 500 エラーにも CORS ヘッダーを付与し、プリフライトには
+# アドミッション制御を通さずに応答するよう、それらより外側に登録する
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.allowed_origins.split(","),
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+# アドミッション制御の待ち時間もルートスパンに含める
+app.add_middleware(TracingMiddleware)
+# 過負荷での拒否や500エラーも含めて記録できるよう、他のミドルウェアの外側に登録する
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(AccessLogMiddleware)
+app.add_middleware(TrafficCaptureMiddleware)
+# クライアント切断を最初に検知できるよう、最も外側のミドルウェアとして登録する
+app.add_middleware(CancelOnDisconnectMiddleware)
+
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(reports_router, prefix="/api/v1")
 app.include_router(customers_router, prefix="/api/v1")
 app.include_router(users_router, prefix="/api/v1")
+app.include_router(diagnostics_router, prefix="/api/v1")
 
 
 @app.get("/health")
 async def health_check():
+    """ウォームアップ完了までは 503 を返す（互換のため残している）。
+
+    デプロイ先のヘルスチェックには /health/live と /health/ready を使う。
+
+    DB接続のサーキットブレーカーの状態を database に含める。ブレーカーが開いている間も
+    プロセス自体は稼働しているため、status を degraded として 200 を返す。
+    """
+    if (
+        settings.warmup_enabled
+        and settings.repository_backend == "database"
+        and not warmup.ready
+    ):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    database = db_circuit_breaker.snapshot()["state"]
+    health = "ok" if database == CircuitState.CLOSED else "degraded"
+    return {"status": health, "database": database}
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """プロセスが応答できれば 200 を返す。依存先の状態は確認しない。"""
     return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """トラフィックを受けられる状態なら 200、そうでなければ 503 を返す。
+
+    終了処理中・ウォームアップ未完了・コネクションプールの飽和・DB の ping の
+    失敗のいずれかに当てはまる場合は受けられない状態とする。
+    """
+    ready, body = await health_checker.readiness()
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus のテキスト形式でメトリクスを返す（スクレイプ用）。
+
+    METRICS_TOKEN が未設定なら 404、Bearer トークンが一致しなければ 401 を返す。
+    """
+    if settings.metrics_token is None:
+        raise NotFoundError()
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), settings.metrics_token.encode()
+    ):
+        raise UnauthorizedError()
+    return Response(await registry.render(), media_type=CONTENT_TYPE)
@@ -22,7 +22,7 @@ class Comment(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     daily_report_id: Mapped[int] = mapped_column(
-        ForeignKey("daily_reports.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("daily_reports.id", ondelete="CASCADE"), nullable=False, index=True
     )
     manager_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     target: Mapped[CommentTarget] = mapped_column(nullable=False)
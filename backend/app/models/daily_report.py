@@ -28,7 +28,7 @@ class DailyReport(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     salesperson_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    report_date: Mapped[date] = mapped_column(Date, nullable=False)
+    report_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     problem: Mapped[str | None] = mapped_column(Text, nullable=True)
     plan: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[ReportStatus] = mapped_column(
@@ -16,9 +16,11 @@ class VisitRecord(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     daily_report_id: Mapped[int] = mapped_column(
-        ForeignKey("daily_reports.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("daily_reports.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    customer_id: Mapped[int] = mapped_column(
+        ForeignKey("customers.id"), nullable=False, index=True
     )
-    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"), nullable=False)
     visit_content: Mapped[str] = mapped_column(Text, nullable=False)
     visited_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     visit_order: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,111 @@
+"""顧客一覧の読み取りモデル。
+
+ORM エンティティを経由せず、SQLAlchemy Core の select 結果を
+軽量なタプルレコードに直接マッピングする。
+"""
+
+import functools
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import register_function_cache
+from app.core.tracing import trace_methods
+from app.models.customer import Customer
+
+_customers = Customer.__table__
+
+_SORT_COLUMNS = {
+    "company_name": _customers.c.company_name,
+    "contact_name": _customers.c.contact_name,
+}
+
+# 部分一致検索の条件（キーはバインドパラメータ名。値は %検索語% で渡す）
+_LIST_CRITERIA = {
+    "company_name": _customers.c.company_name.ilike(bindparam("company_name")),
+    "contact_name": _customers.c.contact_name.ilike(bindparam("contact_name")),
+}
+
+
+@functools.cache
+def _build_list_statements(
+    criteria: frozenset[str], sort: str, order: str
+) -> tuple[Select, Select]:
+    """検索条件の組み合わせ・ソートごとの一覧取得文と件数取得文を構築する。"""
+    where = [_LIST_CRITERIA[name] for name in _LIST_CRITERIA if name in criteria]
+    sort_column = _SORT_COLUMNS[sort]
+    query = (
+        select(
+            _customers.c.id,
+            _customers.c.company_name,
+            _customers.c.contact_name,
+            _customers.c.phone,
+            _customers.c.email,
+        )
+        .where(*where)
+        .order_by(sort_column.asc() if order == "asc" else sort_column.desc())
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    count_query = select(func.count()).select_from(_customers).where(*where)
+    return query, count_query
+
+
+register_function_cache("customer_list_statements", _build_list_statements)
+
+
+class CustomerListRow(NamedTuple):
+    """顧客一覧の1件分のレコード。"""
+
+    id: int
+    company_name: str
+    contact_name: str
+    phone: str | None
+    email: str | None
+
+    def to_response(self) -> dict[str, Any]:
+        """CustomerListItemResponse と同じ形式のJSON互換dictに変換する。"""
+        return self._asdict()
+
+
+@trace_methods
+class CustomerReadModel:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find_list(
+        self,
+        *,
+        company_name: str | None = None,
+        contact_name: str | None = None,
+        sort: str = "company_name",
+        order: str = "asc",
+        page: int = 1,
+        per_page: int = 20,
+    ) -> tuple[list[CustomerListRow], int]:
+        """検索条件に基づいて顧客一覧のレコードを取得する。
+
+        検索条件の組み合わせ・ソートごとにバインドパラメータ化した文を使い回す。
+        """
+        params = {
+            name: f"%{value}%"
+            for name, value in (
+                ("company_name", company_name),
+                ("contact_name", contact_name),
+            )
+            if value is not None
+        }
+        query, count_query = _build_list_statements(
+            frozenset(params),
+            sort if sort in _SORT_COLUMNS else "company_name",
+            "asc" if order == "asc" else "desc",
+        )
+
+        # 件数取得
+        total_count = (await self.db.execute(count_query, params)).scalar_one()
+
+        result = await self.db.execute(
+            query, {**params, "offset": (page - 1) * per_page, "limit": per_page}
+        )
+        return [CustomerListRow._make(row) for row in result], total_count
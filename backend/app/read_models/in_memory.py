@@ -0,0 +1,145 @@
+"""インメモリのリポジトリと同じデータを参照する読み取りモデル。
+
+InMemoryStore の行から一覧のレコードを直接作る。検索条件とソートは
+DB 版の読み取りモデルと同じ結果になるようにする。
+"""
+
+from collections.abc import Callable
+from datetime import date
+
+from app.models.customer import Customer
+from app.models.daily_report import DailyReport, ReportStatus
+from app.models.user import User, UserRole
+from app.models.visit_record import VisitRecord
+from app.read_models.customer_read_model import CustomerListRow
+from app.read_models.report_read_model import ReportListRow
+from app.read_models.user_read_model import UserListRow
+from app.repositories.in_memory import InMemoryStore, Row
+
+_REPORT_SORT_COLUMNS = ("report_date", "status", "submitted_at")
+
+
+def _report_filter(
+    *,
+    salesperson_id: int | None,
+    date_from: date | None,
+    date_to: date | None,
+    status: ReportStatus | None,
+) -> Callable[[Row], bool]:
+    """日報一覧の検索条件と同じ条件の関数を返す。"""
+    return lambda row: (
+        (salesperson_id is None or row["salesperson_id"] == salesperson_id)
+        and (date_from is None or row["report_date"] >= date_from)
+        and (date_to is None or row["report_date"] <= date_to)
+        and (status is None or row["status"] == status)
+    )
+
+
+_CUSTOMER_SORT_COLUMNS = ("company_name", "contact_name")
+
+
+def _customer_filter(
+    *, company_name: str | None, contact_name: str | None
+) -> Callable[[Row], bool]:
+    """顧客の部分一致検索（ILIKE）と同じ条件の関数を返す。"""
+    company_name = company_name.lower() if company_name is not None else None
+    contact_name = contact_name.lower() if contact_name is not None else None
+    return lambda row: (
+        (company_name is None or company_name in row["company_name"].lower())
+        and (contact_name is None or contact_name in row["contact_name"].lower())
+    )
+
+
+class InMemoryReportReadModel:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_list(
+        self,
+        *,
+        salesperson_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: ReportStatus | None = None,
+        sort: str = "report_date",
+        order: str = "desc",
+        page: int = 1,
+        per_page: int = 20,
+    ) -> tuple[list[ReportListRow], int]:
+        """検索条件に基づいて日報一覧のレコードを取得する。"""
+        rows = self.store.query(
+            DailyReport,
+            _report_filter(
+                salesperson_id=salesperson_id,
+                date_from=date_from,
+                date_to=date_to,
+                status=status,
+            ),
+            order_by=sort if sort in _REPORT_SORT_COLUMNS else "report_date",
+            descending=order != "asc",
+        )
+        page_rows = rows[(page - 1) * per_page : page * per_page]
+        return [self._to_record(row) for row in page_rows], len(rows)
+
+    def _to_record(self, row: Row) -> ReportListRow:
+        salesperson = self.store.get_row(User, row["salesperson_id"])
+        return ReportListRow(
+            id=row["id"],
+            report_date=row["report_date"],
+            salesperson_id=row["salesperson_id"],
+            salesperson_name=salesperson["name"],
+            status=row["status"],
+            submitted_at=row["submitted_at"],
+            visit_count=self.store.count_by(VisitRecord, "daily_report_id", row["id"]),
+        )
+
+
+class InMemoryCustomerReadModel:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_list(
+        self,
+        *,
+        company_name: str | None = None,
+        contact_name: str | None = None,
+        sort: str = "company_name",
+        order: str = "asc",
+        page: int = 1,
+        per_page: int = 20,
+    ) -> tuple[list[CustomerListRow], int]:
+        """検索条件に基づいて顧客一覧のレコードを取得する。"""
+        rows = self.store.query(
+            Customer,
+            _customer_filter(company_name=company_name, contact_name=contact_name),
+            order_by=sort if sort in _CUSTOMER_SORT_COLUMNS else "company_name",
+            descending=order != "asc",
+        )
+        records = [
+            CustomerListRow(
+                id=row["id"],
+                company_name=row["company_name"],
+                contact_name=row["contact_name"],
+                phone=row["phone"],
+                email=row["email"],
+            )
+            for row in rows[(page - 1) * per_page : page * per_page]
+        ]
+        return records, len(rows)
+
+
+class InMemoryUserReadModel:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_list(self, *, role: UserRole | None = None) -> list[UserListRow]:
+        """ユーザー一覧のレコードを取得する。roleで絞り込み可能。"""
+        rows = self.store.query(
+            User, None if role is None else lambda row: row["role"] == role
+        )
+        return [
+            UserListRow(
+                id=row["id"], name=row["name"], email=row["email"], role=row["role"]
+            )
+            for row in rows
+        ]
@@ -0,0 +1,145 @@
+"""日報一覧の読み取りモデル。
+
+ORM エンティティを経由せず、SQLAlchemy Core の select 結果を
+軽量なタプルレコードに直接マッピングする。
+"""
+
+import functools
+from datetime import date, datetime
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import register_function_cache
+from app.core.tracing import trace_methods
+from app.models.daily_report import DailyReport, ReportStatus
+from app.models.user import User
+from app.models.visit_record import VisitRecord
+
+_daily_reports = DailyReport.__table__
+_users = User.__table__
+_visit_records = VisitRecord.__table__
+
+_SORT_COLUMNS = {
+    "report_date": _daily_reports.c.report_date,
+    "status": _daily_reports.c.status,
+    "submitted_at": _daily_reports.c.submitted_at,
+}
+
+_visit_count = (
+    select(func.count())
+    .where(_visit_records.c.daily_report_id == _daily_reports.c.id)
+    .correlate(_daily_reports)
+    .scalar_subquery()
+)
+
+# 一覧の検索条件（キーはバインドパラメータ名）
+_LIST_CRITERIA = {
+    "salesperson_id": _daily_reports.c.salesperson_id == bindparam("salesperson_id"),
+    "date_from": _daily_reports.c.report_date >= bindparam("date_from"),
+    "date_to": _daily_reports.c.report_date <= bindparam("date_to"),
+    "status": _daily_reports.c.status == bindparam("status"),
+}
+
+
+@functools.cache
+def _build_list_statements(
+    criteria: frozenset[str], sort: str, order: str
+) -> tuple[Select, Select]:
+    """検索条件の組み合わせ・ソートごとの一覧取得文と件数取得文を構築する。"""
+    where = [_LIST_CRITERIA[name] for name in _LIST_CRITERIA if name in criteria]
+    sort_column = _SORT_COLUMNS[sort]
+    query = (
+        select(
+            _daily_reports.c.id,
+            _daily_reports.c.report_date,
+            _daily_reports.c.salesperson_id,
+            _users.c.name,
+            _daily_reports.c.status,
+            _daily_reports.c.submitted_at,
+            _visit_count,
+        )
+        .join(_users, _users.c.id == _daily_reports.c.salesperson_id)
+        .where(*where)
+        .order_by(sort_column.asc() if order == "asc" else sort_column.desc())
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    count_query = select(func.count()).select_from(_daily_reports).where(*where)
+    return query, count_query
+
+
+register_function_cache("report_list_statements", _build_list_statements)
+
+
+class ReportListRow(NamedTuple):
+    """日報一覧の1件分のレコード。"""
+
+    id: int
+    report_date: date
+    salesperson_id: int
+    salesperson_name: str
+    status: ReportStatus
+    submitted_at: datetime | None
+    visit_count: int
+
+    def to_response(self) -> dict[str, Any]:
+        """ReportListItemResponse と同じ形式のJSON互換dictに変換する。"""
+        return {
+            "id": self.id,
+            "report_date": self.report_date.isoformat(),
+            "salesperson": {"id": self.salesperson_id, "name": self.salesperson_name},
+            "visit_count": self.visit_count,
+            "status": self.status.value,
+            "submitted_at": (
+                self.submitted_at.isoformat() if self.submitted_at else None
+            ),
+        }
+
+
+@trace_methods
+class ReportReadModel:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find_list(
+        self,
+        *,
+        salesperson_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: ReportStatus | None = None,
+        sort: str = "report_date",
+        order: str = "desc",
+        page: int = 1,
+        per_page: int = 20,
+    ) -> tuple[list[ReportListRow], int]:
+        """検索条件に基づいて日報一覧のレコードを取得する。
+
+        一覧は呼び出し頻度が高いため、検索条件の組み合わせ・ソートごとに
+        バインドパラメータ化した文を使い回し、文の構築とキャッシュキーの生成を省く。
+        """
+        params = {
+            name: value
+            for name, value in (
+                ("salesperson_id", salesperson_id),
+                ("date_from", date_from),
+                ("date_to", date_to),
+                ("status", status),
+            )
+            if value is not None
+        }
+        query, count_query = _build_list_statements(
+            frozenset(params),
+            sort if sort in _SORT_COLUMNS else "report_date",
+            "asc" if order == "asc" else "desc",
+        )
+
+        # 件数取得
+        total_count = (await self.db.execute(count_query, params)).scalar_one()
+
+        result = await self.db.execute(
+            query, {**params, "offset": (page - 1) * per_page, "limit": per_page}
+        )
+        return [ReportListRow._make(row) for row in result], total_count
@@ -0,0 +1,48 @@
+"""ユーザー一覧の読み取りモデル。
+
+ORM エンティティを経由せず、SQLAlchemy Core の select 結果を
+軽量なタプルレコードに直接マッピングする。
+"""
+
+from typing import Any, NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tracing import trace_methods
+from app.models.user import User, UserRole
+
+_users = User.__table__
+
+
+class UserListRow(NamedTuple):
+    """ユーザー一覧の1件分のレコード。"""
+
+    id: int
+    name: str
+    email: str
+    role: UserRole
+
+    def to_response(self) -> dict[str, Any]:
+        """UserListItemResponse と同じ形式のJSON互換dictに変換する。"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "email": self.email,
+            "role": self.role.value,
+        }
+
+
+@trace_methods
+class UserReadModel:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find_list(self, *, role: UserRole | None = None) -> list[UserListRow]:
+        """ユーザー一覧のレコードを取得する。roleで絞り込み可能。"""
+        query = select(_users.c.id, _users.c.name, _users.c.email, _users.c.role)
+        if role is not None:
+            query = query.where(_users.c.role == role)
+        query = query.order_by(_users.c.id.asc())
+        result = await self.db.execute(query)
+        return [UserListRow._make(row) for row in result]
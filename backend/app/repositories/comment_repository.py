@@ -1,11 +1,12 @@
 """コメントのデータアクセス層。"""
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from app.core.tracing import trace_methods
 from app.models.comment import Comment
 
 
+@trace_methods
 class CommentRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
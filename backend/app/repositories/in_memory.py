@@ -0,0 +1,427 @@
+"""プロセス内のメモリにデータを保持するリポジトリ。
+
+DBを使わずにサービス層のテストを実行したり、負荷試験でフレームワーク層の
+処理時間だけを計測したりするために使う。各リポジトリは DB 版と同じメソッドを持つ。
+
+制約は ORM のテーブル定義から読み取り、DBと同じ条件で IntegrityError を送出する。
+
+- NOT NULL（既定値・サーバー既定値のない列）
+- ユニーク制約（uq_salesperson_date、users.email）
+- 外部キーの参照先の存在。削除時は ON DELETE CASCADE の行を連鎖して削除し、
+  それ以外の参照が残る場合は削除を拒否する
+
+行は列の値の dict として保持し、読み出しのたびに新しいORMインスタンスを作る。
+インスタンスを変更しても update を呼ぶまで保存されない点はDBと同じだが、
+トランザクションは持たないため各メソッドの呼び出しが即座に確定する。
+"""
+
+import enum
+import functools
+import itertools
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from datetime import UTC, date, datetime
+from typing import Any
+
+from sqlalchemy import ForeignKey, Table, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.database import Base
+from app.core.security import hash_password
+from app.models.comment import Comment
+from app.models.customer import Customer
+from app.models.daily_report import DailyReport
+from app.models.user import User, UserRole
+from app.models.visit_record import VisitRecord
+
+Row = dict[str, Any]
+
+
+def _now() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _violation(message: str) -> IntegrityError:
+    return IntegrityError(None, None, Exception(message))
+
+
+def _sort_key(value: Any) -> tuple[bool, Any]:
+    """PostgreSQL と同じ順序で並べるためのキー。
+
+    NULL は昇順で末尾・降順で先頭になる。enum 型は定義順で比較される。
+    """
+    if isinstance(value, enum.Enum):
+        value = list(type(value)).index(value)
+    return value is None, value
+
+
+class InMemoryStore:
+    """テーブルごとの行を主キーで保持する。
+
+    ユニーク制約と外部キーの列には索引を持ち、一意検索・子の行の検索・
+    削除時の参照確認を行数に比例せずに行う。
+    """
+
+    def __init__(self):
+        tables = Base.metadata.sorted_tables
+        self._rows: dict[str, dict[int, Row]] = {table.name: {} for table in tables}
+        self._sequences = {table.name: itertools.count(1) for table in tables}
+        # (テーブル名, 列名のタプル) → 値のタプル → 主キー
+        self._unique: dict[tuple[str, tuple[str, ...]], dict[tuple, int]] = {
+            (table.name, columns): {}
+            for table in tables
+            for columns in _unique_columns(table)
+        }
+        # (テーブル名, 外部キーの列名) → 参照先の主キー → 主キーの集合
+        self._children: dict[tuple[str, str], defaultdict[int, set[int]]] = {
+            (table.name, fk.parent.key): defaultdict(set)
+            for table in tables
+            for fk in table.foreign_keys
+        }
+
+    # --- 読み出し ---
+
+    def get[M: Base](self, model: type[M], id_: int) -> M | None:
+        row = self._rows[model.__tablename__].get(id_)
+        return None if row is None else model(**row)
+
+    def get_row(self, model: type[Base], id_: int) -> Row | None:
+        return self._rows[model.__tablename__].get(id_)
+
+    def find_unique[M: Base](self, model: type[M], **values: Any) -> M | None:
+        """ユニーク制約の列の値で1件取得する。"""
+        index = self._unique[(model.__tablename__, tuple(values))]
+        id_ = index.get(tuple(values.values()))
+        return None if id_ is None else self.get(model, id_)
+
+    def find_by[M: Base](self, model: type[M], column: str, value: int) -> list[M]:
+        """外部キーの列の値で取得する（主キー順）。"""
+        ids = self._children[(model.__tablename__, column)].get(value, ())
+        rows = self._rows[model.__tablename__]
+        return [model(**rows[id_]) for id_ in sorted(ids)]
+
+    def count_by(self, model: type[Base], column: str, value: int) -> int:
+        """外部キーの列の値で件数を数える。"""
+        return len(self._children[(model.__tablename__, column)].get(value, ()))
+
+    def query(
+        self,
+        model: type[Base],
+        where: Callable[[Row], bool] | None = None,
+        *,
+        order_by: str | None = None,
+        descending: bool = False,
+    ) -> list[Row]:
+        """条件に一致する行を返す。同順位の行は主キー順になる。"""
+        rows: Iterator[Row] = iter(self._rows[model.__tablename__].values())
+        if where is not None:
+            rows = filter(where, rows)
+        if order_by is None:
+            return list(rows)
+        return sorted(
+            rows, key=lambda row: _sort_key(row[order_by]), reverse=descending
+        )
+
+    # --- 書き込み ---
+
+    def add(self, instance: Base) -> None:
+        """行を追加し、採番した主キーと既定値をインスタンスに反映する。"""
+        table = instance.__table__
+        row = _row_of(instance)
+        for column in table.columns:
+            if row[column.key] is not None:
+                continue
+            if column.primary_key:
+                row[column.key] = next(self._sequences[table.name])
+            elif column.default is not None and column.default.is_scalar:
+                row[column.key] = column.default.arg
+            elif column.server_default is not None:
+                # このスキーマのサーバー既定値は now() のみ
+                row[column.key] = _now()
+        self._check(table, row)
+        self._write(table, row)
+        _assign(instance, row)
+
+    def update(self, instance: Base) -> None:
+        """インスタンスの列の値で行を置き換える。"""
+        table = instance.__table__
+        if instance.id not in self._rows[table.name]:
+            raise StaleDataError(f"{table.name} id={instance.id} は削除されています")
+        row = _row_of(instance)
+        for column in table.columns:
+            if column.onupdate is not None:
+                row[column.key] = _now()
+        self._check(table, row)
+        self._remove(table, instance.id)
+        self._write(table, row)
+        _assign(instance, row)
+
+    def delete(self, model: type[Base], id_: int) -> None:
+        """行を削除する。ON DELETE CASCADE の子の行も削除する。"""
+        targets: list[tuple[Table, int]] = []
+        self._collect_deletion(model.__table__, id_, targets)
+        for table, target_id in targets:
+            self._remove(table, target_id)
+
+    # --- 内部処理 ---
+
+    def _check(self, table: Table, row: Row) -> None:
+        for column in table.columns:
+            if not column.nullable and row[column.key] is None:
+                raise _violation(
+                    f'null value in column "{column.key}" of relation "{table.name}"'
+                )
+        for columns in _unique_columns(table):
+            values = tuple(row[key] for key in columns)
+            # NULL を含む値は重複とみなさない
+            if None in values:
+                continue
+            existing = self._unique[(table.name, columns)].get(values)
+            if existing is not None and existing != row["id"]:
+                raise _violation(
+                    f"duplicate key value violates unique constraint on "
+                    f"{table.name}({', '.join(columns)})"
+                )
+        for fk in table.foreign_keys:
+            value = row[fk.parent.key]
+            if value is not None and value not in self._rows[fk.column.table.name]:
+                raise _violation(
+                    f'insert or update on table "{table.name}" violates foreign key '
+                    f"constraint on {fk.parent.key}"
+                )
+
+    def _collect_deletion(
+        self, table: Table, id_: int, targets: list[tuple[Table, int]]
+    ) -> None:
+        """削除する行を子の行から順に集める。参照が残る場合は例外とする。"""
+        if id_ not in self._rows[table.name]:
+            return
+        for child_table, fk in _referencing(table):
+            child_ids = self._children[(child_table.name, fk.parent.key)].get(id_)
+            if not child_ids:
+                continue
+            if fk.ondelete != "CASCADE":
+                raise _violation(
+                    f'update or delete on table "{table.name}" violates foreign key '
+                    f'constraint on table "{child_table.name}"'
+                )
+            for child_id in sorted(child_ids):
+                self._collect_deletion(child_table, child_id, targets)
+        targets.append((table, id_))
+
+    def _write(self, table: Table, row: Row) -> None:
+        self._rows[table.name][row["id"]] = row
+        for columns in _unique_columns(table):
+            values = tuple(row[key] for key in columns)
+            if None not in values:
+                self._unique[(table.name, columns)][values] = row["id"]
+        for fk in table.foreign_keys:
+            value = row[fk.parent.key]
+            if value is not None:
+                self._children[(table.name, fk.parent.key)][value].add(row["id"])
+
+    def _remove(self, table: Table, id_: int) -> None:
+        row = self._rows[table.name].pop(id_, None)
+        if row is None:
+            return
+        for columns in _unique_columns(table):
+            self._unique[(table.name, columns)].pop(
+                tuple(row[key] for key in columns), None
+            )
+        for fk in table.foreign_keys:
+            children = self._children[(table.name, fk.parent.key)]
+            value = row[fk.parent.key]
+            if value in children:
+                children[value].discard(id_)
+                if not children[value]:
+                    del children[value]
+
+
+@functools.cache
+def _unique_columns(table: Table) -> list[tuple[str, ...]]:
+    return [
+        tuple(column.key for column in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+
+
+@functools.cache
+def _referencing(table: Table) -> list[tuple[Table, ForeignKey]]:
+    """table を参照する外部キーを持つテーブルと、その外部キーを返す。"""
+    return [
+        (other, fk)
+        for other in Base.metadata.sorted_tables
+        for fk in other.foreign_keys
+        if fk.column.table is table
+    ]
+
+
+def _row_of(instance: Base) -> Row:
+    return {
+        column.key: getattr(instance, column.key)
+        for column in instance.__table__.columns
+    }
+
+
+def _assign(instance: Base, row: Row) -> None:
+    for key, value in row.items():
+        setattr(instance, key, value)
+
+
+# ============================================================
+# リポジトリ
+# ============================================================
+
+
+class InMemoryReportRepository:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_by_id(self, report_id: int) -> DailyReport | None:
+        """IDで日報を取得する（リレーション含む）。"""
+        report = self.store.get(DailyReport, report_id)
+        if report is None:
+            return None
+        return self._with_relations(report)
+
+    async def find_by_salesperson_and_date(
+        self, salesperson_id: int, report_date: date
+    ) -> DailyReport | None:
+        """担当者IDと報告日で日報を取得する（重複チェック用）。"""
+        return self.store.find_unique(
+            DailyReport, salesperson_id=salesperson_id, report_date=report_date
+        )
+
+    async def create(self, report: DailyReport) -> DailyReport:
+        """日報を作成する。"""
+        self.store.add(report)
+        return report
+
+    async def update(self, report: DailyReport) -> DailyReport:
+        """日報を更新する。"""
+        self.store.update(report)
+        return report
+
+    async def delete(self, report: DailyReport) -> None:
+        """日報を削除する。"""
+        self.store.delete(DailyReport, report.id)
+
+    def _with_relations(self, report: DailyReport) -> DailyReport:
+        """DB版の joinedload と同じ範囲のリレーションを設定する。"""
+        report.salesperson = self.store.get(User, report.salesperson_id)
+        visit_records = self.store.find_by(VisitRecord, "daily_report_id", report.id)
+        for visit_record in visit_records:
+            visit_record.customer = self.store.get(Customer, visit_record.customer_id)
+        comments = self.store.find_by(Comment, "daily_report_id", report.id)
+        for comment in comments:
+            comment.manager = self.store.get(User, comment.manager_id)
+        report.comments = comments
+        report.visit_records = visit_records
+        return report
+
+
+class InMemoryVisitRecordRepository:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def delete_by_report_id(self, daily_report_id: int) -> None:
+        """日報IDに紐づく訪問記録を全件削除する（洗い替え用）。"""
+        for record in self.store.find_by(
+            VisitRecord, "daily_report_id", daily_report_id
+        ):
+            self.store.delete(VisitRecord, record.id)
+
+    async def bulk_create(self, records: list[VisitRecord]) -> list[VisitRecord]:
+        """訪問記録を一括作成する。"""
+        for record in records:
+            self.store.add(record)
+        return records
+
+
+class InMemoryCommentRepository:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create(self, comment: Comment) -> Comment:
+        """コメントを作成する。"""
+        self.store.add(comment)
+        comment.manager = self.store.get(User, comment.manager_id)
+        return comment
+
+
+class InMemoryCustomerRepository:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_by_id(self, customer_id: int) -> Customer | None:
+        """IDで顧客を取得する。"""
+        return self.store.get(Customer, customer_id)
+
+    async def has_visit_records(self, customer_id: int) -> bool:
+        """顧客が訪問記録で使用されているか確認する。"""
+        return self.store.count_by(VisitRecord, "customer_id", customer_id) > 0
+
+    async def create(self, customer: Customer) -> Customer:
+        """顧客を作成する。"""
+        self.store.add(customer)
+        return customer
+
+    async def update(self, customer: Customer) -> Customer:
+        """顧客を更新する。"""
+        self.store.update(customer)
+        return customer
+
+    async def delete(self, customer: Customer) -> None:
+        """顧客を削除する。"""
+        self.store.delete(Customer, customer.id)
+
+
+class InMemoryUserRepository:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_by_id(self, user_id: int) -> User | None:
+        """IDでユーザーを取得する。"""
+        return self.store.get(User, user_id)
+
+    async def find_by_email(self, email: str) -> User | None:
+        """メールアドレスでユーザーを取得する。"""
+        return self.store.find_unique(User, email=email)
+
+    async def find_list(self, *, role: UserRole | None = None) -> list[User]:
+        """ユーザー一覧を取得する。roleで絞り込み可能。"""
+        rows = self.store.query(
+            User, None if role is None else lambda row: row["role"] == role
+        )
+        return [User(**row) for row in rows]
+
+
+# ============================================================
+# サンプルデータ
+# ============================================================
+
+
+def seed_master_data(store: InMemoryStore, *, password: str = "password123") -> None:
+    """テストデータ定義（docs/TEST_DEFINITION.md）のユーザー・顧客を登録する。"""
+    password_hash = hash_password(password)
+    for name, email, role in (
+        ("田中太郎", "tanaka@example.com", UserRole.SALES),
+        ("鈴木花子", "suzuki@example.com", UserRole.SALES),
+        ("山田部長", "yamada@example.com", UserRole.MANAGER),
+    ):
+        store.add(User(name=name, email=email, password_hash=password_hash, role=role))
+    for company_name, contact_name, phone, email in (
+        ("○○株式会社", "佐藤一郎", "03-1111-2222", "sato@oo.co.jp"),
+        ("△△商事", "伊藤二郎", "06-3333-4444", "ito@sankaku.co.jp"),
+        ("□□工業", "渡辺三郎", "052-5555-6666", "watanabe@shiro.co.jp"),
+    ):
+        store.add(
+            Customer(
+                company_name=company_name,
+                contact_name=contact_name,
+                phone=phone,
+                email=email,
+            )
+        )
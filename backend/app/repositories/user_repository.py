@@ -3,13 +3,20 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import trace_methods
 from app.models.user import User, UserRole
 
 
+@trace_methods
 class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def find_by_id(self, user_id: int) -> User | None:
+        """IDでユーザーを取得する。"""
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalar_one_or_none()
+
     async def find_by_email(self, email: str) -> User | None:
         """メールアドレスでユーザーを取得する。"""
         result = await self.db.execute(select(User).where(User.email == email))
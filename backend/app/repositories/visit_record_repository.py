@@ -3,9 +3,11 @@
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import trace_methods
 from app.models.visit_record import VisitRecord
 
 
+@trace_methods
 class VisitRecordRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
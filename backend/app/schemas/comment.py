@@ -11,9 +11,7 @@ class CommentCreateRequest(BaseModel):
     """コメント投稿リクエスト。"""
 
     target: str = Field(description="コメント対象（PROBLEM / PLAN）")
-    content: str = Field(
-        min_length=1, max_length=1000, description="コメント内容"
-    )
+    content: str = Field(min_length=1, max_length=1000, description="コメント内容")
 
 
 class CommentCreateResponse(BaseModel):
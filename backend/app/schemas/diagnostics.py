@@ -0,0 +1,95 @@
+"""診断APIのレスポンススキーマ。"""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class SlowQueryResponse(BaseModel):
+    """スロークエリ1フィンガープリント分の集計。"""
+
+    fingerprint: str = Field(description="正規化したSQLのフィンガープリント")
+    statement: str = Field(description="パラメータを除去したSQL")
+    count: int = Field(description="閾値を超えた回数")
+    p50_ms: float = Field(description="実行時間の中央値（ミリ秒）")
+    p95_ms: float = Field(description="実行時間の95パーセンタイル（ミリ秒）")
+    max_ms: float = Field(description="最大実行時間（ミリ秒）")
+    last_plan: Any | None = Field(default=None, description="最新の実行計画（JSON）")
+    last_seen_at: datetime | None = Field(default=None, description="最終検出日時")
+
+
+class RetryStatResponse(BaseModel):
+    """サービスメソッドごとのリトライ結果の集計。"""
+
+    operation: str = Field(description="サービスメソッド名")
+    outcome: str = Field(
+        description="障害種別と結果（例: deadlock:retried）。再実行後の成功は recovered"
+    )
+    count: int = Field(description="回数")
+
+
+class SqlCacheStatsResponse(BaseModel):
+    """コンパイル済みSQLキャッシュの利用状況。"""
+
+    hits: int = Field(description="キャッシュヒット数")
+    misses: int = Field(description="キャッシュミス数（コンパイルが発生した回数）")
+    uncached: int = Field(description="キャッシュ対象外の実行数（生SQLなど）")
+    hit_rate: float | None = Field(
+        default=None, description="ヒット率（対象の実行がなければnull）"
+    )
+
+
+class RouteMemoryStatResponse(BaseModel):
+    """ルートごとのメモリ割り当ての集計。"""
+
+    route: str = Field(
+        description="メソッドとルート（例: GET /api/v1/reports/{report_id}）"
+    )
+    count: int = Field(description="計測したリクエスト数")
+    avg_peak_bytes: int = Field(
+        description="リクエスト中のピーク増加量の平均（バイト）"
+    )
+    max_peak_bytes: int = Field(
+        description="リクエスト中のピーク増加量の最大（バイト）"
+    )
+    avg_net_bytes: int = Field(description="リクエスト後に残った増加量の平均（バイト）")
+    total_net_bytes: int = Field(
+        description="リクエスト後に残った増加量の合計（バイト）"
+    )
+
+
+class AllocationSiteResponse(BaseModel):
+    """リクエスト後に残ったメモリの割り当て箇所ごとの集計。"""
+
+    route: str = Field(description="メソッドとルート")
+    site: str | None = Field(
+        default=None, description="割り当てに至った app/ 配下の最も内側の行"
+    )
+    origin: str = Field(description="実際に割り当てた行")
+    requests: int = Field(description="この箇所のメモリが残ったリクエスト数")
+    net_bytes: int = Field(description="残ったメモリの合計（バイト）")
+    net_blocks: int = Field(description="残ったメモリブロック数の合計")
+
+
+class MemoryStatsResponse(BaseModel):
+    """tracemalloc によるメモリ割り当ての集計。"""
+
+    enabled: bool = Field(description="割り当ての追跡が有効か")
+    tracked_requests: int = Field(description="計測したリクエスト数")
+    routes: list[RouteMemoryStatResponse] = Field(
+        description="ルートごとの集計（残った増加量の平均の降順）"
+    )
+    sites: list[AllocationSiteResponse] = Field(
+        description="残ったメモリの多い割り当て箇所（降順）"
+    )
+
+
+class BlockingCallResponse(BaseModel):
+    """イベントループをブロックしたスタックごとの集計。"""
+
+    stack: list[str] = Field(description="ブロック中のスタック（内側のフレームから順）")
+    count: int = Field(description="閾値を超えてブロックした回数")
+    total_ms: float = Field(description="ブロック時間の合計（ミリ秒）")
+    max_ms: float = Field(description="最大ブロック時間（ミリ秒）")
+    last_seen_at: datetime | None = Field(default=None, description="最終検出日時")
@@ -1,15 +1,19 @@
 """認証のビジネスロジック層。"""
 
 from app.core.exceptions import UnauthorizedError
+from app.core.retry import transient_retry
 from app.core.security import verify_password
+from app.core.tracing import trace_methods
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 
 
+@trace_methods
 class AuthService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
+    @transient_retry()
     async def authenticate(self, email: str, password: str) -> User:
         """メールアドレスとパスワードで認証を行う。
 
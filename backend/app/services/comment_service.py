@@ -1,6 +1,8 @@
 """コメントのビジネスロジック層。"""
 
 from app.core.exceptions import ForbiddenError, NotFoundError, ValidationError
+from app.core.retry import transient_retry
+from app.core.tracing import trace_methods
 from app.models.comment import Comment, CommentTarget
 from app.models.daily_report import ReportStatus
 from app.models.user import User, UserRole
@@ -9,6 +11,7 @@ from app.repositories.report_repository import ReportRepository
 from app.schemas.comment import CommentCreateRequest
 
 
+@trace_methods
 class CommentService:
     def __init__(
         self,
@@ -18,6 +21,7 @@ class CommentService:
         self.comment_repository = comment_repository
         self.report_repository = report_repository
 
+    @transient_retry(idempotent=False)
     async def create(
         self,
         report_id: int,
@@ -1,16 +1,26 @@
 """顧客のビジネスロジック層。"""
 
 from app.core.exceptions import ConflictError, NotFoundError
+from app.core.retry import transient_retry
+from app.core.tracing import trace_methods
 from app.models.customer import Customer
+from app.read_models.customer_read_model import CustomerListRow, CustomerReadModel
 from app.repositories.customer_repository import CustomerRepository
 from app.schemas.customer import CustomerCreateRequest, CustomerUpdateRequest
 
 
+@trace_methods
 class CustomerService:
-    def __init__(self, customer_repository: CustomerRepository):
+    def __init__(
+        self,
+        customer_repository: CustomerRepository,
+        customer_read_model: CustomerReadModel,
+    ):
         self.customer_repository = customer_repository
+        self.customer_read_model = customer_read_model
 
-    async def get_list(
+    @transient_retry()
+    async def get_list_rows(
         self,
         *,
         company_name: str | None = None,
@@ -19,9 +29,9 @@ class CustomerService:
         order: str = "asc",
         page: int = 1,
         per_page: int = 20,
-    ) -> tuple[list[Customer], int]:
-        """顧客一覧を取得する。"""
-        return await self.customer_repository.find_list(
+    ) -> tuple[list[CustomerListRow], int]:
+        """顧客一覧を読み取りモデルのレコードで取得する。"""
+        return await self.customer_read_model.find_list(
             company_name=company_name,
             contact_name=contact_name,
             sort=sort,
@@ -30,6 +40,7 @@ class CustomerService:
             per_page=per_page,
         )
 
+    @transient_retry()
     async def get_detail(self, customer_id: int) -> Customer:
         """顧客詳細を取得する。"""
         customer = await self.customer_repository.find_by_id(customer_id)
@@ -37,6 +48,7 @@ class CustomerService:
             raise NotFoundError(message="顧客が見つかりません")
         return customer
 
+    @transient_retry(idempotent=False)
     async def create(self, request: CustomerCreateRequest) -> Customer:
         """顧客を作成する。"""
         customer = Customer(
@@ -48,6 +60,7 @@ class CustomerService:
         )
         return await self.customer_repository.create(customer)
 
+    @transient_retry()
     async def update(
         self, customer_id: int, request: CustomerUpdateRequest
     ) -> Customer:
@@ -64,6 +77,7 @@ class CustomerService:
 
         return await self.customer_repository.update(customer)
 
+    @transient_retry(idempotent=False)
     async def delete(self, customer_id: int) -> None:
         """顧客を削除する。"""
         customer = await self.customer_repository.find_by_id(customer_id)
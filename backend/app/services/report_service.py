@@ -8,24 +8,31 @@ from app.core.exceptions import (
     NotFoundError,
     ValidationError,
 )
+from app.core.retry import transient_retry
+from app.core.tracing import trace_methods
 from app.models.daily_report import DailyReport, ReportStatus
 from app.models.user import User, UserRole
 from app.models.visit_record import VisitRecord
+from app.read_models.report_read_model import ReportListRow, ReportReadModel
 from app.repositories.report_repository import ReportRepository
 from app.repositories.visit_record_repository import VisitRecordRepository
 from app.schemas.report import ReportCreateRequest, ReportUpdateRequest
 
 
+@trace_methods
 class ReportService:
     def __init__(
         self,
         report_repository: ReportRepository,
         visit_record_repository: VisitRecordRepository,
+        report_read_model: ReportReadModel,
     ):
         self.report_repository = report_repository
         self.visit_record_repository = visit_record_repository
+        self.report_read_model = report_read_model
 
-    async def get_list(
+    @transient_retry()
+    async def get_list_rows(
         self,
         current_user: User,
         *,
@@ -37,30 +44,12 @@ class ReportService:
         order: str = "desc",
         page: int = 1,
         per_page: int = 20,
-    ) -> tuple[list[DailyReport], int]:
-        """日報一覧を取得する。SALESは自分の日報のみ。"""
-        # SALESは自分の日報のみに制限
-        effective_salesperson_id = salesperson_id
-        if current_user.role == UserRole.SALES:
-            effective_salesperson_id = current_user.id
-
-        # ステータスをenumに変換
-        status_enum = None
-        if status is not None:
-            try:
-                status_enum = ReportStatus(status)
-            except ValueError as err:
-                raise ValidationError(
-                    message="入力内容に誤りがあります",
-                    details=[
-                        {
-                            "field": "status",
-                            "message": "無効なステータスです",
-                        }
-                    ],
-                ) from err
-
-        return await self.report_repository.find_list(
+    ) -> tuple[list[ReportListRow], int]:
+        """日報一覧を読み取りモデルのレコードで取得する。SALESは自分の日報のみ。"""
+        effective_salesperson_id, status_enum = self._resolve_list_filters(
+            current_user, salesperson_id, status
+        )
+        return await self.report_read_model.find_list(
             salesperson_id=effective_salesperson_id,
             date_from=date_from,
             date_to=date_to,
@@ -71,6 +60,7 @@ class ReportService:
             per_page=per_page,
         )
 
+    @transient_retry()
     async def get_detail(self, report_id: int, current_user: User) -> DailyReport:
         """日報詳細を取得する。"""
         report = await self.report_repository.find_by_id(report_id)
@@ -86,6 +76,7 @@ class ReportService:
 
         return report
 
+    @transient_retry(idempotent=False)
     async def create(
         self, request: ReportCreateRequest, current_user: User
     ) -> DailyReport:
@@ -130,6 +121,9 @@ class ReportService:
         # リレーション込みで再取得
         return await self.report_repository.find_by_id(report.id)
 
+    # 訪問記録の洗い替えと日報の更新はそれぞれコミットされ、途中で失敗した場合に
+    # 再実行すると提出済みの日報として 403 になり得るため再実行しない
+    @transient_retry(idempotent=False)
     async def update(
         self,
         report_id: int,
@@ -173,11 +167,13 @@ class ReportService:
         # リレーション込みで再取得
         return await self.report_repository.find_by_id(report.id)
 
+    @transient_retry(idempotent=False)
     async def delete(self, report_id: int, current_user: User) -> None:
         """日報を削除する。"""
         report = await self._get_editable_report(report_id, current_user)
         await self.report_repository.delete(report)
 
+    @transient_retry(idempotent=False)
     async def submit(self, report_id: int, current_user: User) -> DailyReport:
         """日報を提出する（DRAFT → SUBMITTED）。"""
         report = await self.report_repository.find_by_id(report_id)
@@ -194,6 +190,7 @@ class ReportService:
         report.submitted_at = datetime.now(UTC).replace(tzinfo=None)
         return await self.report_repository.update(report)
 
+    @transient_retry(idempotent=False)
     async def review(self, report_id: int, current_user: User) -> DailyReport:
         """日報を確認済みにする（SUBMITTED → REVIEWED）。"""
         if current_user.role != UserRole.MANAGER:
@@ -211,6 +208,36 @@ class ReportService:
 
     # --- プライベートメソッド ---
 
+    def _resolve_list_filters(
+        self,
+        current_user: User,
+        salesperson_id: int | None,
+        status: str | None,
+    ) -> tuple[int | None, ReportStatus | None]:
+        """一覧の絞り込み条件を権限に応じて解決する。"""
+        # SALESは自分の日報のみに制限
+        effective_salesperson_id = salesperson_id
+        if current_user.role == UserRole.SALES:
+            effective_salesperson_id = current_user.id
+
+        # ステータスをenumに変換
+        status_enum = None
+        if status is not None:
+            try:
+                status_enum = ReportStatus(status)
+            except ValueError as err:
+                raise ValidationError(
+                    message="入力内容に誤りがあります",
+                    details=[
+                        {
+                            "field": "status",
+                            "message": "無効なステータスです",
+                        }
+                    ],
+                ) from err
+
+        return effective_salesperson_id, status_enum
+
     async def _get_editable_report(
         self, report_id: int, current_user: User
     ) -> DailyReport:
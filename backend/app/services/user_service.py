@@ -1,14 +1,24 @@
 """ユーザーのビジネスロジック層。"""
 
 from app.core.exceptions import ForbiddenError
+from app.core.retry import transient_retry
+from app.core.tracing import trace_methods
 from app.models.user import User, UserRole
+from app.read_models.user_read_model import UserListRow, UserReadModel
 from app.repositories.user_repository import UserRepository
 
 
+@trace_methods
 class UserService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        user_read_model: UserReadModel,
+    ):
         self.user_repository = user_repository
+        self.user_read_model = user_read_model
 
+    @transient_retry()
     async def get_list(
         self,
         *,
@@ -19,3 +29,15 @@ class UserService:
         if current_user.role != UserRole.MANAGER:
             raise ForbiddenError(message="この操作を行う権限がありません")
         return await self.user_repository.find_list(role=role)
+
+    @transient_retry()
+    async def get_list_rows(
+        self,
+        *,
+        current_user: User,
+        role: UserRole | None = None,
+    ) -> list[UserListRow]:
+        """ユーザー一覧を読み取りモデルのレコードで取得する。MANAGERのみ。"""
+        if current_user.role != UserRole.MANAGER:
+            raise ForbiddenError(message="この操作を行う権限がありません")
+        return await self.user_read_model.find_list(role=role)
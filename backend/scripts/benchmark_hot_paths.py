@@ -0,0 +1,263 @@
+"""DB を使わない Python 側の処理（1リクエストあたりの CPU オーバーヘッド）を計測する。
+
+JWT の発行・検証、bcrypt のコスト別のパスワード照合、日報レスポンスの構築、
+ページネーションレスポンスの生成、AppError ハンドラ、訪問記録の ORM モデル構築
+（訪問ごとの strptime）、訪問記録 1/20/100 件の日報作成リクエストの検証を
+それぞれ timeit で繰り返し実行し、1回あたりの時間（繰り返しの最小値）を表示する。
+
+使い方（backend/ で実行）:
+    uv run python -m scripts.benchmark_hot_paths --save-baseline baseline.json
+    uv run python -m scripts.benchmark_hot_paths --baseline baseline.json --threshold 10
+
+--baseline を指定すると保存済みの結果と比較し、--threshold（%）を超えて遅く
+なったベンチマークがあれば一覧を表示して終了コード 1 で終了する。ベースラインは
+同じマシン・同じ Python で保存したものと比較すること。
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import UTC, date, datetime
+from functools import partial
+
+import bcrypt
+
+from app.api.v1.reports import (
+    _build_create_update_response,
+    _build_detail_response,
+    _build_list_item,
+)
+from app.core.exceptions import ValidationError
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    verify_password,
+)
+from app.main import app_error_handler
+from app.models.comment import Comment, CommentTarget
+from app.models.customer import Customer
+from app.models.daily_report import DailyReport, ReportStatus
+from app.models.user import User, UserRole
+from app.models.visit_record import VisitRecord
+from app.schemas.common import create_paginated_response
+from app.schemas.report import ReportCreateRequest
+from app.services.report_service import ReportService
+
+_PASSWORD = "password123"
+_BCRYPT_ROUNDS = (4, 10, 12)
+_VISIT_COUNTS = (1, 20, 100)
+_PER_PAGE = 20
+
+
+def _report(visits: int, comments: int) -> DailyReport:
+    """セッションに紐づかない、リレーション設定済みの日報を作成する。"""
+    now = datetime(2026, 1, 5, 18, 0, tzinfo=UTC)
+    salesperson = User(id=1, name="田中太郎", role=UserRole.SALES)
+    manager = User(id=2, name="山田部長", role=UserRole.MANAGER)
+    report = DailyReport(
+        id=1,
+        salesperson_id=salesperson.id,
+        report_date=date(2026, 1, 5),
+        problem="価格面で競合と比較されている",
+        plan="見積もりを再提出する",
+        status=ReportStatus.SUBMITTED,
+        submitted_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+    report.salesperson = salesperson
+    report.visit_records = [
+        VisitRecord(
+            id=i + 1,
+            customer=Customer(
+                id=i + 1,
+                company_name=f"株式会社サンプル{i}",
+                contact_name="佐藤一郎",
+                phone="03-1111-2222",
+                email=f"sample{i}@example.com",
+            ),
+            visit_content="新商品の提案",
+            visited_at=datetime(1970, 1, 1, 9 + i % 9, i % 60),
+            visit_order=i + 1,
+        )
+        for i in range(visits)
+    ]
+    report.comments = [
+        Comment(
+            id=i + 1,
+            manager=manager,
+            target=CommentTarget.PROBLEM,
+            content="確認しました",
+            created_at=now,
+        )
+        for i in range(comments)
+    ]
+    return report
+
+
+def _create_payload(visits: int) -> dict:
+    return {
+        "report_date": "2026-01-05",
+        "problem": "価格面で競合と比較されている",
+        "plan": "見積もりを再提出する",
+        "status": "SUBMITTED",
+        "visit_records": [
+            {
+                "customer_id": i + 1,
+                "visit_content": "新商品の提案",
+                "visited_at": f"{9 + i % 9:02d}:{i % 60:02d}",
+            }
+            for i in range(visits)
+        ],
+    }
+
+
+def _run_until_complete(coroutine) -> None:
+    """await を含まないコルーチンをイベントループを使わずに最後まで実行する。"""
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        return
+    raise RuntimeError("コルーチンが中断しました")
+
+
+def _build_benchmarks() -> dict[str, Callable[[], object]]:
+    token = create_access_token(1)
+    list_page = [_report(visits=3, comments=0) for _ in range(_PER_PAGE)]
+    detail = _report(visits=5, comments=2)
+    error = ValidationError(
+        message="入力内容に誤りがあります",
+        details=[{"field": "report_date", "message": "未来の日付は指定できません"}],
+    )
+    service = ReportService(None, None, None)
+
+    benchmarks: dict[str, Callable[[], object]] = {
+        "create_access_token": lambda: create_access_token(1),
+        "decode_access_token": lambda: decode_access_token(token),
+    }
+    for rounds in _BCRYPT_ROUNDS:
+        hashed = bcrypt.hashpw(
+            _PASSWORD.encode(), bcrypt.gensalt(rounds=rounds)
+        ).decode()
+        benchmarks[f"verify_password (rounds={rounds})"] = partial(
+            verify_password, _PASSWORD, hashed
+        )
+    benchmarks |= {
+        "_build_list_item": lambda: _build_list_item(list_page[0]),
+        f"_build_list_item x{_PER_PAGE} + create_paginated_response": lambda: (
+            create_paginated_response(
+                data=[_build_list_item(r) for r in list_page],
+                total_count=1000,
+                page=1,
+                per_page=_PER_PAGE,
+            )
+        ),
+        "_build_detail_response (5 visits, 2 comments)": partial(
+            _build_detail_response, detail
+        ),
+        "_build_create_update_response (5 visits, 2 comments)": partial(
+            _build_create_update_response, detail
+        ),
+        "app_error_handler": lambda: _run_until_complete(
+            app_error_handler(None, error)
+        ),
+    }
+    for visits in _VISIT_COUNTS:
+        payload = _create_payload(visits)
+        request = ReportCreateRequest.model_validate(payload)
+        benchmarks[f"ReportCreateRequest validation ({visits} visits)"] = partial(
+            ReportCreateRequest.model_validate, payload
+        )
+        benchmarks[f"_build_visit_records ({visits} visits)"] = partial(
+            service._build_visit_records, 1, request.visit_records
+        )
+    return benchmarks
+
+
+def _measure(benchmark: Callable[[], object], repeat: int) -> float:
+    """1回あたりの実行時間（マイクロ秒）を繰り返しの最小値で返す。"""
+    timer = timeit.Timer(benchmark)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def _compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """ベースラインより threshold % を超えて遅くなったベンチマーク名を返す。"""
+    print(f"\n{'benchmark':<58}{'baseline µs':>13}{'current µs':>12}{'change':>9}")
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<58}{'-':>13}{current:>12.2f}{'new':>9}")
+            continue
+        change = (current - previous) / previous * 100
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<58}{previous:>13.2f}{current:>12.2f}{change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main(
+    *,
+    repeat: int,
+    name_filter: str | None,
+    baseline_path: str | None,
+    save_baseline_path: str | None,
+    threshold: float,
+) -> int:
+    results: dict[str, float] = {}
+    print(f"{'benchmark':<58}{'µs/op':>12}")
+    for name, benchmark in _build_benchmarks().items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = _measure(benchmark, repeat)
+        print(f"{name:<58}{results[name]:>12.2f}")
+
+    if save_baseline_path:
+        with open(save_baseline_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = _compare(results, baseline["results"], threshold)
+        if regressions:
+            print(f"\n{threshold}% を超えて遅くなりました: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument("--filter", help="名前にこの文字列を含むものだけ計測する")
+    parser.add_argument("--baseline", help="比較するベースラインの JSON")
+    parser.add_argument("--save-baseline", help="結果をベースラインとして保存する先")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="回帰とみなす遅延の割合（%%）"
+    )
+    args = parser.parse_args()
+    sys.exit(
+        main(
+            repeat=args.repeat,
+            name_filter=args.filter,
+            baseline_path=args.baseline,
+            save_baseline_path=args.save_baseline,
+            threshold=args.threshold,
+        )
+    )
@@ -0,0 +1,215 @@
+"""一覧APIの読み取り経路ごとの CPU 時間とピークメモリを比較する。
+
+ORM 経路（ORM エンティティ + Pydantic 変換）と読み取りモデル経路（Core select +
+タプルレコード）で、日報・顧客・ユーザー一覧の1リクエスト分の処理を計測する。
+CPU 時間は process_time で計測するため、DB サーバー側の実行時間は含まない。
+
+使い方（backend/ で実行）:
+    uv run python -m scripts.benchmark_list_read_paths --reports 100 --iterations 50
+
+DATABASE_URL のDBにテーブルが作成済みであること。計測用データは1つの
+トランザクション内で投入し、終了時にロールバックするため既存データは変更しない。
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.api.v1.reports import _build_list_item
+from app.core.database import engine
+from app.models.customer import Customer
+from app.models.daily_report import DailyReport, ReportStatus
+from app.models.user import User, UserRole
+from app.models.visit_record import VisitRecord
+from app.read_models.customer_read_model import CustomerReadModel
+from app.read_models.report_read_model import ReportReadModel
+from app.read_models.user_read_model import UserReadModel
+from app.repositories.user_repository import UserRepository
+from app.schemas.customer import CustomerListItemResponse
+from app.schemas.user import UserListItemResponse
+
+_PER_PAGE = 100
+_VISITS_PER_REPORT = 5
+
+# 読み取りモデル導入前の一覧取得（ORM エンティティ + joinedload）
+_ORM_REPORT_LIST = (
+    select(DailyReport)
+    .options(joinedload(DailyReport.salesperson), joinedload(DailyReport.visit_records))
+    .order_by(DailyReport.report_date.desc())
+    .limit(_PER_PAGE)
+)
+_ORM_CUSTOMER_LIST = (
+    select(Customer).order_by(Customer.company_name.asc()).limit(_PER_PAGE)
+)
+
+
+async def _insert_returning_ids(
+    conn: AsyncConnection, model: type, rows: list[dict]
+) -> list[int]:
+    result = await conn.execute(insert(model).returning(model.id), rows)
+    return list(result.scalars())
+
+
+async def _seed(conn: AsyncConnection, *, reports: int) -> None:
+    """計測用の担当者・顧客・日報・訪問記録を投入する。"""
+    salespeople = 10
+    user_ids = await _insert_returning_ids(
+        conn,
+        User,
+        [
+            {
+                "name": f"ベンチ担当{i}",
+                "email": f"bench{i}@example.com",
+                "password_hash": "x",
+                "role": UserRole.SALES,
+            }
+            for i in range(salespeople)
+        ],
+    )
+    customer_ids = await _insert_returning_ids(
+        conn,
+        Customer,
+        [
+            {
+                "company_name": f"ベンチ株式会社{i}",
+                "contact_name": f"担当{i}",
+                "phone": "03-0000-0000",
+                "email": f"c{i}@example.com",
+            }
+            for i in range(_PER_PAGE)
+        ],
+    )
+    report_ids = await _insert_returning_ids(
+        conn,
+        DailyReport,
+        [
+            {
+                "salesperson_id": user_ids[i % salespeople],
+                "report_date": date(2000, 1, 1) + timedelta(days=i // salespeople),
+                "problem": "課題",
+                "plan": "計画",
+                "status": ReportStatus.SUBMITTED,
+                "submitted_at": datetime(2000, 1, 1, 18, 0),
+            }
+            for i in range(reports)
+        ],
+    )
+    await conn.execute(
+        insert(VisitRecord),
+        [
+            {
+                "daily_report_id": report_id,
+                "customer_id": customer_ids[(i + order) % len(customer_ids)],
+                "visit_content": "訪問内容",
+                "visited_at": datetime(1970, 1, 1, 10, 0),
+                "visit_order": order + 1,
+            }
+            for i, report_id in enumerate(report_ids)
+            for order in range(_VISITS_PER_REPORT)
+        ],
+    )
+
+
+def _build_scenarios(
+    conn: AsyncConnection,
+) -> dict[str, Callable[[], Awaitable[list]]]:
+    """一覧ごとに ORM 経路と読み取りモデル経路の1リクエスト分の処理を返す。"""
+
+    def _session() -> AsyncSession:
+        return AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+
+    async def reports_orm() -> list:
+        async with _session() as session:
+            reports = (await session.execute(_ORM_REPORT_LIST)).unique().scalars()
+            return [_build_list_item(r) for r in reports]
+
+    async def reports_core() -> list:
+        async with _session() as session:
+            rows, _ = await ReportReadModel(session).find_list(per_page=_PER_PAGE)
+            return [row.to_response() for row in rows]
+
+    async def customers_orm() -> list:
+        async with _session() as session:
+            customers = (await session.execute(_ORM_CUSTOMER_LIST)).scalars()
+            return [
+                CustomerListItemResponse.model_validate(c).model_dump(mode="json")
+                for c in customers
+            ]
+
+    async def customers_core() -> list:
+        async with _session() as session:
+            rows, _ = await CustomerReadModel(session).find_list(per_page=_PER_PAGE)
+            return [row.to_response() for row in rows]
+
+    async def users_orm() -> list:
+        async with _session() as session:
+            users = await UserRepository(session).find_list()
+            return [UserListItemResponse.model_validate(u) for u in users]
+
+    async def users_core() -> list:
+        async with _session() as session:
+            rows = await UserReadModel(session).find_list()
+            return [row.to_response() for row in rows]
+
+    return {
+        "reports (ORM)": reports_orm,
+        "reports (Core)": reports_core,
+        "customers (ORM)": customers_orm,
+        "customers (Core)": customers_core,
+        "users (ORM)": users_orm,
+        "users (Core)": users_core,
+    }
+
+
+async def _measure(
+    scenario: Callable[[], Awaitable[list]], iterations: int
+) -> tuple[float, float]:
+    """CPU 時間（ミリ秒）とピークメモリ（KiB）の中央値を返す。"""
+    # 初回のコンパイル・キャッシュ作成を計測から除外する
+    await scenario()
+
+    cpu_ms = []
+    for _ in range(iterations):
+        started = time.process_time()
+        await scenario()
+        cpu_ms.append((time.process_time() - started) * 1000)
+
+    # tracemalloc は CPU 時間を歪めるため別のループで計測する
+    peak_kib = []
+    for _ in range(iterations):
+        tracemalloc.start()
+        await scenario()
+        peak_kib.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    return statistics.median(cpu_ms), statistics.median(peak_kib)
+
+
+async def main(*, reports: int, iterations: int) -> None:
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            await _seed(conn, reports=reports)
+            print(f"{'scenario':<18}{'cpu ms (p50)':>14}{'peak KiB (p50)':>16}")
+            for name, scenario in _build_scenarios(conn).items():
+                cpu_ms, peak_kib = await _measure(scenario, iterations)
+                print(f"{name:<18}{cpu_ms:>14.2f}{peak_kib:>16.1f}")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=1000, help="投入する日報件数")
+    parser.add_argument("--iterations", type=int, default=50, help="計測回数")
+    args = parser.parse_args()
+    asyncio.run(main(reports=args.reports, iterations=args.iterations))
@@ -0,0 +1,26 @@
+"""リクエストのプロファイリングを許可する署名付きトークンを発行する。
+
+発行したトークンを X-Profile-Token ヘッダで送ると、profiling_require_token が
+有効な環境でもそのリクエストをプロファイルできる（app/core/profiling.py）。
+SECRET_KEY には対象の環境と同じ値を設定すること。
+
+使い方（backend/ で実行）:
+    SECRET_KEY=... uv run python -m scripts.create_profiling_token --minutes 10
+    curl -H "X-Profile: download" -H "X-Profile-Token: <token>" \\
+        -b "access_token=..." -o profile.folded \\
+        "https://example.com/api/v1/reports?per_page=100"
+"""
+
+import argparse
+
+from app.core.profiling import create_profiling_token
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--minutes", type=int, default=10, help="トークンの有効期間（分）"
+    )
+    args = parser.parse_args()
+    if args.minutes < 1:
+        parser.error("--minutes は1以上を指定してください")
+    print(create_profiling_token(args.minutes))
@@ -0,0 +1,535 @@
+"""性能検証用の合成データを COPY で投入する。
+
+営業担当者・上長・顧客（日本語の会社名・担当者名）と、指定年数分の平日の日報・
+訪問記録・コメントを生成し、asyncpg の copy_records_to_table でテーブルごとに
+ストリーミング投入する。行はジェネレータで1件ずつ生成するため、件数によらず
+メモリ使用量は一定になる。
+
+- 同じ --seed・--end-date・件数の指定であれば、同じデータが生成される
+- 主キーは既存データの最大値の続きから採番し、投入後にシーケンスを進める
+- 投入中は主キー以外の制約とインデックスを外し、投入後に再作成して全行を検証する。
+  すべて1つのトランザクションで行うため、失敗した場合は何も投入されない
+- モデルの制約（NOT NULL・uq_salesperson_date・users.email の一意性・外部キー・
+  文字数）と業務ルール（未来日の日報なし・下書きにはコメントなし・提出済みと
+  確認済みは submitted_at あり・訪問順は訪問時刻順）を満たす
+
+使い方（backend/ で実行）:
+    uv run python -m scripts.generate_data --salespeople 2000 --years 5
+
+上記で約 260 万件の日報と約 1300 万件の訪問記録になる。DATABASE_URL のDBに
+マイグレーション適用済みであること。--truncate を指定すると既存データをすべて
+削除してから投入する。
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+import asyncpg
+from sqlalchemy import make_url
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.models.comment import CommentTarget
+from app.models.daily_report import ReportStatus
+from app.models.user import UserRole
+
+# 投入順（外部キーの参照先が先）
+_TABLES = ("users", "customers", "daily_reports", "visit_records", "comments")
+
+# 平日に日報を提出する確率（休暇・外出などで提出しない日がある）
+_ATTENDANCE_RATE = 0.92
+# 1人の営業担当者が受け持つ顧客数
+_PORTFOLIO_SIZE = 60
+_PASSWORD = "password123"
+
+_FAMILY_NAMES = (
+    "佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤",
+    "吉田", "山田", "佐々木", "山口", "松本", "井上", "木村", "林", "斎藤", "清水",
+    "山崎", "森", "池田", "橋本", "阿部", "石川", "前田", "藤田", "小川", "岡田",
+)  # fmt: skip
+_GIVEN_NAMES = (
+    "一郎", "健太", "翔太", "大輔", "拓也", "直樹", "和也", "達也", "誠", "剛",
+    "花子", "美咲", "陽子", "由美", "恵子", "真由美", "裕子", "明美", "愛", "結衣",
+)  # fmt: skip
+_COMPANY_PREFIXES = (
+    "東京", "大阪", "名古屋", "横浜", "福岡", "札幌", "仙台", "広島", "神戸", "京都",
+    "日本", "東洋", "中央", "第一", "三協", "共栄", "大和", "昭和", "平和", "富士",
+)  # fmt: skip
+_COMPANY_INDUSTRIES = (
+    "商事", "工業", "電機", "物産", "建設", "製作所", "システム", "食品", "運輸",
+    "化学", "不動産", "精機", "薬品", "印刷", "テクノロジー", "エンジニアリング",
+)  # fmt: skip
+_PREFECTURES = (
+    ("東京都", "千代田区", "03"),
+    ("東京都", "港区", "03"),
+    ("大阪府", "大阪市北区", "06"),
+    ("愛知県", "名古屋市中区", "052"),
+    ("神奈川県", "横浜市西区", "045"),
+    ("福岡県", "福岡市博多区", "092"),
+    ("北海道", "札幌市中央区", "011"),
+    ("宮城県", "仙台市青葉区", "022"),
+)
+_VISIT_CONTENTS = (
+    "新商品の提案を行った。次回見積もりを提示する。",
+    "既存契約の更新について打ち合わせ。前向きに検討いただける。",
+    "導入済み製品の定期フォロー。特に問題なし。",
+    "競合製品との比較資料を説明。価格面の懸念あり。",
+    "担当者交代の挨拶。今後の窓口を確認した。",
+    "トラブル対応の報告と再発防止策を説明した。",
+    "展示会の案内。参加を検討いただける。",
+    "見積もりを提示。来週中に社内稟議の予定。",
+)
+_PROBLEMS = (
+    "見積もりの値引き幅について相談したい。",
+    "競合の価格攻勢が強く、失注リスクがある。",
+    "納期の前倒しを求められており、調整が必要。",
+    "特になし。",
+)
+_PLANS = (
+    "見積もりを作成して送付する。",
+    "提案資料を修正し、再訪問の日程を調整する。",
+    "既存顧客へのフォロー訪問を行う。",
+    "新規開拓のリストを作成する。",
+)
+_COMMENTS = (
+    "値引きは10%までなら対応可能です。",
+    "競合対策として導入事例を持参してください。",
+    "納期は製造部と調整済みです。",
+    "良い進捗です。引き続きお願いします。",
+    "次回は私も同行します。",
+)
+
+# 訪問時刻（9:00〜17:59）。visited_at は 1970-01-01 の日時として保存する
+_VISIT_TIMES = [
+    datetime(1970, 1, 1, 9, 0) + timedelta(minutes=m) for m in range(0, 9 * 60)
+]
+
+
+@dataclass(frozen=True)
+class Config:
+    seed: int
+    salespeople: int
+    managers: int
+    customers: int
+    start_date: date
+    end_date: date
+    status_weights: tuple[float, float, float]
+    visits: tuple[int, int]
+    comment_rate: float
+
+
+@dataclass(frozen=True)
+class _PlannedReport:
+    """日報1件分の、訪問記録・コメントの生成にも使う属性。"""
+
+    id: int
+    salesperson_index: int
+    report_date: date
+    status: ReportStatus
+    created_at: datetime
+    submitted_at: datetime | None
+    visit_count: int
+    comment_count: int
+
+
+@dataclass(frozen=True)
+class _IdOffsets:
+    """既存データの主キーの最大値。生成する行の主キーはこの続きから振る。"""
+
+    users: int
+    customers: int
+    daily_reports: int
+    visit_records: int
+    comments: int
+
+    def salesperson_id(self, index: int) -> int:
+        return self.users + 1 + index
+
+    def manager_id(self, config: Config, index: int) -> int:
+        return self.users + 1 + config.salespeople + index
+
+
+def _person_name(rng: random.Random) -> str:
+    return rng.choice(_FAMILY_NAMES) + rng.choice(_GIVEN_NAMES)
+
+
+def _weekdays(start: date, end: date) -> Iterator[date]:
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+# ============================================================
+# 行の生成
+# ============================================================
+
+
+def _users(config: Config, ids: _IdOffsets) -> Iterator[tuple]:
+    rng = random.Random(f"{config.seed}:users")
+    password_hash = hash_password(_PASSWORD)
+    created_at = datetime.combine(config.start_date, datetime.min.time())
+    for index in range(config.salespeople + config.managers):
+        user_id = ids.users + 1 + index
+        if index < config.salespeople:
+            role, email = UserRole.SALES, f"sales{user_id:07d}@example.com"
+        else:
+            role, email = UserRole.MANAGER, f"manager{user_id:07d}@example.com"
+        yield (
+            user_id,
+            _person_name(rng),
+            email,
+            password_hash,
+            role.value,
+            created_at,
+            created_at,
+        )
+
+
+def _customers(config: Config, ids: _IdOffsets) -> Iterator[tuple]:
+    rng = random.Random(f"{config.seed}:customers")
+    created_at = datetime.combine(config.start_date, datetime.min.time())
+    for index in range(config.customers):
+        customer_id = ids.customers + 1 + index
+        prefix = rng.choice(_COMPANY_PREFIXES)
+        industry = rng.choice(_COMPANY_INDUSTRIES)
+        company_name = (
+            f"株式会社{prefix}{industry}"
+            if rng.random() < 0.5
+            else f"{prefix}{industry}株式会社"
+        )
+        prefecture, city, area_code = rng.choice(_PREFECTURES)
+        has_contact = rng.random() < 0.9
+        yield (
+            customer_id,
+            company_name,
+            _person_name(rng),
+            (
+                f"{prefecture}{city}{rng.randint(1, 5)}-{rng.randint(1, 30)}-"
+                f"{rng.randint(1, 20)}"
+                if rng.random() < 0.8
+                else None
+            ),
+            (
+                f"{area_code}-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+                if has_contact
+                else None
+            ),
+            f"contact{customer_id:08d}@example.co.jp" if has_contact else None,
+            created_at,
+            created_at,
+        )
+
+
+def _planned_reports(config: Config, ids: _IdOffsets) -> Iterator[_PlannedReport]:
+    """日報の主要な属性を報告日・担当者の順に生成する。
+
+    訪問記録・コメントの投入時にも同じ乱数列で再生成し、日報ごとの件数や
+    ステータスを一致させる。
+    """
+    rng = random.Random(f"{config.seed}:reports")
+    statuses = list(ReportStatus)
+    report_id = ids.daily_reports
+    for report_date in _weekdays(config.start_date, config.end_date):
+        for index in range(config.salespeople):
+            if rng.random() >= _ATTENDANCE_RATE:
+                continue
+            report_id += 1
+            status = rng.choices(statuses, config.status_weights)[0]
+            created_at = datetime.combine(report_date, datetime.min.time()).replace(
+                hour=8, minute=rng.randrange(60)
+            )
+            submitted_at = None
+            comment_count = 0
+            if status != ReportStatus.DRAFT:
+                submitted_at = created_at.replace(
+                    hour=rng.randint(17, 20), minute=rng.randrange(60)
+                )
+                if rng.random() < config.comment_rate:
+                    comment_count = rng.randint(1, 2)
+            yield _PlannedReport(
+                id=report_id,
+                salesperson_index=index,
+                report_date=report_date,
+                status=status,
+                created_at=created_at,
+                submitted_at=submitted_at,
+                visit_count=rng.randint(*config.visits),
+                comment_count=comment_count,
+            )
+
+
+def _daily_reports(config: Config, ids: _IdOffsets) -> Iterator[tuple]:
+    rng = random.Random(f"{config.seed}:report_texts")
+    for report in _planned_reports(config, ids):
+        is_draft = report.status == ReportStatus.DRAFT
+        yield (
+            report.id,
+            ids.salesperson_id(report.salesperson_index),
+            report.report_date,
+            None if is_draft and rng.random() < 0.5 else rng.choice(_PROBLEMS),
+            None if is_draft and rng.random() < 0.5 else rng.choice(_PLANS),
+            report.status.value,
+            report.submitted_at,
+            report.created_at,
+            report.submitted_at or report.created_at,
+        )
+
+
+def _visit_records(config: Config, ids: _IdOffsets) -> Iterator[tuple]:
+    rng = random.Random(f"{config.seed}:visits")
+    visit_id = ids.visit_records
+    # 担当者ごとに受け持ちの顧客を連続した範囲で割り当てる
+    portfolio_size = min(_PORTFOLIO_SIZE, config.customers)
+    stride = max(1, config.customers // max(1, config.salespeople))
+    for report in _planned_reports(config, ids):
+        first_customer = report.salesperson_index * stride
+        for order, visited_at in enumerate(
+            sorted(rng.sample(_VISIT_TIMES, report.visit_count)), start=1
+        ):
+            visit_id += 1
+            customer_index = (first_customer + rng.randrange(portfolio_size)) % (
+                config.customers
+            )
+            yield (
+                visit_id,
+                report.id,
+                ids.customers + 1 + customer_index,
+                rng.choice(_VISIT_CONTENTS),
+                visited_at,
+                order,
+                report.created_at,
+                report.created_at,
+            )
+
+
+def _comments(config: Config, ids: _IdOffsets) -> Iterator[tuple]:
+    rng = random.Random(f"{config.seed}:comments")
+    comment_id = ids.comments
+    targets = list(CommentTarget)
+    for report in _planned_reports(config, ids):
+        # 担当者は所属チームの上長からコメントを受ける
+        manager_index = report.salesperson_index % config.managers
+        for _ in range(report.comment_count):
+            comment_id += 1
+            created_at = report.submitted_at + timedelta(minutes=rng.randint(30, 900))
+            yield (
+                comment_id,
+                report.id,
+                ids.manager_id(config, manager_index),
+                rng.choice(targets).value,
+                rng.choice(_COMMENTS),
+                created_at,
+                created_at,
+            )
+
+
+_COLUMNS = {
+    "users": (
+        "id", "name", "email", "password_hash", "role", "created_at", "updated_at",
+    ),
+    "customers": (
+        "id", "company_name", "contact_name", "address", "phone", "email",
+        "created_at", "updated_at",
+    ),
+    "daily_reports": (
+        "id", "salesperson_id", "report_date", "problem", "plan", "status",
+        "submitted_at", "created_at", "updated_at",
+    ),
+    "visit_records": (
+        "id", "daily_report_id", "customer_id", "visit_content", "visited_at",
+        "visit_order", "created_at", "updated_at",
+    ),
+    "comments": (
+        "id", "daily_report_id", "manager_id", "target", "content", "created_at",
+        "updated_at",
+    ),
+}  # fmt: skip
+
+_GENERATORS = {
+    "users": _users,
+    "customers": _customers,
+    "daily_reports": _daily_reports,
+    "visit_records": _visit_records,
+    "comments": _comments,
+}
+
+
+# ============================================================
+# 投入
+# ============================================================
+
+
+async def _id_offsets(conn: asyncpg.Connection) -> _IdOffsets:
+    values = {
+        table: await conn.fetchval(f"SELECT coalesce(max(id), 0) FROM {table}")
+        for table in _TABLES
+    }
+    return _IdOffsets(**values)
+
+
+async def _drop_constraints_and_indexes(conn: asyncpg.Connection) -> list[str]:
+    """主キー以外の制約とインデックスを削除し、再作成するSQLを返す。
+
+    1行ごとの外部キー検査と索引更新より、投入後にまとめて作成・検証するほうが
+    大幅に速い。再作成時に全行が検証されるため、制約を満たさない行があれば
+    トランザクションごと失敗する。
+    """
+    constraints = await conn.fetch(
+        """
+        SELECT conrelid::regclass::text AS table_name, conname,
+               pg_get_constraintdef(oid) AS definition, contype
+        FROM pg_constraint
+        WHERE conrelid = ANY($1::regclass[]) AND contype IN ('f', 'u')
+        """,
+        list(_TABLES),
+    )
+    indexes = await conn.fetch(
+        """
+        SELECT indexrelid::regclass::text AS index_name,
+               pg_get_indexdef(indexrelid) AS definition
+        FROM pg_index
+        WHERE indrelid = ANY($1::regclass[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)
+        """,
+        list(_TABLES),
+    )
+    # 外部キーを先に削除し、再作成は参照先の一意制約の後に行う
+    foreign_keys = [c for c in constraints if c["contype"] == "f"]
+    uniques = [c for c in constraints if c["contype"] == "u"]
+    for constraint in [*foreign_keys, *uniques]:
+        await conn.execute(
+            f"ALTER TABLE {constraint['table_name']} "
+            f"DROP CONSTRAINT {constraint['conname']}"
+        )
+    for index in indexes:
+        await conn.execute(f"DROP INDEX {index['index_name']}")
+    return [
+        *(index["definition"] for index in indexes),
+        *(
+            f"ALTER TABLE {c['table_name']} ADD CONSTRAINT {c['conname']} "
+            f"{c['definition']}"
+            for c in [*uniques, *foreign_keys]
+        ),
+    ]
+
+
+async def _copy(
+    conn: asyncpg.Connection, table: str, config: Config, ids: _IdOffsets
+) -> None:
+    started = time.perf_counter()
+    result = await conn.copy_records_to_table(
+        table, records=_GENERATORS[table](config, ids), columns=_COLUMNS[table]
+    )
+    elapsed = time.perf_counter() - started
+    count = int(result.split()[-1])
+    print(
+        f"{table:<14}{count:>12,} rows {elapsed:>8.1f}s"
+        f"{count / elapsed if elapsed else 0:>12,.0f} rows/s"
+    )
+
+
+async def main(config: Config, *, database_url: str, truncate: bool) -> None:
+    dsn = make_url(database_url).set(drivername="postgresql")
+    conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+    try:
+        async with conn.transaction():
+            if truncate:
+                await conn.execute(
+                    f"TRUNCATE {', '.join(_TABLES)} RESTART IDENTITY CASCADE"
+                )
+            ids = await _id_offsets(conn)
+            recreate = await _drop_constraints_and_indexes(conn)
+            for table in _TABLES:
+                await _copy(conn, table, config, ids)
+            started = time.perf_counter()
+            for statement in recreate:
+                await conn.execute(statement)
+            print(f"{'constraints':<14}{time.perf_counter() - started:>26.1f}s")
+            for table in _TABLES:
+                await conn.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT max(id) FROM {table}))"
+                )
+        for table in _TABLES:
+            await conn.execute(f"ANALYZE {table}")
+    finally:
+        await conn.close()
+
+
+def _parse_ratio(value: str) -> tuple[float, ...]:
+    return tuple(float(part) for part in value.split(":"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42, help="乱数のシード")
+    parser.add_argument("--salespeople", type=int, default=200, help="営業担当者数")
+    parser.add_argument("--managers", type=int, default=10, help="上長の人数")
+    parser.add_argument("--customers", type=int, default=50_000, help="顧客数")
+    parser.add_argument("--years", type=int, default=5, help="日報を生成する年数")
+    parser.add_argument(
+        "--end-date",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="日報の最終日（既定は本日。未来日は指定できない）",
+    )
+    parser.add_argument(
+        "--status-ratio",
+        type=_parse_ratio,
+        default=(5, 15, 80),
+        help="DRAFT:SUBMITTED:REVIEWED の比率（例: 5:15:80）",
+    )
+    parser.add_argument(
+        "--visits",
+        type=_parse_ratio,
+        default=(3, 7),
+        help="日報1件あたりの訪問記録数の最小:最大（例: 3:7）",
+    )
+    parser.add_argument(
+        "--comment-rate",
+        type=float,
+        default=0.3,
+        help="提出済み・確認済みの日報にコメントが付く割合",
+    )
+    parser.add_argument(
+        "--database-url", default=settings.database_url, help="投入先のDB URL"
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="投入前に既存データをすべて削除する"
+    )
+    args = parser.parse_args()
+
+    if args.end_date > date.today():
+        parser.error("--end-date に未来の日付は指定できません")
+    if len(args.status_ratio) != 3 or len(args.visits) != 2:
+        parser.error("--status-ratio は3つ、--visits は2つの値を : 区切りで指定します")
+    visits = (int(args.visits[0]), int(args.visits[1]))
+    if not 1 <= visits[0] <= visits[1] <= len(_VISIT_TIMES):
+        parser.error("--visits の値が不正です")
+    if min(args.salespeople, args.managers, args.customers, args.years) < 1:
+        parser.error("人数・顧客数・年数は1以上を指定します")
+
+    asyncio.run(
+        main(
+            Config(
+                seed=args.seed,
+                salespeople=args.salespeople,
+                managers=args.managers,
+                customers=args.customers,
+                start_date=args.end_date - timedelta(days=365 * args.years),
+                end_date=args.end_date,
+                status_weights=args.status_ratio,
+                visits=visits,
+                comment_rate=args.comment_rate,
+            ),
+            database_url=args.database_url,
+            truncate=args.truncate,
+        )
+    )
@@ -0,0 +1,616 @@
+"""営業担当者と上長の操作シナリオで API に負荷をかけ、エンドポイントごとに集計する。
+
+起動済みの API サーバー（uvicorn）に対して、次のシナリオを1セッションとして
+実行する。セッションごとにログインし、最後にログアウトする。
+
+- 営業担当者: 自分の日報一覧 → 顧客検索 → 訪問記録付きの日報を下書き作成 →
+  詳細表示 → 編集 → 提出。一部のセッションは顧客の登録・編集・削除と、
+  下書きの作成・破棄も行う
+- 上長: 営業担当者一覧 → 提出済み日報の一覧を条件付きでページング → 詳細表示 →
+  コメント → 確認
+
+--rate を指定しない場合は --concurrency 個の仮想ユーザーがセッションを繰り返す
+（クローズドモデル）。--rate を指定した場合は毎秒 --rate セッションの
+ポアソン到着で開始し、同時実行数を --concurrency で制限する（オープンモデル）。
+結果は 17 エンドポイントそれぞれのレイテンシのパーセンタイル・スループット・
+エラー率として標準出力に表示し、--output を指定した場合は JSON でも保存する。
+--memory を指定した場合は、MEMORY_PROFILING_ENABLED で起動したサーバーの
+ルート・割り当て箇所ごとのメモリ割り当て（/diagnostics/memory）を計測の前に
+リセットし、計測後の集計を結果に含める。
+
+使い方（backend/ で実行）:
+    uv run uvicorn app.main:app --port 8000
+    uv run python -m scripts.load_test --duration 60 --concurrency 20 \\
+        --output load_test.json
+
+ログインできるユーザーは --manager-email の上長でユーザー一覧 API から取得する
+（パスワードは全員 --password）。scripts.generate_data で投入したデータや
+REPOSITORY_BACKEND=memory のサーバーにもそのまま使える。日報は各営業担当者の
+最も古い日報より前の日付で作成するため、既存の日報とは重複しない。
+作成した日報は削除しないので、計測には専用のDBを使うこと。
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import httpx
+
+_API_PREFIX = "/api/v1"
+
+_ENDPOINTS = (
+    "POST /auth/login",
+    "POST /auth/logout",
+    "GET /auth/me",
+    "GET /reports",
+    "POST /reports",
+    "GET /reports/{report_id}",
+    "PUT /reports/{report_id}",
+    "DELETE /reports/{report_id}",
+    "PATCH /reports/{report_id}/submit",
+    "PATCH /reports/{report_id}/review",
+    "POST /reports/{report_id}/comments",
+    "GET /customers",
+    "POST /customers",
+    "GET /customers/{customer_id}",
+    "PUT /customers/{customer_id}",
+    "DELETE /customers/{customer_id}",
+    "GET /users",
+)
+
+_PERCENTILES = (50, 90, 95, 99)
+# --memory で表示する割り当て箇所の件数
+_MEMORY_SITES = 20
+
+# 営業担当者のセッションのうち、顧客の登録〜削除と下書きの破棄を行う割合
+_CUSTOMER_MAINTENANCE_RATE = 0.2
+_DISCARD_DRAFT_RATE = 0.2
+
+_SEARCH_KEYWORDS = ("株式会社", "商事", "工業", "物産", "製作所", "システム")
+_VISIT_CONTENTS = (
+    "新商品の提案",
+    "見積もりの説明",
+    "契約更新の打ち合わせ",
+    "納品後のフォロー",
+    "導入事例の紹介",
+)
+
+
+class ScenarioError(Exception):
+    """セッションの途中で想定外のレスポンスを受け取った。"""
+
+
+@dataclass
+class EndpointStats:
+    """1エンドポイント分の計測値。"""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    status_codes: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        count = len(self.latencies_ms)
+        latencies = sorted(self.latencies_ms)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                **{f"p{p}": _percentile(latencies, p) for p in _PERCENTILES},
+                "mean": statistics.fmean(latencies) if latencies else None,
+                "max": latencies[-1] if latencies else None,
+            },
+            "status_codes": dict(sorted(self.status_codes.items())),
+        }
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float | None:
+    """最近接順位法でパーセンタイルを返す。"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Accounts:
+    """ログインに使うユーザーのメールアドレス。"""
+
+    sales: list[str]
+    managers: list[str]
+    password: str
+
+
+class LoadTest:
+    """シナリオの実行と計測値の集計を行う。"""
+
+    def __init__(self, base_url: str, accounts: Accounts, *, seed: int) -> None:
+        self.base_url = base_url
+        self.accounts = accounts
+        self.seed = seed
+        self.stats = {endpoint: EndpointStats() for endpoint in _ENDPOINTS}
+        self.sessions: Counter[str] = Counter()
+        self.failed_sessions: Counter[str] = Counter()
+        # 営業担当者ごとの次に作成する日報の日付（最も古い日報の前日から遡る）
+        self._next_report_date: dict[str, date] = {}
+        self._session_index = 0
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        *,
+        expected: int = 200,
+        path_params: dict[str, int] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """エンドポイントを呼び出し、レイテンシとステータスを記録する。"""
+        method, template = endpoint.split(" ", 1)
+        url = _API_PREFIX + template.format(**(path_params or {}))
+        stats = self.stats[endpoint]
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+            stats.status_codes[type(e).__name__] += 1
+            stats.errors += 1
+            raise ScenarioError(f"{endpoint}: {e!r}") from e
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        stats.status_codes[str(response.status_code)] += 1
+        if response.status_code != expected:
+            stats.errors += 1
+            raise ScenarioError(f"{endpoint}: {response.status_code} {response.text}")
+        return response
+
+    async def _login(self, client: httpx.AsyncClient, email: str) -> dict:
+        response = await self._request(
+            client,
+            "POST /auth/login",
+            json={"email": email, "password": self.accounts.password},
+        )
+        return response.json()["data"]["user"]
+
+    async def sales_session(self, client: httpx.AsyncClient, rng: random.Random):
+        """営業担当者: 日報を下書きで作成し、編集してから提出する。"""
+        email = rng.choice(self.accounts.sales)
+        await self._login(client, email)
+        await self._request(client, "GET /auth/me")
+        await self._request(client, "GET /reports")
+        if email not in self._next_report_date:
+            oldest = await self._request(
+                client,
+                "GET /reports",
+                params={"sort": "report_date", "order": "asc", "per_page": 1},
+            )
+            rows = oldest.json()["data"]
+            first = date.fromisoformat(rows[0]["report_date"]) if rows else date.today()
+            # 並行するセッションが先に設定していればそちらを使う
+            self._next_report_date.setdefault(email, first - timedelta(days=1))
+
+        customers = await self._request(
+            client,
+            "GET /customers",
+            params={"company_name": rng.choice(_SEARCH_KEYWORDS)},
+        )
+        customer_ids = [c["id"] for c in customers.json()["data"]]
+        if not customer_ids:
+            customers = await self._request(client, "GET /customers")
+            customer_ids = [c["id"] for c in customers.json()["data"]]
+
+        report_date = self._allocate_report_date(email)
+        visits = _visit_records(rng, customer_ids, rng.randint(1, 5))
+        created = await self._request(
+            client,
+            "POST /reports",
+            expected=201,
+            json={
+                "report_date": report_date.isoformat(),
+                "visit_records": visits,
+                "problem": "価格面で競合と比較されている",
+                "status": "DRAFT",
+            },
+        )
+        report_id = {"report_id": created.json()["data"]["id"]}
+        await self._request(client, "GET /reports/{report_id}", path_params=report_id)
+        await self._request(
+            client,
+            "PUT /reports/{report_id}",
+            path_params=report_id,
+            json={
+                "report_date": report_date.isoformat(),
+                "visit_records": visits + _visit_records(rng, customer_ids, 1),
+                "problem": "価格面で競合と比較されている",
+                "plan": "見積もりを再提出する",
+                "status": "DRAFT",
+            },
+        )
+        await self._request(
+            client, "PATCH /reports/{report_id}/submit", path_params=report_id
+        )
+
+        if rng.random() < _DISCARD_DRAFT_RATE:
+            draft = await self._request(
+                client,
+                "POST /reports",
+                expected=201,
+                json={
+                    "report_date": self._allocate_report_date(email).isoformat(),
+                    "status": "DRAFT",
+                },
+            )
+            await self._request(
+                client,
+                "DELETE /reports/{report_id}",
+                expected=204,
+                path_params={"report_id": draft.json()["data"]["id"]},
+            )
+        if rng.random() < _CUSTOMER_MAINTENANCE_RATE:
+            await self._maintain_customer(client, rng)
+
+        await self._request(client, "POST /auth/logout", expected=204)
+
+    async def _maintain_customer(self, client: httpx.AsyncClient, rng: random.Random):
+        """顧客を登録・表示・編集し、削除する。"""
+        suffix = rng.randrange(10**6)
+        payload = {
+            "company_name": f"負荷試験株式会社{suffix}",
+            "contact_name": "負荷 太郎",
+            "phone": "03-0000-0000",
+            "email": f"loadtest{suffix}@example.com",
+        }
+        created = await self._request(
+            client, "POST /customers", expected=201, json=payload
+        )
+        customer_id = {"customer_id": created.json()["data"]["id"]}
+        await self._request(
+            client, "GET /customers/{customer_id}", path_params=customer_id
+        )
+        await self._request(
+            client,
+            "PUT /customers/{customer_id}",
+            path_params=customer_id,
+            json={**payload, "address": "東京都千代田区丸の内1-1-1"},
+        )
+        await self._request(
+            client,
+            "DELETE /customers/{customer_id}",
+            expected=204,
+            path_params=customer_id,
+        )
+
+    async def manager_session(self, client: httpx.AsyncClient, rng: random.Random):
+        """上長: 提出済みの日報を絞り込んで開き、コメントして確認済みにする。"""
+        await self._login(client, rng.choice(self.accounts.managers))
+        users = await self._request(client, "GET /users", params={"role": "SALES"})
+        salesperson_ids = [u["id"] for u in users.json()["data"]]
+
+        submitted: list[int] = []
+        for page in range(1, rng.randint(1, 3) + 1):
+            params: dict[str, Any] = {"status": "SUBMITTED", "page": page}
+            if salesperson_ids and rng.random() < 0.5:
+                params["salesperson_id"] = rng.choice(salesperson_ids)
+            if rng.random() < 0.5:
+                days = rng.choice((7, 30, 90))
+                params["date_from"] = (date.today() - timedelta(days=days)).isoformat()
+            reports = await self._request(client, "GET /reports", params=params)
+            submitted.extend(r["id"] for r in reports.json()["data"])
+
+        for report_id in rng.sample(submitted, min(3, len(submitted))):
+            path_params = {"report_id": report_id}
+            detail = await self._request(
+                client, "GET /reports/{report_id}", path_params=path_params
+            )
+            # 他の上長のセッションが先に確認済みにしている場合は対象外
+            if detail.json()["data"]["status"] != "SUBMITTED":
+                continue
+            await self._request(
+                client,
+                "POST /reports/{report_id}/comments",
+                expected=201,
+                path_params=path_params,
+                json={
+                    "target": rng.choice(("PROBLEM", "PLAN")),
+                    "content": "確認しました",
+                },
+            )
+            await self._request(
+                client, "PATCH /reports/{report_id}/review", path_params=path_params
+            )
+
+        await self._request(client, "POST /auth/logout", expected=204)
+
+    def _allocate_report_date(self, email: str) -> date:
+        report_date = self._next_report_date[email]
+        self._next_report_date[email] = report_date - timedelta(days=1)
+        return report_date
+
+    async def run_session(self, sales_ratio: float) -> None:
+        """シードから決まる乱数で1セッションを実行する。"""
+        rng = random.Random(f"{self.seed}:{self._session_index}")
+        self._session_index += 1
+        persona = "sales" if rng.random() < sales_ratio else "manager"
+        scenario: Callable[[httpx.AsyncClient, random.Random], Awaitable[None]] = (
+            self.sales_session if persona == "sales" else self.manager_session
+        )
+        self.sessions[persona] += 1
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=30) as client:
+            try:
+                await scenario(client, rng)
+            except ScenarioError:
+                self.failed_sessions[persona] += 1
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        endpoints = {
+            endpoint: stats.summary(elapsed) for endpoint, stats in self.stats.items()
+        }
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies_ms += stats.latencies_ms
+            total.errors += stats.errors
+            total.status_codes.update(stats.status_codes)
+        return {
+            "elapsed_seconds": elapsed,
+            "sessions": dict(self.sessions),
+            "failed_sessions": dict(self.failed_sessions),
+            "total": total.summary(elapsed),
+            "endpoints": endpoints,
+        }
+
+
+def _visit_records(
+    rng: random.Random, customer_ids: list[int], count: int
+) -> list[dict[str, Any]]:
+    hours = sorted(rng.sample(range(9, 18), min(count, 9)))
+    return [
+        {
+            "customer_id": rng.choice(customer_ids),
+            "visit_content": rng.choice(_VISIT_CONTENTS),
+            "visited_at": f"{hour:02d}:{rng.randrange(60):02d}",
+        }
+        for hour in hours
+    ]
+
+
+async def _discover_accounts(
+    base_url: str, manager_email: str, password: str
+) -> Accounts:
+    """上長でログインし、ユーザー一覧からログインに使うアカウントを取得する。"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        login = await client.post(
+            f"{_API_PREFIX}/auth/login",
+            json={"email": manager_email, "password": password},
+        )
+        login.raise_for_status()
+        users = await client.get(f"{_API_PREFIX}/users")
+        users.raise_for_status()
+    by_role: dict[str, list[str]] = {"SALES": [], "MANAGER": []}
+    for user in users.json()["data"]:
+        by_role[user["role"]].append(user["email"])
+    if not by_role["SALES"]:
+        raise SystemExit("営業担当者が登録されていません")
+    return Accounts(
+        sales=by_role["SALES"], managers=by_role["MANAGER"], password=password
+    )
+
+
+async def _memory_stats(
+    base_url: str, manager_email: str, password: str, *, clear: bool
+) -> dict[str, Any]:
+    """上長でログインし、サーバーのメモリ割り当ての集計を取得する。
+
+    clear を指定した場合は取得後に集計を破棄する。
+    """
+    url = f"{_API_PREFIX}/diagnostics/memory"
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        login = await client.post(
+            f"{_API_PREFIX}/auth/login",
+            json={"email": manager_email, "password": password},
+        )
+        login.raise_for_status()
+        response = await client.get(url, params={"limit": _MEMORY_SITES})
+        response.raise_for_status()
+        if clear:
+            (await client.delete(url)).raise_for_status()
+    stats = response.json()["data"]
+    if not stats["enabled"]:
+        raise SystemExit("サーバーで MEMORY_PROFILING_ENABLED が有効になっていません")
+    return stats
+
+
+async def _run_closed(
+    load_test: LoadTest, *, concurrency: int, deadline: float, sales_ratio: float
+) -> None:
+    async def virtual_user() -> None:
+        while time.perf_counter() < deadline:
+            await load_test.run_session(sales_ratio)
+
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+
+
+async def _run_open(
+    load_test: LoadTest,
+    *,
+    rate: float,
+    concurrency: int,
+    deadline: float,
+    sales_ratio: float,
+) -> None:
+    arrivals = random.Random(f"{load_test.seed}:arrivals")
+    limit = asyncio.Semaphore(concurrency)
+
+    async def session() -> None:
+        async with limit:
+            await load_test.run_session(sales_ratio)
+
+    async with asyncio.TaskGroup() as tg:
+        next_arrival = time.perf_counter()
+        while next_arrival < deadline:
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+            tg.create_task(session())
+            next_arrival += arrivals.expovariate(rate)
+
+
+def _format_summary(result: dict[str, Any]) -> str:
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value:.1f}"
+
+    lines = [
+        f"{result['elapsed_seconds']:.1f}s  sessions={result['sessions']}"
+        f"  failed={result['failed_sessions']}",
+        f"{'endpoint':<38}{'count':>7}{'rps':>8}{'err%':>7}"
+        + "".join(f"{f'p{p}':>8}" for p in _PERCENTILES)
+        + f"{'max':>9}",
+    ]
+    rows = [*result["endpoints"].items(), ("TOTAL", result["total"])]
+    for endpoint, summary in rows:
+        latency = summary["latency_ms"]
+        lines.append(
+            f"{endpoint:<38}{summary['count']:>7}"
+            f"{summary['throughput_rps']:>8.1f}"
+            f"{summary['error_rate'] * 100:>7.1f}"
+            + "".join(f"{ms(latency[f'p{p}']):>8}" for p in _PERCENTILES)
+            + f"{ms(latency['max']):>9}"
+        )
+    memory = result.get("memory")
+    if memory is not None:
+        lines += _format_memory(memory)
+    return "\n".join(lines)
+
+
+def _format_memory(memory: dict[str, Any]) -> list[str]:
+    def kib(value: int) -> str:
+        return f"{value / 1024:.1f}"
+
+    lines = [
+        "",
+        f"memory  tracked_requests={memory['tracked_requests']}",
+        f"{'route':<42}{'count':>7}{'peak KiB':>10}{'max KiB':>10}{'net KiB':>10}",
+    ]
+    for route in memory["routes"]:
+        lines.append(
+            f"{route['route']:<42}{route['count']:>7}"
+            f"{kib(route['avg_peak_bytes']):>10}{kib(route['max_peak_bytes']):>10}"
+            f"{kib(route['avg_net_bytes']):>10}"
+        )
+    lines.append(f"{'net KiB':>10}{'requests':>10}  route / site <- origin")
+    for site in memory["sites"]:
+        lines.append(
+            f"{kib(site['net_bytes']):>10}{site['requests']:>10}  {site['route']}"
+            f" / {site['site'] or '-'} <- {site['origin']}"
+        )
+    return lines
+
+
+async def main(
+    *,
+    base_url: str,
+    manager_email: str,
+    password: str,
+    duration: float,
+    concurrency: int,
+    rate: float | None,
+    sales_ratio: float,
+    seed: int,
+    memory: bool,
+    output: str | None,
+) -> None:
+    accounts = await _discover_accounts(base_url, manager_email, password)
+    if memory:
+        await _memory_stats(base_url, manager_email, password, clear=True)
+    load_test = LoadTest(base_url, accounts, seed=seed)
+
+    started = time.perf_counter()
+    deadline = started + duration
+    if rate is None:
+        await _run_closed(
+            load_test,
+            concurrency=concurrency,
+            deadline=deadline,
+            sales_ratio=sales_ratio,
+        )
+    else:
+        await _run_open(
+            load_test,
+            rate=rate,
+            concurrency=concurrency,
+            deadline=deadline,
+            sales_ratio=sales_ratio,
+        )
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "config": {
+            "base_url": base_url,
+            "duration": duration,
+            "concurrency": concurrency,
+            "rate": rate,
+            "sales_ratio": sales_ratio,
+            "seed": seed,
+        },
+        **load_test.report(elapsed),
+    }
+    if memory:
+        result["memory"] = await _memory_stats(
+            base_url, manager_email, password, clear=False
+        )
+    print(_format_summary(result))
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--manager-email",
+        default="yamada@example.com",
+        help="ユーザー一覧の取得に使う上長",
+    )
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--duration", type=float, default=60, help="計測時間（秒）")
+    parser.add_argument("--concurrency", type=int, default=10, help="同時セッション数")
+    parser.add_argument(
+        "--rate", type=float, help="毎秒の到着セッション数（省略時はクローズドモデル）"
+    )
+    parser.add_argument(
+        "--sales-ratio", type=float, default=0.75, help="営業担当者のセッションの割合"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="サーバーのメモリ割り当ての集計を結果に含める",
+    )
+    parser.add_argument("--output", help="結果の JSON の保存先")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency は1以上を指定してください")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate は正の値を指定してください")
+    if not 0 <= args.sales_ratio <= 1:
+        parser.error("--sales-ratio は0以上1以下を指定してください")
+    asyncio.run(
+        main(
+            base_url=args.base_url,
+            manager_email=args.manager_email,
+            password=args.password,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            sales_ratio=args.sales_ratio,
+            seed=args.seed,
+            memory=args.memory,
+            output=args.output,
+        )
+    )
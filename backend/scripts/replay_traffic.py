@@ -0,0 +1,250 @@
+"""キャプチャしたトラフィックを API サーバーに再生し、記録時と比較する。
+
+app/core/traffic_capture.py で記録した NDJSON を読み込み、記録時刻の順に
+同じメソッド・パス・クエリ・本文のリクエストを送る。送信タイミングは記録時の
+間隔を --speed で割ったもの（2 なら2倍の速さ）で、順序とタイミングは入力の
+ファイルだけで決まる。同じユーザーのリクエストは前のリクエストの完了を待って
+記録どおりの順序で送る。ルートごとに記録時と再生時のレイテンシと
+ステータスの不一致を表示し、--output を指定した場合は JSON でも保存する。
+
+認証が必要なリクエストは、記録したユーザーIDのアクセストークンを再生側で発行して
+送る。そのため SECRET_KEY には再生先と同じ値を設定すること。ログインの
+リクエストはパスワードが伏せ字になっているため、--password を指定した場合のみ
+そのパスワードで再生する。本文を SHA-256 だけで記録したリクエストは再生できない
+ためスキップする。
+
+使い方（backend/ で実行）:
+    SECRET_KEY=... uv run python -m scripts.replay_traffic traffic/traffic.ndjson* \\
+        --base-url https://staging.example.com \\
+        --since 2026-10-19T00:00:00+00:00 --until 2026-10-19T03:00:00+00:00
+
+作成・更新系のリクエストも記録どおりに送るため、再生先は記録開始時点の本番の
+スナップショットから復元した環境を使うこと。
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from datetime import datetime
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any
+
+import httpx
+
+from app.core.security import COOKIE_NAME, create_access_token
+from app.core.traffic_capture import REDACTED
+from scripts.load_test import EndpointStats
+
+
+def _load(
+    paths: list[str], since: datetime | None, until: datetime | None
+) -> list[dict[str, Any]]:
+    """記録を読み込み、期間で絞り込んで記録時刻の順に並べる。"""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                ts = datetime.fromisoformat(record["ts"])
+                if (since and ts < since) or (until and ts >= until):
+                    continue
+                records.append((ts, record))
+    # ローテーションしたファイルをまたいでも同じ順序になるよう安定ソートする
+    records.sort(key=lambda item: item[0])
+    return [{**record, "ts": ts} for ts, record in records]
+
+
+class Replayer:
+    """記録を再生し、ルートごとに記録時と再生時の結果を集計する。"""
+
+    def __init__(
+        self, client: httpx.AsyncClient, *, password: str | None, concurrency: int
+    ) -> None:
+        self.client = client
+        self.password = password
+        self.limit = asyncio.Semaphore(concurrency)
+        self.recorded: dict[str, EndpointStats] = {}
+        self.replayed: dict[str, EndpointStats] = {}
+        self.skipped: Counter[str] = Counter()
+        self._tokens: dict[int, str] = {}
+
+    def _request_kwargs(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        """再生するリクエストの引数を返す。再生できない場合は None を返す。"""
+        kwargs: dict[str, Any] = {"headers": {}}
+        if record["query"]:
+            kwargs["params"] = httpx.QueryParams(record["query"])
+        if "body_sha256" in record:
+            self.skipped["本文が記録されていない"] += 1
+            return None
+        if "body" in record:
+            body = record["body"]
+            if isinstance(body, dict) and body.get("password") == REDACTED:
+                if self.password is None:
+                    self.skipped["ログイン（--password 未指定）"] += 1
+                    return None
+                body = {**body, "password": self.password}
+            kwargs["json"] = body
+        user_id = record["user_id"]
+        if user_id is not None:
+            if user_id not in self._tokens:
+                self._tokens[user_id] = create_access_token(user_id)
+            kwargs["headers"]["Cookie"] = f"{COOKIE_NAME}={self._tokens[user_id]}"
+        return kwargs
+
+    async def replay(
+        self, record: dict[str, Any], after: asyncio.Task | None = None
+    ) -> None:
+        kwargs = self._request_kwargs(record)
+        if kwargs is None:
+            return
+        if after is not None:
+            await asyncio.wait([after])
+        route = f"{record['method']} {record['route'] or record['path']}"
+        recorded = self.recorded.setdefault(route, EndpointStats())
+        replayed = self.replayed.setdefault(route, EndpointStats())
+        recorded.latencies_ms.append(record["duration_ms"])
+        recorded.status_codes[str(record["status"])] += 1
+
+        async with self.limit:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(
+                    record["method"], record["path"], **kwargs
+                )
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            replayed.latencies_ms.append((time.perf_counter() - started) * 1000)
+        replayed.status_codes[status] += 1
+        if status != str(record["status"]):
+            replayed.errors += 1
+
+    async def run(self, records: list[dict[str, Any]], speed: float) -> float:
+        """記録時の間隔を speed で割ったタイミングで送信し、経過秒数を返す。"""
+        started = time.perf_counter()
+        first_ts = records[0]["ts"]
+        last_by_user: dict[int, asyncio.Task] = {}
+        async with asyncio.TaskGroup() as tg:
+            for record in records:
+                offset = (record["ts"] - first_ts).total_seconds() / speed
+                await asyncio.sleep(max(0.0, started + offset - time.perf_counter()))
+                # 作成直後の日報の参照などが入れ替わらないよう、同じユーザーの
+                # リクエストは直前のリクエストの完了を待ってから送る
+                user_id = record["user_id"]
+                task = tg.create_task(self.replay(record, last_by_user.get(user_id)))
+                if user_id is not None:
+                    last_by_user[user_id] = task
+        return time.perf_counter() - started
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        routes = {}
+        for route in sorted(self.replayed):
+            replayed = self.replayed[route].summary(elapsed)
+            routes[route] = {
+                "count": replayed["count"],
+                "status_mismatches": replayed["errors"],
+                "recorded": self.recorded[route].summary(elapsed),
+                "replayed": replayed,
+            }
+        return {
+            "elapsed_seconds": elapsed,
+            "skipped": dict(self.skipped),
+            "routes": routes,
+        }
+
+
+def _format_summary(result: dict[str, Any]) -> str:
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value:.1f}"
+
+    lines = [
+        f"{result['elapsed_seconds']:.1f}s  skipped={result['skipped']}",
+        f"{'route':<42}{'count':>7}{'mismatch':>10}"
+        f"{'rec p50':>9}{'rec p95':>9}{'p50':>9}{'p95':>9}",
+    ]
+    for route, summary in result["routes"].items():
+        recorded = summary["recorded"]["latency_ms"]
+        replayed = summary["replayed"]["latency_ms"]
+        lines.append(
+            f"{route:<42}{summary['count']:>7}{summary['status_mismatches']:>10}"
+            f"{ms(recorded['p50']):>9}{ms(recorded['p95']):>9}"
+            f"{ms(replayed['p50']):>9}{ms(replayed['p95']):>9}"
+        )
+    return "\n".join(lines)
+
+
+async def main(
+    *,
+    paths: list[str],
+    base_url: str,
+    speed: float,
+    since: datetime | None,
+    until: datetime | None,
+    password: str | None,
+    concurrency: int,
+    output: str | None,
+) -> None:
+    records = _load(paths, since, until)
+    if not records:
+        raise SystemExit("再生する記録がありません")
+
+    # ログインで返る Cookie を保存すると別ユーザーの記録に送られるため、保存しない
+    cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    async with httpx.AsyncClient(
+        base_url=base_url, cookies=cookies, timeout=30
+    ) as client:
+        replayer = Replayer(client, password=password, concurrency=concurrency)
+        elapsed = await replayer.run(records, speed)
+
+    result = {
+        "config": {
+            "paths": paths,
+            "base_url": base_url,
+            "speed": speed,
+            "records": len(records),
+        },
+        **replayer.report(elapsed),
+    }
+    print(_format_summary(result))
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="記録した NDJSON ファイル")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="再生速度の倍率（2 で2倍速）"
+    )
+    parser.add_argument(
+        "--since", type=datetime.fromisoformat, help="再生する期間の開始"
+    )
+    parser.add_argument(
+        "--until", type=datetime.fromisoformat, help="再生する期間の終了"
+    )
+    parser.add_argument("--password", help="ログインのリクエストに使うパスワード")
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="同時に送信するリクエストの上限"
+    )
+    parser.add_argument("--output", help="結果の JSON の保存先")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed は正の値を指定してください")
+    if args.concurrency < 1:
+        parser.error("--concurrency は1以上を指定してください")
+    asyncio.run(
+        main(
+            paths=args.paths,
+            base_url=args.base_url,
+            speed=args.speed,
+            since=args.since,
+            until=args.until,
+            password=args.password,
+            concurrency=args.concurrency,
+            output=args.output,
+        )
+    )
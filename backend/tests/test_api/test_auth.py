@@ -123,6 +123,20 @@ class TestLogin:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        await create_user(db_session)
+
+        async with build_client(db_session) as client:
+            async with assert_max_queries(2):
+                response = await client.post(
+                    "/api/v1/auth/login",
+                    json={"email": "tanaka@example.com", "password": "password123"},
+                )
+
+        assert response.status_code == status.HTTP_200_OK
+
 
 class TestLogout:
     async def test_ログアウトで204が返りCookieが削除されること(
@@ -147,6 +161,18 @@ class TestLogout:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(2):
+                response = await client.post("/api/v1/auth/logout")
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
 
 class TestGetMe:
     async def test_認証済みユーザーの情報が返ること(self, db_session: AsyncSession):
@@ -174,3 +200,15 @@ class TestGetMe:
             response = await client.get("/api/v1/auth/me")
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(2):
+                response = await client.get("/api/v1/auth/me")
+
+        assert response.status_code == status.HTTP_200_OK
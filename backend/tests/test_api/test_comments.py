@@ -203,3 +203,25 @@ class TestCreateComment:
             )
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            name="部長",
+            role=UserRole.MANAGER,
+        )
+        report = await _create_report(db_session, user)
+        token = create_access_token(manager.id)
+
+        async with build_client(db_session, token=token) as client:
+            for content in ("1件目", "2件目"):
+                async with assert_max_queries(6):
+                    response = await client.post(
+                        f"/api/v1/reports/{report.id}/comments",
+                        json={"target": "PROBLEM", "content": content},
+                    )
+                assert response.status_code == status.HTTP_201_CREATED
@@ -103,6 +103,21 @@ class TestGetCustomers:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        for i in range(3):
+            await create_customer(db_session, company_name=f"顧客{i}")
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(4):
+                response = await client.get("/api/v1/customers")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]) == 3
+
 
 class TestCreateCustomer:
     async def test_必須項目のみで顧客が作成されること(self, db_session: AsyncSession):
@@ -231,6 +246,21 @@ class TestCreateCustomer:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(5):
+                response = await client.post(
+                    "/api/v1/customers",
+                    json={"company_name": "新規株式会社", "contact_name": "新規担当"},
+                )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
 
 class TestGetCustomerDetail:
     async def test_顧客詳細を取得できること(self, db_session: AsyncSession):
@@ -261,6 +291,19 @@ class TestGetCustomerDetail:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        customer = await create_customer(db_session)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(3):
+                response = await client.get(f"/api/v1/customers/{customer.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+
 
 class TestUpdateCustomer:
     async def test_顧客を更新できること(self, db_session: AsyncSession):
@@ -369,6 +412,25 @@ class TestUpdateCustomer:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        customer = await create_customer(db_session)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(6):
+                response = await client.put(
+                    f"/api/v1/customers/{customer.id}",
+                    json={
+                        "company_name": "更新後株式会社",
+                        "contact_name": "更新後担当",
+                    },
+                )
+
+        assert response.status_code == status.HTTP_200_OK
+
 
 class TestDeleteCustomer:
     async def test_訪問記録で未使用の顧客を削除できること(
@@ -407,3 +469,16 @@ class TestDeleteCustomer:
             response = await client.delete("/api/v1/customers/99999")
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        customer = await create_customer(db_session)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(6):
+                response = await client.delete(f"/api/v1/customers/{customer.id}")
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
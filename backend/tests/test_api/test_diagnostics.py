@@ -0,0 +1,179 @@
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.allocation_tracker import allocation_tracker
+from app.core.loop_monitor import loop_monitor
+from app.core.retry import retry_stats
+from app.core.security import create_access_token
+from app.core.slow_query import slow_query_log
+from app.models.user import UserRole
+from tests.helpers import build_client, create_user
+
+
+class TestGetSlowQueries:
+    async def test_MANAGERがスロークエリの集計を取得できること(
+        self, db_session: AsyncSession
+    ):
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            role=UserRole.MANAGER,
+            name="山田部長",
+        )
+        token = create_access_token(manager.id)
+        slow_query_log.clear()
+        slow_query_log.record("SELECT * FROM daily_reports WHERE id = $1", None, 800)
+
+        async with build_client(db_session, token=token) as client:
+            response = await client.get("/api/v1/diagnostics/slow-queries")
+
+        slow_query_log.clear()
+        assert response.status_code == status.HTTP_200_OK
+        [stats] = response.json()["data"]
+        assert stats["statement"] == "SELECT * FROM daily_reports WHERE id = ?"
+        assert stats["count"] == 1
+        assert stats["max_ms"] == 800
+
+    async def test_MANAGERが集計を破棄できること(self, db_session: AsyncSession):
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            role=UserRole.MANAGER,
+            name="山田部長",
+        )
+        token = create_access_token(manager.id)
+        slow_query_log.record("SELECT 1", None, 800)
+
+        async with build_client(db_session, token=token) as client:
+            response = await client.delete("/api/v1/diagnostics/slow-queries")
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert slow_query_log.snapshot() == []
+
+    async def test_SALESがアクセスすると403エラーが返ること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            response = await client.get("/api/v1/diagnostics/slow-queries")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestGetRetryStats:
+    async def test_MANAGERがリトライの集計を取得できること(
+        self, db_session: AsyncSession
+    ):
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            role=UserRole.MANAGER,
+            name="山田部長",
+        )
+        token = create_access_token(manager.id)
+        retry_stats.clear()
+        retry_stats.incr("ReportService.get_list_rows", "deadlock:retried")
+
+        async with build_client(db_session, token=token) as client:
+            response = await client.get("/api/v1/diagnostics/retries")
+
+        retry_stats.clear()
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"] == [
+            {
+                "operation": "ReportService.get_list_rows",
+                "outcome": "deadlock:retried",
+                "count": 1,
+            }
+        ]
+
+
+class TestGetSqlCacheStats:
+    async def test_MANAGERがSQLキャッシュのヒット率を取得できること(
+        self, db_session: AsyncSession
+    ):
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            role=UserRole.MANAGER,
+            name="山田部長",
+        )
+        token = create_access_token(manager.id)
+
+        async with build_client(db_session, token=token) as client:
+            response = await client.get("/api/v1/diagnostics/sql-cache")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()["data"]) == {
+            "hits",
+            "misses",
+            "uncached",
+            "hit_rate",
+        }
+
+
+class TestGetMemoryStats:
+    async def test_MANAGERがルートごとのメモリ割り当てを取得できること(
+        self, db_session: AsyncSession
+    ):
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            role=UserRole.MANAGER,
+            name="山田部長",
+        )
+        token = create_access_token(manager.id)
+        allocation_tracker.start(nframes=8)
+        try:
+            async with build_client(db_session, token=token) as client:
+                await client.get("/api/v1/users")
+                response = await client.get("/api/v1/diagnostics/memory")
+                cleared = await client.delete("/api/v1/diagnostics/memory")
+        finally:
+            allocation_tracker.stop()
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["enabled"] is True
+        [users] = data["routes"]
+        assert users["route"] == "GET /api/v1/users"
+        assert users["count"] == 1
+        assert users["max_peak_bytes"] > 0
+        assert cleared.status_code == status.HTTP_204_NO_CONTENT
+        assert allocation_tracker.snapshot()["routes"] == []
+
+
+class TestGetBlockingCalls:
+    async def test_MANAGERがイベントループをブロックしたスタックを取得できること(
+        self, db_session: AsyncSession
+    ):
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            role=UserRole.MANAGER,
+            name="山田部長",
+        )
+        token = create_access_token(manager.id)
+        stack = (
+            "hash_password (app/core/security.py:21)",
+            "login (app/api/v1/auth.py:40)",
+        )
+        loop_monitor.record(stack, 120.0)
+        loop_monitor.record(stack, 80.0)
+        try:
+            async with build_client(db_session, token=token) as client:
+                response = await client.get("/api/v1/diagnostics/blocking-calls")
+                cleared = await client.delete("/api/v1/diagnostics/blocking-calls")
+        finally:
+            loop_monitor.clear()
+
+        assert response.status_code == status.HTTP_200_OK
+        [blocking] = response.json()["data"]
+        assert blocking["stack"] == list(stack)
+        assert blocking["count"] == 2
+        assert blocking["total_ms"] == 200.0
+        assert blocking["max_ms"] == 120.0
+        assert cleared.status_code == status.HTTP_204_NO_CONTENT
+        assert loop_monitor.snapshot() == []
@@ -0,0 +1,97 @@
+"""インメモリのリポジトリに差し替えたAPIのテスト。"""
+
+from collections.abc import AsyncGenerator
+from datetime import date
+
+import httpx
+import pytest
+from fastapi import status
+
+from app.api.in_memory import use_in_memory_repositories
+from app.core.query_metrics import count_queries
+from app.main import app
+from app.repositories.in_memory import InMemoryStore, seed_master_data
+from tests.helpers import DEFAULT_PASSWORD
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[httpx.AsyncClient]:
+    store = InMemoryStore()
+    seed_master_data(store, password=DEFAULT_PASSWORD)
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides.clear()
+    use_in_memory_repositories(app, store)
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides = overrides
+
+
+async def _login(client: httpx.AsyncClient, email: str) -> None:
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": email, "password": DEFAULT_PASSWORD}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+class TestInMemoryBackend:
+    async def test_日報の作成から確認までSQLを発行せずに処理できること(
+        self, client: httpx.AsyncClient
+    ):
+        with count_queries() as counter:
+            await _login(client, "tanaka@example.com")
+            created = await client.post(
+                "/api/v1/reports",
+                json={
+                    "report_date": date.today().isoformat(),
+                    "visit_records": [
+                        {
+                            "customer_id": 1,
+                            "visit_content": "新商品の提案",
+                            "visited_at": "10:00",
+                        }
+                    ],
+                    "problem": "課題",
+                    "plan": "計画",
+                    "status": "SUBMITTED",
+                },
+            )
+            report_id = created.json()["data"]["id"]
+
+            await _login(client, "yamada@example.com")
+            commented = await client.post(
+                f"/api/v1/reports/{report_id}/comments",
+                json={"target": "PROBLEM", "content": "確認しました"},
+            )
+            reviewed = await client.patch(f"/api/v1/reports/{report_id}/review")
+            listed = await client.get("/api/v1/reports")
+            detail = await client.get(f"/api/v1/reports/{report_id}")
+
+        assert created.status_code == status.HTTP_201_CREATED
+        assert commented.status_code == status.HTTP_201_CREATED
+        assert reviewed.status_code == status.HTTP_200_OK
+        assert listed.json()["data"][0]["visit_count"] == 1
+        body = detail.json()["data"]
+        assert body["status"] == "REVIEWED"
+        assert body["visit_records"][0]["customer"]["company_name"] == "○○株式会社"
+        assert body["comments"][0]["manager"]["name"] == "山田部長"
+        assert counter.count == 0
+
+    async def test_同じ日付の日報を作成すると409が返ること(
+        self, client: httpx.AsyncClient
+    ):
+        await _login(client, "tanaka@example.com")
+        payload = {
+            "report_date": date.today().isoformat(),
+            "visit_records": [],
+            "status": "DRAFT",
+        }
+
+        first = await client.post("/api/v1/reports", json=payload)
+        second = await client.post("/api/v1/reports", json=payload)
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert second.status_code == status.HTTP_409_CONFLICT
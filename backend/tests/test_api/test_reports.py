@@ -4,7 +4,8 @@ from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import create_access_token
-from app.models.daily_report import ReportStatus
+from app.models.comment import Comment, CommentTarget
+from app.models.daily_report import DailyReport, ReportStatus
 from app.models.user import UserRole
 from tests.helpers import (
     build_client,
@@ -15,6 +16,46 @@ from tests.helpers import (
 )
 
 
+async def _create_manager(db: AsyncSession):
+    return await create_user(
+        db, email="manager@example.com", name="部長", role=UserRole.MANAGER
+    )
+
+
+async def _create_reports_with_details(
+    db: AsyncSession, user, manager, *, count: int = 3
+) -> list[DailyReport]:
+    """訪問記録とコメントを複数件ずつ持つ提出済み日報を作成する。
+
+    SQL発行数の検証用。関連の件数に比例してSQLが増える N+1 を検出できるようにする。
+    """
+    customers = [
+        await create_customer(db, company_name=f"顧客{i}") for i in range(count)
+    ]
+    reports = []
+    for days_ago in range(1, count + 1):
+        report = await create_report(
+            db,
+            user,
+            report_date=date.today() - timedelta(days=days_ago),
+            status=ReportStatus.SUBMITTED,
+        )
+        for order, customer in enumerate(customers, start=1):
+            await create_visit_record(db, report, customer, visit_order=order)
+        db.add_all(
+            Comment(
+                daily_report_id=report.id,
+                manager_id=manager.id,
+                target=target,
+                content="確認しました",
+            )
+            for target in CommentTarget
+        )
+        await db.commit()
+        reports.append(report)
+    return reports
+
+
 class TestGetReports:
     async def test_SALESが自分の日報一覧を取得できること(
         self, db_session: AsyncSession
@@ -103,6 +144,24 @@ class TestGetReports:
         data = response.json()["data"][0]
         assert data["visit_count"] == 1
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        manager = await _create_manager(db_session)
+        await _create_reports_with_details(db_session, user, manager)
+        token = create_access_token(manager.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(4):
+                response = await client.get(
+                    "/api/v1/reports",
+                    params={"date_from": str(date.today() - timedelta(days=7))},
+                )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]) == 3
+
 
 class TestCreateReport:
     async def test_下書き保存で日報が作成されること(self, db_session: AsyncSession):
@@ -208,7 +267,6 @@ class TestCreateReport:
         error = response.json()["error"]
         assert error["code"] == "CONFLICT"
 
-
     async def test_MANAGERが日報を作成すると403エラーが返ること(
         self, db_session: AsyncSession
     ):
@@ -290,6 +348,36 @@ class TestCreateReport:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        customers = [
+            await create_customer(db_session, company_name=f"顧客{i}") for i in range(3)
+        ]
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(9):
+                response = await client.post(
+                    "/api/v1/reports",
+                    json={
+                        "report_date": str(date.today()),
+                        "status": "SUBMITTED",
+                        "visit_records": [
+                            {
+                                "customer_id": customer.id,
+                                "visit_content": "打合せ",
+                                "visited_at": "10:00",
+                            }
+                            for customer in customers
+                        ],
+                    },
+                )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.json()["data"]["visit_records"]) == 3
+
 
 class TestGetReportDetail:
     async def test_SALESが自分の日報詳細を取得できること(
@@ -344,6 +432,33 @@ class TestGetReportDetail:
 
         assert response.status_code == status.HTTP_200_OK
 
+    async def test_コメントの投稿者が含まれること(self, db_session: AsyncSession):
+        user = await create_user(db_session)
+        manager = await create_user(
+            db_session,
+            email="manager@example.com",
+            name="部長",
+            role=UserRole.MANAGER,
+        )
+        report = await create_report(db_session, user, status=ReportStatus.SUBMITTED)
+        db_session.add(
+            Comment(
+                daily_report_id=report.id,
+                manager_id=manager.id,
+                target=CommentTarget.PROBLEM,
+                content="確認しました",
+            )
+        )
+        await db_session.commit()
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            response = await client.get(f"/api/v1/reports/{report.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        [comment] = response.json()["data"]["comments"]
+        assert comment["manager"]["name"] == "部長"
+
     async def test_存在しないIDで404エラーが返ること(self, db_session: AsyncSession):
         user = await create_user(db_session)
         token = create_access_token(user.id)
@@ -353,6 +468,23 @@ class TestGetReportDetail:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        manager = await _create_manager(db_session)
+        [report, *_] = await _create_reports_with_details(db_session, user, manager)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(3):
+                response = await client.get(f"/api/v1/reports/{report.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert len(data["visit_records"]) == 3
+        assert len(data["comments"]) == len(CommentTarget)
+
 
 class TestUpdateReport:
     async def test_DRAFT日報を更新できること(self, db_session: AsyncSession):
@@ -437,6 +569,39 @@ class TestUpdateReport:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        report = await create_report(db_session, user)
+        customers = [
+            await create_customer(db_session, company_name=f"顧客{i}") for i in range(3)
+        ]
+        for order, customer in enumerate(customers, start=1):
+            await create_visit_record(db_session, report, customer, visit_order=order)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(9):
+                response = await client.put(
+                    f"/api/v1/reports/{report.id}",
+                    json={
+                        "report_date": str(report.report_date),
+                        "status": "DRAFT",
+                        "visit_records": [
+                            {
+                                "customer_id": customer.id,
+                                "visit_content": "再訪問",
+                                "visited_at": "11:00",
+                            }
+                            for customer in customers
+                        ],
+                    },
+                )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]["visit_records"]) == 3
+
 
 class TestDeleteReport:
     async def test_DRAFT日報を削除できること(self, db_session: AsyncSession):
@@ -501,6 +666,19 @@ class TestDeleteReport:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        report = await create_report(db_session, user)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(4):
+                response = await client.delete(f"/api/v1/reports/{report.id}")
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
 
 class TestSubmitReport:
     async def test_DRAFT日報を提出できること(self, db_session: AsyncSession):
@@ -552,6 +730,19 @@ class TestSubmitReport:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        report = await create_report(db_session, user)
+        token = create_access_token(user.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(6):
+                response = await client.patch(f"/api/v1/reports/{report.id}/submit")
+
+        assert response.status_code == status.HTTP_200_OK
+
 
 class TestReviewReport:
     async def test_MANAGERがSUBMITTED日報を確認済みにできること(
@@ -619,3 +810,17 @@ class TestReviewReport:
             response = await client.patch("/api/v1/reports/99999/review")
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        user = await create_user(db_session)
+        manager = await _create_manager(db_session)
+        [report, *_] = await _create_reports_with_details(db_session, user, manager)
+        token = create_access_token(manager.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(6):
+                response = await client.patch(f"/api/v1/reports/{report.id}/review")
+
+        assert response.status_code == status.HTTP_200_OK
@@ -88,3 +88,20 @@ class TestGetUsers:
         assert user_data["name"] == "山田部長"
         assert user_data["email"] == "manager@example.com"
         assert user_data["role"] == "MANAGER"
+
+    async def test_SQL発行数が上限以内であること(
+        self, db_session: AsyncSession, assert_max_queries
+    ):
+        manager = await create_user(
+            db_session, email="manager@example.com", role=UserRole.MANAGER
+        )
+        for i in range(3):
+            await create_user(db_session, email=f"sales{i}@example.com")
+        token = create_access_token(manager.id)
+
+        async with build_client(db_session, token=token) as client:
+            async with assert_max_queries(3):
+                response = await client.get("/api/v1/users")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]) == 4
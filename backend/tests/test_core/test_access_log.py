@@ -0,0 +1,51 @@
+import logging
+
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from tests.helpers import build_client, create_user
+
+
+class TestAccessLog:
+    async def test_リクエストごとにルートとユーザーとSQLの内訳が記録されること(
+        self, db_session: AsyncSession, caplog
+    ):
+        user = await create_user(db_session)
+
+        with caplog.at_level(logging.INFO, logger="app.access"):
+            async with build_client(
+                db_session, token=create_access_token(user.id)
+            ) as client:
+                response = await client.get("/api/v1/auth/me")
+
+        assert response.status_code == status.HTTP_200_OK
+        (record,) = caplog.records
+        fields = record.fields
+        assert fields["method"] == "GET"
+        assert fields["route"] == "/api/v1/auth/me"
+        assert fields["status"] == 200
+        assert fields["user_id"] == user.id
+        assert fields["queries"] >= 1
+        assert 0 < fields["db_ms"] <= fields["duration_ms"]
+        assert fields["sample_rate"] == settings.access_log_sample_rate
+
+    async def test_成功したリクエストは間引きエラーは常に記録すること(
+        self, db_session: AsyncSession, caplog, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "access_log_sample_rate", 0.0)
+        user = await create_user(db_session)
+
+        with caplog.at_level(logging.INFO, logger="app.access"):
+            async with build_client(
+                db_session, token=create_access_token(user.id)
+            ) as client:
+                await client.get("/api/v1/auth/me")
+            async with build_client(db_session) as client:
+                await client.get("/api/v1/auth/me")
+
+        (record,) = caplog.records
+        assert record.fields["status"] == 401
+        assert record.fields["user_id"] is None
+        assert "sample_rate" not in record.fields
@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.admission import AdmissionBudget, AdmissionController, admission
+from app.core.database import get_db
+from app.core.exceptions import ServiceUnavailableError
+from app.main import app
+from tests.helpers import build_client
+
+_ORIGIN = "http://localhost:3000"
+
+
+def _budget(*, limit: int = 1, max_queue: int = 10, max_wait_ms: int = 1000):
+    return AdmissionBudget(
+        "test", limit=limit, max_queue=max_queue, max_wait_ms=max_wait_ms
+    )
+
+
+class TestAdmissionBudget:
+    async def test_上限以内であれば待たずに実行されること(self):
+        budget = _budget(limit=2)
+
+        async with budget.admit(), budget.admit():
+            assert budget.in_flight == 2
+
+        assert budget.in_flight == 0
+
+    async def test_上限到達時は解放されるまで待機すること(self):
+        budget = _budget(limit=1)
+        order = []
+
+        async def worker(name: str, hold: float) -> None:
+            async with budget.admit():
+                order.append(f"{name}:start")
+                await asyncio.sleep(hold)
+                order.append(f"{name}:end")
+
+        first = asyncio.create_task(worker("a", 0.05))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(worker("b", 0))
+        await asyncio.sleep(0)
+        assert budget.waiting == 1
+
+        await asyncio.gather(first, second)
+
+        assert order == ["a:start", "a:end", "b:start", "b:end"]
+        assert budget.in_flight == 0
+
+    async def test_待機上限を超えると拒否されること(self):
+        budget = _budget(limit=1, max_wait_ms=20)
+
+        async with budget.admit():
+            with pytest.raises(ServiceUnavailableError):
+                async with budget.admit():
+                    pass
+
+        assert budget.rejected == 1
+        assert budget.waiting == 0
+        assert budget.in_flight == 0
+
+    async def test_待ち行列が上限に達していると即座に拒否されること(self):
+        budget = _budget(limit=1, max_queue=0, max_wait_ms=10_000)
+
+        async with budget.admit():
+            with pytest.raises(ServiceUnavailableError):
+                await asyncio.wait_for(budget.admit().__aenter__(), timeout=0.1)
+
+        assert budget.rejected == 1
+
+    async def test_待機中にキャンセルされても枠が失われないこと(self):
+        budget = _budget(limit=1)
+
+        async with budget.admit():
+            waiter = asyncio.create_task(budget.admit().__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        assert budget.in_flight == 0
+        async with budget.admit():
+            assert budget.in_flight == 1
+
+
+class TestAdmissionController:
+    def test_メソッドで参照系と更新系の枠が振り分けられること(self):
+        controller = AdmissionController(read=_budget(), write=_budget())
+
+        assert controller.budget_for("GET") is controller.read
+        assert controller.budget_for("HEAD") is controller.read
+        assert controller.budget_for("POST") is controller.write
+        assert controller.budget_for("DELETE") is controller.write
+
+
+class TestAdmissionMiddleware:
+    async def test_枠を確保できない場合は503とRetryAfterが返ること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(admission, "read", _budget(limit=0, max_wait_ms=10))
+
+        async with build_client(db_session) as client:
+            response = await client.get("/api/v1/customers")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["error"]["code"] == "SERVICE_UNAVAILABLE"
+
+    async def test_参照系の枠が埋まっていても更新系は受け付けること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(admission, "read", _budget(limit=0, max_wait_ms=10))
+
+        async with build_client(db_session) as client:
+            response = await client.post(
+                "/api/v1/auth/login",
+                json={"email": "none@example.com", "password": "password123"},
+            )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_拒否した503にもCORSヘッダーが付与されること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(admission, "read", _budget(limit=0, max_queue=0))
+
+        async with build_client(db_session) as client:
+            response = await client.get("/api/v1/reports", headers={"Origin": _ORIGIN})
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["access-control-allow-origin"] == _ORIGIN
+        assert response.headers["Retry-After"] == "1"
+
+    async def test_プリフライトは枠を使わずに応答されること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(admission, "read", _budget(limit=0, max_queue=0))
+        monkeypatch.setattr(admission, "write", _budget(limit=0, max_queue=0))
+
+        async with build_client(db_session) as client:
+            response = await client.options(
+                "/api/v1/reports",
+                headers={
+                    "Origin": _ORIGIN,
+                    "Access-Control-Request-Method": "POST",
+                },
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["access-control-allow-origin"] == _ORIGIN
+
+    async def test_API以外のパスは制限の対象外であること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(admission, "read", _budget(limit=0, max_wait_ms=10))
+
+        async with build_client(db_session) as client:
+            response = await client.get("/openapi.json")
+
+        assert response.status_code == status.HTTP_200_OK
+
+
+class TestPoolTimeoutHandler:
+    async def test_プール取得待ちのタイムアウトが503で返ること(
+        self, db_session: AsyncSession
+    ):
+        async def _exhausted_pool():
+            raise PoolTimeoutError("QueuePool limit reached")
+            yield
+
+        async with build_client(db_session) as client:
+            app.dependency_overrides[get_db] = _exhausted_pool
+            response = await client.get("/api/v1/customers")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
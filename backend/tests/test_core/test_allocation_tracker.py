@@ -0,0 +1,97 @@
+from collections.abc import Generator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.allocation_tracker import (
+    AllocationTracker,
+    AllocationTrackingMiddleware,
+)
+
+_RETAINED: list[bytes] = []
+
+
+def _build_app(tracker: AllocationTracker) -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(AllocationTrackingMiddleware, tracker=tracker)
+
+    @test_app.post("/api/v1/items/{item_id}")
+    async def create_item(item_id: int):
+        # 一時的な割り当て（ピークのみに表れる）と、リクエスト後も残る割り当て
+        transient = [bytes(1024) for _ in range(1024)]
+        del transient
+        _RETAINED.append(bytes(200 * 1024))
+        return {"id": item_id}
+
+    @test_app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return test_app
+
+
+@pytest.fixture
+def tracker() -> Generator[AllocationTracker]:
+    tracker = AllocationTracker()
+    tracker.start(nframes=8)
+    yield tracker
+    tracker.stop()
+    _RETAINED.clear()
+
+
+class TestAllocationTrackingMiddleware:
+    async def test_ルートごとにピークと残った割り当てが集計されること(
+        self, tracker: AllocationTracker
+    ):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=_build_app(tracker)),
+            base_url="http://test",
+        ) as client:
+            await client.post("/api/v1/items/1")
+            await client.post("/api/v1/items/2")
+            await client.get("/health")
+
+        stats = tracker.snapshot()
+        assert stats["enabled"] is True
+        assert stats["tracked_requests"] == 2
+        [route] = stats["routes"]
+        assert route["route"] == "POST /api/v1/items/{item_id}"
+        assert route["count"] == 2
+        assert route["max_peak_bytes"] >= 1024 * 1024
+        assert route["avg_net_bytes"] >= 200 * 1024
+        assert route["avg_net_bytes"] < route["avg_peak_bytes"]
+
+        [top, *_] = stats["sites"]
+        assert top["route"] == "POST /api/v1/items/{item_id}"
+        assert "test_allocation_tracker.py" in top["origin"]
+        assert top["requests"] == 2
+        assert top["net_bytes"] >= 2 * 200 * 1024
+
+    async def test_集計を破棄できること(self, tracker: AllocationTracker):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=_build_app(tracker)),
+            base_url="http://test",
+        ) as client:
+            await client.post("/api/v1/items/1")
+
+        tracker.clear()
+
+        stats = tracker.snapshot()
+        assert stats["tracked_requests"] == 0
+        assert stats["routes"] == []
+        assert stats["sites"] == []
+
+    async def test_追跡を開始していない場合は計測しないこと(self):
+        tracker = AllocationTracker()
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=_build_app(tracker)),
+            base_url="http://test",
+        ) as client:
+            response = await client.post("/api/v1/items/1")
+
+        _RETAINED.clear()
+        assert response.status_code == 200
+        assert tracker.snapshot()["enabled"] is False
+        assert tracker.snapshot()["tracked_requests"] == 0
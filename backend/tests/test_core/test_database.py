@@ -1,7 +1,13 @@
-from sqlalchemy import text
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import InvalidRequestError, MissingGreenlet
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.core.database import get_db, get_db_session
+from app.models.daily_report import DailyReport
+from tests.helpers import create_report, create_user
 
 
 class TestGetDb:
@@ -32,3 +38,45 @@ class TestGetDb:
         async with get_db_session() as session1:
             async with get_db_session() as session2:
                 assert session1 is not session2
+
+
+class TestStrictLoading:
+    async def test_ローダーオプションで明示していないリレーションは例外になること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        report = await create_report(db_session, user)
+        db_session.expunge_all()
+
+        loaded = await db_session.get(DailyReport, report.id)
+
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            _ = loaded.visit_records
+
+    async def test_明示したリレーションは読み込まれること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        report = await create_report(db_session, user)
+        db_session.expunge_all()
+
+        result = await db_session.execute(
+            select(DailyReport)
+            .options(selectinload(DailyReport.visit_records))
+            .where(DailyReport.id == report.id)
+        )
+
+        assert result.scalar_one().visit_records == []
+
+    async def test_無効な場合は付与されないこと(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "strict_loading", False)
+        user = await create_user(db_session)
+        report = await create_report(db_session, user)
+        db_session.expunge_all()
+
+        loaded = await db_session.get(DailyReport, report.id)
+        # raiseload が付与されていなければ通常の遅延ロードが試みられる
+        with pytest.raises(MissingGreenlet):
+            _ = loaded.visit_records
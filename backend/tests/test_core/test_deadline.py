@@ -0,0 +1,202 @@
+import asyncio
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.deadline import (
+    CancelOnDisconnectMiddleware,
+    DeadlineRoute,
+    RouteKind,
+    classify_route,
+    get_timeout_ms,
+)
+from app.core.exceptions import AppError
+from app.main import app_error_handler
+
+
+def _build_app(db_session: AsyncSession) -> FastAPI:
+    """DeadlineRoute を使うテスト用のFastAPIアプリを構築するヘルパー。"""
+    test_app = FastAPI()
+    test_app.add_exception_handler(AppError, app_error_handler)
+    router = APIRouter(route_class=DeadlineRoute)
+
+    async def _override_get_db():
+        yield db_session
+
+    test_app.dependency_overrides[get_db] = _override_get_db
+
+    @router.get("/items")
+    async def list_items(db: AsyncSession = Depends(get_db)):  # noqa: B008
+        result = await db.execute(text("SHOW statement_timeout"))
+        return {"statement_timeout": result.scalar_one()}
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int, db: AsyncSession = Depends(get_db)):  # noqa: B008
+        await db.execute(text("SELECT pg_sleep(1)"))
+        return {"id": item_id}
+
+    @router.post("/items")
+    async def create_item():
+        await asyncio.sleep(1)
+        return {}
+
+    test_app.include_router(router)
+    return test_app
+
+
+def _build_client(test_app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=test_app), base_url="http://test"
+    )
+
+
+def _find_route(test_app: FastAPI, name: str) -> DeadlineRoute:
+    return next(r for r in test_app.routes if getattr(r, "name", None) == name)
+
+
+class TestClassifyRoute:
+    def test_メソッドとパスパラメータでルート種別が判定されること(
+        self, db_session: AsyncSession
+    ):
+        test_app = _build_app(db_session)
+
+        assert classify_route(_find_route(test_app, "list_items")) == RouteKind.LIST
+        assert classify_route(_find_route(test_app, "get_item")) == RouteKind.DETAIL
+        assert classify_route(_find_route(test_app, "create_item")) == RouteKind.WRITE
+
+    def test_ルート名で上限時間を個別指定できること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        test_app = _build_app(db_session)
+        monkeypatch.setattr(settings, "request_timeout_overrides", {"list_items": 1234})
+
+        assert get_timeout_ms(_find_route(test_app, "list_items")) == 1234
+        assert get_timeout_ms(_find_route(test_app, "get_item")) == (
+            settings.request_timeout_detail_ms
+        )
+
+
+class TestDeadlineRoute:
+    async def test_トランザクションに残り時間のstatement_timeoutが設定されること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "request_timeout_list_ms", 3000)
+
+        async with _build_client(_build_app(db_session)) as client:
+            response = await client.get("/items")
+
+        assert response.status_code == status.HTTP_200_OK
+        timeout_ms = int(response.json()["statement_timeout"].removesuffix("ms"))
+        assert 0 < timeout_ms <= 3000
+
+    async def test_statement_timeout超過で504エラーが返ること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "request_timeout_detail_ms", 100)
+
+        async with _build_client(_build_app(db_session)) as client:
+            response = await client.get("/items/1")
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        assert response.json()["error"]["code"] == "REQUEST_TIMEOUT"
+
+    async def test_処理全体の上限超過で504エラーが返ること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "request_timeout_write_ms", 50)
+
+        async with _build_client(_build_app(db_session)) as client:
+            response = await client.post("/items")
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        assert response.json()["error"]["message"] == "処理がタイムアウトしました"
+
+
+class TestCancelOnDisconnectMiddleware:
+    async def test_クライアント切断時にハンドラがキャンセルされること(self):
+        cancelled = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        messages = [
+            {"type": "http.request", "body": b"", "more_body": False},
+            {"type": "http.disconnect"},
+        ]
+
+        async def receive():
+            await asyncio.sleep(0.01)
+            return messages.pop(0)
+
+        async def send(message):
+            raise AssertionError("切断後にレスポンスを送信しないこと")
+
+        middleware = CancelOnDisconnectMiddleware(slow_app)
+        scope = {"type": "http", "method": "GET", "path": "/slow"}
+
+        await asyncio.wait_for(middleware(scope, receive, send), timeout=1)
+
+        assert cancelled.is_set()
+
+    async def test_切断がなければレスポンスがそのまま返ること(self):
+        async def echo_app(scope, receive, send):
+            message = await receive()
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": message["body"]})
+
+        received = asyncio.Event()
+
+        async def receive():
+            if received.is_set():
+                await asyncio.sleep(10)
+            received.set()
+            return {"type": "http.request", "body": b"ok", "more_body": False}
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = CancelOnDisconnectMiddleware(echo_app)
+        scope = {"type": "http", "method": "POST", "path": "/echo"}
+
+        await asyncio.wait_for(middleware(scope, receive, send), timeout=1)
+
+        assert sent[1]["body"] == b"ok"
+
+    async def test_レスポンス送信後の切断では後処理がキャンセルされないこと(self):
+        finished = asyncio.Event()
+
+        async def app_with_cleanup(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b"ok"})
+            await asyncio.sleep(0.05)
+            finished.set()
+
+        messages = [
+            {"type": "http.request", "body": b"", "more_body": False},
+            {"type": "http.disconnect"},
+        ]
+
+        async def receive():
+            if not messages:
+                await asyncio.sleep(10)
+            return messages.pop(0)
+
+        async def send(message):
+            pass
+
+        middleware = CancelOnDisconnectMiddleware(app_with_cleanup)
+        scope = {"type": "http", "method": "GET", "path": "/items"}
+
+        await asyncio.wait_for(middleware(scope, receive, send), timeout=1)
+
+        assert finished.is_set()
@@ -7,6 +7,8 @@ from app.core.exceptions import (
     ConflictError,
     ForbiddenError,
     NotFoundError,
+    RequestTimeoutError,
+    ServiceUnavailableError,
     UnauthorizedError,
     ValidationError,
 )
@@ -99,6 +101,32 @@ class TestConflictError:
         assert error.message == "指定された日付の日報は既に存在します"
 
 
+class TestServiceUnavailableError:
+    """ServiceUnavailableErrorのテスト。"""
+
+    def test_ステータスコード503とエラーコードが正しいこと(self):
+        error = ServiceUnavailableError()
+        assert error.status_code == 503
+        assert error.error_code == "SERVICE_UNAVAILABLE"
+
+    def test_RetryAfterヘッダーが付与されること(self):
+        error = ServiceUnavailableError(retry_after=3)
+        assert error.headers == {"Retry-After": "3"}
+
+    def test_他の例外はヘッダーを持たないこと(self):
+        assert ConflictError().headers is None
+
+
+class TestRequestTimeoutError:
+    """RequestTimeoutErrorのテスト。"""
+
+    def test_ステータスコード504とエラーコードが正しいこと(self):
+        error = RequestTimeoutError()
+        assert error.status_code == 504
+        assert error.error_code == "REQUEST_TIMEOUT"
+        assert error.message == "処理がタイムアウトしました"
+
+
 class TestExceptionInheritance:
     """例外クラスの継承関係のテスト。"""
 
@@ -110,6 +138,8 @@ class TestExceptionInheritance:
             (ForbiddenError, 403),
             (NotFoundError, 404),
             (ConflictError, 409),
+            (ServiceUnavailableError, 503),
+            (RequestTimeoutError, 504),
         ],
     )
     def test_全例外クラスがAppErrorを継承していること(
@@ -0,0 +1,85 @@
+import gc
+import logging
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.leak_detector import LeakDetector, LeakTrackingAsyncSession, leak_detector
+from tests import conftest
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(conftest.TEST_DATABASE_URL)
+    yield engine
+    await engine.dispose()
+
+
+class TestConnectionTracking:
+    async def test_返却されていないコネクションが取得箇所付きで検出されること(
+        self, engine: AsyncEngine
+    ):
+        detector = LeakDetector(threshold_ms=60_000)
+        detector.install(engine)
+
+        conn = await engine.connect()
+        [held] = detector.held()
+        assert held.kind == "コネクション"
+        assert "test_返却されていないコネクションが取得箇所付きで検出されること" in (
+            held.stack
+        )
+
+        await conn.close()
+        assert detector.held() == []
+        detector.uninstall(engine)
+
+    async def test_閾値を超えて保持されたものを1回だけ警告すること(
+        self, engine: AsyncEngine, caplog
+    ):
+        detector = LeakDetector(threshold_ms=0)
+        detector.install(engine)
+
+        async with engine.connect():
+            with caplog.at_level(logging.WARNING, logger="app.core.leak_detector"):
+                assert len(detector.warn_long_held()) == 1
+                detector.warn_long_held()
+
+        assert len(caplog.records) == 1
+        assert "長時間保持されている" in caplog.records[0].getMessage()
+        detector.uninstall(engine)
+
+    async def test_reclaimでリークしたコネクションが破棄されること(
+        self, engine: AsyncEngine
+    ):
+        detector = LeakDetector(threshold_ms=60_000)
+        detector.install(engine)
+        conn = await engine.connect()
+        raw = (await conn.get_raw_connection()).driver_connection
+
+        leaks = detector.reclaim()
+
+        assert len(leaks) == 1
+        assert detector.held() == []
+        assert raw.is_closed()
+        detector.uninstall(engine)
+
+
+class TestSessionTracking:
+    async def test_closeしたセッションは追跡対象から外れること(self):
+        session = LeakTrackingAsyncSession(bind=conftest.test_engine)
+        assert any(a.kind == "セッション" for a in leak_detector.held())
+
+        await session.close()
+
+        assert all(a.kind != "セッション" for a in leak_detector.held())
+
+    async def test_closeされずに破棄されたセッションを警告すること(self, caplog):
+        session = LeakTrackingAsyncSession(bind=conftest.test_engine)
+
+        with caplog.at_level(logging.WARNING, logger="app.core.leak_detector"):
+            del session
+            gc.collect()
+
+        assert "close されずにガベージコレクトされた" in caplog.text
+        # テストのトランザクションのコネクションは取得中のため、セッションのみ確認する
+        assert all(a.kind != "セッション" for a in leak_detector.held())
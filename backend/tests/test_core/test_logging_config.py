@@ -0,0 +1,73 @@
+import io
+import json
+import logging
+import sys
+import threading
+import time
+
+from app.core.logging_config import JsonFormatter, LogQueue, dropped_records
+
+
+class _BlockingStream(io.StringIO):
+    """release されるまで書き込みを待たせる出力先。"""
+
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.released.wait()
+        return super().write(s)
+
+
+class TestJsonFormatter:
+    def test_fieldsと例外が1行のJSONに含まれること(self):
+        logger = logging.getLogger("tests.json")
+        try:
+            raise ValueError("失敗")
+        except ValueError:
+            record = logger.makeRecord(
+                "tests.json",
+                logging.ERROR,
+                __file__,
+                1,
+                "処理 %s に失敗しました",
+                ("A",),
+                exc_info=sys.exc_info(),
+                extra={"fields": {"route": "/items", "status": 500}},
+            )
+
+        line = JsonFormatter().format(record)
+
+        assert "\n" not in line
+        entry = json.loads(line)
+        assert entry["level"] == "ERROR"
+        assert entry["message"] == "処理 A に失敗しました"
+        assert entry["route"] == "/items"
+        assert entry["status"] == 500
+        assert "ValueError: 失敗" in entry["exception"]
+
+
+class TestLogQueue:
+    def test_出力が詰まってもログ出力を待たずに破棄すること(self, monkeypatch):
+        stream = _BlockingStream()
+        monkeypatch.setattr("sys.stdout", stream)
+        logger = logging.getLogger("tests.log_queue")
+        before = dropped_records.samples().get((), 0)
+        log_queue = LogQueue()
+        log_queue.start(level="INFO", fmt="json", queue_size=2)
+        try:
+            started = time.perf_counter()
+            for i in range(10):
+                logger.info("message %d", i)
+            elapsed = time.perf_counter() - started
+        finally:
+            stream.released.set()
+            log_queue.stop()
+
+        assert elapsed < 1
+        # リスナーが取り出し中の1件とキューの2件以外は破棄される
+        assert dropped_records.samples()[()] - before >= 7
+        lines = stream.getvalue().splitlines()
+        assert 1 <= len(lines) <= 3
+        assert json.loads(lines[0])["message"] == "message 0"
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from app.core.loop_monitor import LoopMonitor, event_loop_lag
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _run_monitor(monitor: LoopMonitor, *, block_seconds: float) -> None:
+    # 監視タスクが1回以上待機に入ってからブロックする
+    await asyncio.sleep(0.03)
+    _block_loop(block_seconds)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+
+class TestLoopMonitor:
+    async def test_ブロックした時間がイベントループの遅延として記録されること(self):
+        before = event_loop_lag.samples().get((), [0] * 13)
+        monitor = LoopMonitor()
+        monitor.start(interval_seconds=0.01, block_threshold_seconds=-1)
+
+        await _run_monitor(monitor, block_seconds=0.1)
+
+        after = event_loop_lag.samples()[()]
+        # 最後の要素は観測値の合計
+        assert after[-1] - before[-1] >= 0.08
+        assert monitor.snapshot() == []
+
+    async def test_デバッグモードではブロックしたスタックが集計されること(self):
+        monitor = LoopMonitor()
+        monitor.start(interval_seconds=0.01, block_threshold_seconds=0.03)
+
+        await _run_monitor(monitor, block_seconds=0.15)
+
+        [blocking] = monitor.snapshot()
+        assert blocking["count"] == 1
+        assert blocking["max_ms"] >= 120
+        assert blocking["stack"][0].startswith("_block_loop (")
+        assert any(frame.startswith("_run_monitor (") for frame in blocking["stack"])
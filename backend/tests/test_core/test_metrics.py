@@ -0,0 +1,195 @@
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import (
+    CONTENT_TYPE,
+    UNMATCHED_ROUTE,
+    MetricsMiddleware,
+    MetricsRegistry,
+    request_duration,
+    request_queries,
+)
+from app.core.security import create_access_token
+from app.models.user import UserRole
+from tests.helpers import build_client, create_user
+
+
+def _registry() -> tuple[MetricsRegistry, dict]:
+    registry = MetricsRegistry()
+    gauge_values = {"value": 3}
+    registry.histogram("latency_seconds", "処理時間", ("route",), (0.1, 1.0))
+    registry.counter("requests_total", "件数", ("route",))
+    registry.gauge("in_flight", "処理中", (), lambda: [((), gauge_values["value"])])
+    return registry, gauge_values
+
+
+def _record(registry: MetricsRegistry) -> None:
+    histogram = registry._metrics["latency_seconds"]
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 3)
+    registry._metrics["requests_total"].inc(("/a",))
+
+
+class TestMetricsRegistry:
+    async def test_ヒストグラムが累積バケットのテキスト形式で出力されること(self):
+        registry, _ = _registry()
+        _record(registry)
+
+        lines = (await registry.render()).splitlines()
+
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+        assert 'latency_seconds_count{route="/a"} 3' in lines
+        assert 'requests_total{route="/a"} 1' in lines
+        assert "in_flight 3" in lines
+
+    async def test_複数ワーカーの値が合算されゲージは稼働中のワーカーのみ出力されること(
+        self, tmp_path: Path
+    ):
+        worker, gauge_values = _registry()
+        worker.start(str(tmp_path), interval_seconds=60)
+        _record(worker)
+        gauge_values["value"] = 5
+        await worker.stop()
+        # 終了したワーカーのファイルとして扱う
+        (tmp_path / f"metrics-{os.getpid()}.json").rename(
+            tmp_path / "metrics-999999999.json"
+        )
+
+        registry, _ = _registry()
+        registry.start(str(tmp_path), interval_seconds=60)
+        _record(registry)
+        try:
+            lines = (await registry.render()).splitlines()
+        finally:
+            await registry.stop()
+
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'latency_seconds_count{route="/a"} 6' in lines
+        assert 'requests_total{route="/a"} 2' in lines
+        assert f'in_flight{{pid="{os.getpid()}"}} 3' in lines
+        assert not any('pid="999999999"' in line for line in lines)
+
+
+class TestMetricsMiddleware:
+    async def test_ルートテンプレートとステータスごとに記録されること(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            return {"id": item_id}
+
+        def _count(labels: tuple[str, ...]) -> int:
+            series = request_duration.samples().get(labels)
+            return 0 if series is None else sum(series[:-1])
+
+        matched = ("GET", "/items/{item_id}", "200")
+        unmatched = ("GET", UNMATCHED_ROUTE, "404")
+        before = _count(matched), _count(unmatched)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            await client.get("/items/1")
+            await client.get("/items/2")
+            await client.get("/unknown")
+
+        assert _count(matched) == before[0] + 2
+        assert _count(unmatched) == before[1] + 1
+
+    async def test_リクエストごとのSQL発行数が記録されること(
+        self, db_session: AsyncSession
+    ):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/queries")
+        async def run_queries():
+            for _ in range(3):
+                await db_session.execute(text("SELECT 1"))
+            return {}
+
+        labels = ("GET", "/queries")
+        before = request_queries.samples().get(labels, [0] * 12)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            await client.get("/queries")
+
+        after = request_queries.samples()[labels]
+        # テスト用のセーブポイントの発行も数えるため、3件以上のバケットに入ること
+        assert sum(after[:-1]) == sum(before[:-1]) + 1
+        assert after[:3] == before[:3]
+
+
+_METRICS_TOKEN = "scrape-token"
+
+
+@pytest.fixture
+def metrics_token(monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setattr(settings, "metrics_token", _METRICS_TOKEN)
+    return _METRICS_TOKEN
+
+
+class TestMetricsEndpoint:
+    async def test_metricsでプールとアドミッションのメトリクスが返ること(
+        self, db_session: AsyncSession, metrics_token: str
+    ):
+        user = await create_user(db_session, role=UserRole.MANAGER)
+
+        async with build_client(
+            db_session, token=create_access_token(user.id)
+        ) as client:
+            await client.get("/api/v1/users")
+            response = await client.get(
+                "/metrics", headers={"Authorization": f"Bearer {metrics_token}"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == CONTENT_TYPE
+        body = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/api/v1/users",status="200"}'
+        ) in body
+        assert "db_pool_checked_out " in body
+        assert 'admission_waiting{budget="read"} ' in body
+        assert 'function_cache_total{cache="report_list_statements",result="hit"}' in (
+            body
+        )
+        assert 'sqlalchemy_compiled_cache_total{result="hit"}' in body
+        assert "# TYPE password_hash_duration_seconds histogram" in body
+
+    async def test_トークンが未設定の場合は404を返すこと(
+        self, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "metrics_token", None)
+
+        async with build_client(db_session) as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_トークンが一致しない場合は401を返すこと(
+        self, db_session: AsyncSession, metrics_token: str
+    ):
+        async with build_client(db_session) as client:
+            missing = await client.get("/metrics")
+            wrong = await client.get(
+                "/metrics", headers={"Authorization": "Bearer wrong-token"}
+            )
+
+        assert missing.status_code == status.HTTP_401_UNAUTHORIZED
+        assert wrong.status_code == status.HTTP_401_UNAUTHORIZED
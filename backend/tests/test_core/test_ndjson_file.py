@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+from app.core.ndjson_file import NdjsonFileWriter
+
+
+class TestNdjsonFileWriter:
+    def test_停止時にキューの記録を1行ずつ書き出すこと(self, tmp_path: Path):
+        path = tmp_path / "out" / "records.ndjson"
+        writer = NdjsonFileWriter()
+        writer.start(str(path), max_bytes=1024 * 1024, backup_count=1)
+
+        writer.write({"name": "日報", "n": 1})
+        writer.write({"name": "顧客", "n": 2})
+        writer.stop()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"name": "日報", "n": 1},
+            {"name": "顧客", "n": 2},
+        ]
+        assert "日報" in lines[0]
+        assert not writer.active
+
+    def test_開始前の書き込みは無視すること(self, tmp_path: Path):
+        writer = NdjsonFileWriter()
+
+        writer.write({"n": 1})
+        writer.stop()
+
+        assert not writer.active
+        assert list(tmp_path.iterdir()) == []
+
+    def test_上限サイズを超えるとローテーションすること(self, tmp_path: Path):
+        path = tmp_path / "records.ndjson"
+        writer = NdjsonFileWriter()
+        writer.start(str(path), max_bytes=64, backup_count=1)
+
+        for n in range(10):
+            writer.write({"n": n, "padding": "x" * 20})
+        writer.stop()
+
+        assert (tmp_path / "records.ndjson.1").exists()
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+from jose import jwt
+
+from app.core.config import settings
+from app.core.deadline import DeadlineRoute
+from app.core.profiling import (
+    PROFILE_FILE_HEADER,
+    WAITING,
+    create_profiling_token,
+    verify_profiling_token,
+)
+from app.core.security import create_access_token
+
+
+def _busy_loop(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _build_app() -> FastAPI:
+    test_app = FastAPI()
+    router = APIRouter(route_class=DeadlineRoute)
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        _busy_loop(0.1)
+        await asyncio.sleep(0.05)
+        return {"id": item_id}
+
+    test_app.include_router(router)
+    return test_app
+
+
+async def _get(headers: dict[str, str], params: dict | None = None) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=_build_app()), base_url="http://test"
+    ) as client:
+        return await client.get("/items/1", headers=headers, params=params)
+
+
+@pytest.fixture
+def profiling(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    return tmp_path
+
+
+class TestProfilingToken:
+    def test_発行したトークンが検証に成功すること(self):
+        assert verify_profiling_token(create_profiling_token(minutes=1)) is True
+
+    def test_アクセストークンや期限切れのトークンは検証に失敗すること(self):
+        expired = jwt.encode(
+            {"purpose": "profile", "exp": int(time.time()) - 1},
+            settings.secret_key,
+            algorithm=settings.algorithm,
+        )
+
+        assert verify_profiling_token(create_access_token(1)) is False
+        assert verify_profiling_token(expired) is False
+        assert verify_profiling_token("invalid") is False
+
+
+class TestProfileHandler:
+    async def test_downloadを指定するとcollapsed形式のプロファイルが返ること(
+        self, profiling: Path
+    ):
+        token = create_profiling_token(minutes=1)
+
+        response = await _get({"X-Profile": "download", "X-Profile-Token": token})
+
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        lines = response.text.splitlines()
+        assert lines
+        assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+        busy = [line for line in lines if "_busy_loop" in line]
+        assert busy
+        assert all("get_item" in line for line in busy)
+        # asyncio.sleep の間はハンドラのスタックではなく待機中として数える
+        assert any(line.startswith(f"{WAITING} ") for line in lines)
+
+    async def test_クエリパラメータで要求するとファイルに保存されること(
+        self, profiling: Path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "profiling_require_token", False)
+
+        response = await _get({}, params={"profile": "1"})
+
+        assert response.status_code == 200
+        assert response.json() == {"id": 1}
+        saved = profiling / response.headers[PROFILE_FILE_HEADER]
+        assert saved.name.endswith("-GET-items-item-id.folded")
+        assert "_busy_loop" in saved.read_text(encoding="utf-8")
+
+    async def test_トークンがない場合や無効な環境ではプロファイルしないこと(
+        self, profiling: Path, monkeypatch
+    ):
+        response = await _get({"X-Profile": "download"})
+
+        assert response.json() == {"id": 1}
+        assert PROFILE_FILE_HEADER not in response.headers
+
+        monkeypatch.setattr(settings, "profiling_enabled", False)
+        token = create_profiling_token(minutes=1)
+        response = await _get({"X-Profile": "download", "X-Profile-Token": token})
+
+        assert response.json() == {"id": 1}
+        assert list(profiling.iterdir()) == []
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.query_metrics import QueryMetrics, count_queries
+from tests import conftest
+
+
+class TestQueryMetrics:
+    async def test_コンパイル済みキャッシュのヒット率が集計されること(
+        self, db_session: AsyncSession
+    ):
+        metrics = QueryMetrics()
+        metrics.install(conftest.test_engine)
+        try:
+            for value in (1, 2, 3):
+                await db_session.execute(
+                    text("SELECT CAST(:value AS INTEGER)"), {"value": value}
+                )
+            conn = await db_session.connection()
+            await conn.exec_driver_sql("SELECT 1")
+        finally:
+            metrics.uninstall(conftest.test_engine)
+
+        snapshot = metrics.cache_snapshot()
+        # 初回のみコンパイルされ、2回目以降はキャッシュが使われる
+        assert snapshot["misses"] <= 1
+        assert snapshot["hits"] >= 2
+        assert snapshot["uncached"] >= 1
+        assert 0 < snapshot["hit_rate"] <= 1
+
+    async def test_失敗したクエリの開始時刻が残らないこと(self):
+        metrics = QueryMetrics()
+        metrics.install(conftest.test_engine)
+        try:
+            async with conftest.test_engine.connect() as conn:
+                for _ in range(3):
+                    with pytest.raises(DBAPIError):
+                        await conn.execute(text("SELECT 1 / 0"))
+                    await conn.rollback()
+                await conn.execute(text("SELECT 1"))
+                starts = conn.info["query_metrics_start"]
+        finally:
+            metrics.uninstall(conftest.test_engine)
+
+        assert starts == []
+
+    def test_実行がなければヒット率はNoneであること(self):
+        assert QueryMetrics().cache_snapshot() == {
+            "hits": 0,
+            "misses": 0,
+            "uncached": 0,
+            "hit_rate": None,
+        }
+
+
+class TestCountQueries:
+    async def test_ブロック内で実行されたSQLのみ記録されること(
+        self, db_session: AsyncSession
+    ):
+        await db_session.execute(text("SELECT 1"))
+
+        with count_queries() as counter:
+            await db_session.execute(text("SELECT 2"))
+            await db_session.execute(text("SELECT 3"))
+        await db_session.execute(text("SELECT 4"))
+
+        assert counter.statements == ["SELECT 2", "SELECT 3"]
+
+    async def test_ブロック内で生成したタスクのSQLも記録されること(
+        self, db_session: AsyncSession
+    ):
+        async def _query() -> None:
+            await db_session.execute(text("SELECT 1"))
+
+        # トランザクション開始時の SQL を含めないよう、先に開始しておく
+        await db_session.execute(text("SELECT 1"))
+        with count_queries() as counter:
+            await asyncio.create_task(_query())
+
+        assert counter.count == 1
+
+    async def test_他のタスクのSQLは記録されないこと(self, db_session: AsyncSession):
+        started = asyncio.Event()
+
+        async def _other_request() -> None:
+            await started.wait()
+            async with conftest.test_async_session() as other:
+                await other.execute(text("SELECT 1"))
+
+        other_task = asyncio.create_task(_other_request())
+        with count_queries() as counter:
+            started.set()
+            await other_task
+
+        assert counter.count == 0
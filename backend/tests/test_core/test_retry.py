@@ -0,0 +1,189 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import retry
+from app.core.exceptions import ServiceUnavailableError
+from app.core.retry import (
+    RetryBudget,
+    TransientReason,
+    classify_transient_error,
+    retry_stats,
+    transient_retry,
+)
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from tests.helpers import create_user
+
+
+class _DriverError(Exception):
+    def __init__(self, sqlstate: str):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def _db_error(sqlstate: str) -> DBAPIError:
+    return DBAPIError("SELECT 1", None, _DriverError(sqlstate))
+
+
+class _FlakyService:
+    """指定回数だけ一時的な障害を起こすテスト用サービス。"""
+
+    def __init__(self, user_repository: UserRepository, failures: list[Exception]):
+        self.user_repository = user_repository
+        self.failures = failures
+        self.calls = 0
+
+    async def _run(self, current_user: User) -> str:
+        self.calls += 1
+        await self.user_repository.db.execute(select(User.id))
+        if self.failures:
+            raise self.failures.pop(0)
+        return current_user.name
+
+    @transient_retry()
+    async def read(self, current_user: User) -> str:
+        return await self._run(current_user)
+
+    @transient_retry(idempotent=False)
+    async def write(self, current_user: User) -> str:
+        return await self._run(current_user)
+
+
+@pytest.fixture(autouse=True)
+def _reset_retry_state(monkeypatch):
+    monkeypatch.setattr(retry, "retry_budget", RetryBudget(ratio=0.1, min_tokens=10))
+    monkeypatch.setattr(retry.settings, "db_retry_base_delay_ms", 1)
+    retry_stats.clear()
+    yield
+    retry_stats.clear()
+
+
+class TestClassifyTransientError:
+    @pytest.mark.parametrize(
+        ("exc", "expected"),
+        [
+            (_db_error("40001"), TransientReason.SERIALIZATION_FAILURE),
+            (_db_error("40P01"), TransientReason.DEADLOCK),
+            (_db_error("08006"), TransientReason.CONNECTION),
+            (_db_error("57P01"), TransientReason.CONNECTION),
+            (ConnectionResetError(), TransientReason.CONNECTION),
+            (
+                DBAPIError("SELECT 1", None, Exception(), connection_invalidated=True),
+                TransientReason.CONNECTION,
+            ),
+        ],
+    )
+    def test_一時的な障害が種別ごとに判定されること(self, exc, expected):
+        assert classify_transient_error(exc) == expected
+
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            IntegrityError("INSERT", None, _DriverError("23505")),
+            _db_error("57014"),
+            ValueError(),
+        ],
+    )
+    def test_一時的でない例外は判定対象外であること(self, exc):
+        assert classify_transient_error(exc) is None
+
+
+class TestRetryBudget:
+    def test_トークンがなくなると再実行できないこと(self):
+        budget = RetryBudget(ratio=0.5, min_tokens=1)
+
+        assert budget.try_withdraw() is True
+        assert budget.try_withdraw() is False
+        budget.deposit()
+        budget.deposit()
+        assert budget.try_withdraw() is True
+
+
+class TestTransientRetry:
+    async def test_デッドロック後に再実行して成功すること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        service = _FlakyService(UserRepository(db_session), [_db_error("40P01")])
+
+        result = await service.read(user)
+
+        # ロールバックで失効した引数のORMインスタンスも再読み込みされている
+        assert result == "田中太郎"
+        assert service.calls == 2
+        outcomes = {s["outcome"]: s["count"] for s in retry_stats.snapshot()}
+        assert outcomes == {"deadlock:retried": 1, "recovered": 1}
+
+    async def test_再実行回数の上限を超えると503エラーになること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        failures = [ConnectionResetError() for _ in range(5)]
+        service = _FlakyService(UserRepository(db_session), failures)
+
+        with pytest.raises(ServiceUnavailableError):
+            await service.read(user)
+
+        assert service.calls == retry.settings.db_retry_max_attempts
+
+    async def test_再実行前のロールバックの失敗も試行回数に数えること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        user = await create_user(db_session)
+        service = _FlakyService(UserRepository(db_session), [_db_error("40P01")])
+        rollback = db_session.rollback
+        rollback_failures = [ConnectionResetError()]
+
+        async def flaky_rollback():
+            await rollback()
+            if rollback_failures:
+                raise rollback_failures.pop(0)
+
+        monkeypatch.setattr(db_session, "rollback", flaky_rollback)
+
+        result = await service.read(user)
+
+        assert result == "田中太郎"
+        assert service.calls == 2
+        outcomes = {s["outcome"]: s["count"] for s in retry_stats.snapshot()}
+        assert outcomes == {
+            "deadlock:retried": 1,
+            "connection:retried": 1,
+            "recovered": 1,
+        }
+
+    async def test_冪等でない処理は再実行されないこと(self, db_session: AsyncSession):
+        user = await create_user(db_session)
+        service = _FlakyService(UserRepository(db_session), [_db_error("40001")])
+
+        with pytest.raises(ServiceUnavailableError):
+            await service.write(user)
+
+        assert service.calls == 1
+        [stat] = retry_stats.snapshot()
+        assert stat["outcome"] == "serialization_failure:not_idempotent"
+
+    async def test_リトライ予算がなければ再実行されないこと(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(retry, "retry_budget", RetryBudget(ratio=0, min_tokens=0))
+        user = await create_user(db_session)
+        service = _FlakyService(UserRepository(db_session), [_db_error("40P01")])
+
+        with pytest.raises(ServiceUnavailableError):
+            await service.read(user)
+
+        assert service.calls == 1
+
+    async def test_一時的でない例外はそのまま送出されること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        service = _FlakyService(UserRepository(db_session), [ValueError("boom")])
+
+        with pytest.raises(ValueError, match="boom"):
+            await service.read(user)
+
+        assert service.calls == 1
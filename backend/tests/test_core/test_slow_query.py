@@ -0,0 +1,147 @@
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.slow_query import SlowQueryLog, fingerprint_sql, normalize_sql
+from tests.conftest import TEST_DATABASE_URL, test_engine
+
+
+class TestNormalizeSql:
+    def test_バインドパラメータとリテラルが除去されること(self):
+        sql = (
+            "SELECT * FROM daily_reports WHERE salesperson_id = $1::INTEGER "
+            "AND status = 'DRAFT' LIMIT 20"
+        )
+
+        assert normalize_sql(sql) == (
+            "SELECT * FROM daily_reports WHERE salesperson_id = ?::INTEGER "
+            "AND status = ? LIMIT ?"
+        )
+
+    def test_識別子中の数字は除去されないこと(self):
+        sql = "SELECT anon_1.id FROM (SELECT id FROM users) AS anon_1"
+
+        assert normalize_sql(sql) == sql
+
+    def test_INリストとVALUESが畳み込まれること(self):
+        assert normalize_sql("SELECT 1 WHERE id IN ($1, $2, $3)") == (
+            "SELECT ? WHERE id IN (...)"
+        )
+        assert normalize_sql("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == (
+            "INSERT INTO t (a, b) VALUES (...)"
+        )
+
+    def test_パラメータ値が異なっても同じフィンガープリントになること(self):
+        assert fingerprint_sql("SELECT * FROM users WHERE id = $1") == (
+            fingerprint_sql("SELECT  *  FROM users\nWHERE id = $2")
+        )
+
+    def test_WHERE句の組み合わせが異なると別のフィンガープリントになること(self):
+        assert fingerprint_sql(
+            "SELECT * FROM daily_reports WHERE salesperson_id = $1"
+        ) != fingerprint_sql(
+            "SELECT * FROM daily_reports WHERE salesperson_id = $1 AND status = $2"
+        )
+
+
+class TestSlowQueryLog:
+    def test_件数とパーセンタイルが集計されること(self):
+        log = SlowQueryLog(threshold_ms=0, explain=False)
+
+        for duration in range(1, 101):
+            log.record("SELECT * FROM users WHERE id = $1", (duration,), duration)
+
+        [stats] = log.snapshot()
+        assert stats["count"] == 100
+        assert stats["p50_ms"] == 50
+        assert stats["p95_ms"] == 95
+        assert stats["max_ms"] == 100
+        assert stats["statement"] == "SELECT * FROM users WHERE id = ?"
+
+    def test_最大実行時間の降順で返されること(self):
+        log = SlowQueryLog(threshold_ms=0, explain=False)
+        log.record("SELECT 1", None, 10)
+        log.record("SELECT * FROM users", None, 30)
+
+        snapshot = log.snapshot()
+
+        assert [s["max_ms"] for s in snapshot] == [30, 10]
+
+    def test_clearで集計が破棄されること(self):
+        log = SlowQueryLog(threshold_ms=0, explain=False)
+        log.record("SELECT 1", None, 10)
+
+        log.clear()
+
+        assert log.snapshot() == []
+
+    async def test_閾値を超えたクエリの実行計画が別コネクションで取得されること(self):
+        log = SlowQueryLog(threshold_ms=0, explain_url=TEST_DATABASE_URL)
+        log.install(test_engine)
+        try:
+            async with test_engine.connect() as conn:
+                await conn.execute(
+                    text("SELECT id FROM users WHERE email = :email"),
+                    {"email": "tanaka@example.com"},
+                )
+            await log.wait_for_explains()
+        finally:
+            log.uninstall(test_engine)
+
+        [stats] = [s for s in log.snapshot() if s["statement"].startswith("SELECT id")]
+        assert stats["count"] == 1
+        plan = stats["last_plan"][0]
+        assert "Plan" in plan
+        assert "Execution Time" in plan
+
+    async def test_実行計画の取得がstatement_timeoutで打ち切られること(self):
+        log = SlowQueryLog(threshold_ms=0, explain_url=TEST_DATABASE_URL)
+        started = time.perf_counter()
+        try:
+            log.record("SELECT pg_sleep(5)", (), 5000.0)
+            await log.wait_for_explains()
+        finally:
+            await log.close()
+
+        assert time.perf_counter() - started < 4
+        [stats] = log.snapshot()
+        assert stats["last_plan"] is None
+
+    async def test_closeでEXPLAIN用のエンジンが破棄されること(self):
+        log = SlowQueryLog(threshold_ms=0, explain_url=TEST_DATABASE_URL)
+        log.record("SELECT 1", (), 1.0)
+
+        await log.close()
+
+        assert log.snapshot()[0]["last_plan"] is not None
+        assert log._explain_engine is None
+
+    async def test_閾値未満のクエリは記録されないこと(self):
+        log = SlowQueryLog(threshold_ms=60_000, explain=False)
+        log.install(test_engine)
+        try:
+            async with test_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            log.uninstall(test_engine)
+
+        assert log.snapshot() == []
+
+    async def test_失敗したクエリの開始時刻が残らないこと(self):
+        log = SlowQueryLog(threshold_ms=0, explain=False)
+        log.install(test_engine)
+        try:
+            async with test_engine.connect() as conn:
+                for _ in range(3):
+                    with pytest.raises(DBAPIError):
+                        await conn.execute(text("SELECT 1 / 0"))
+                    await conn.rollback()
+                await conn.execute(text("SELECT 1"))
+                starts = conn.info["slow_query_start"]
+        finally:
+            log.uninstall(test_engine)
+
+        assert starts == []
+        assert [s["statement"] for s in log.snapshot()] == ["SELECT ?"]
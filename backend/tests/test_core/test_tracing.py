@@ -0,0 +1,139 @@
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.tracing import (
+    install_sql_tracing,
+    span_exporter,
+    uninstall_sql_tracing,
+)
+from tests import conftest
+from tests.helpers import build_client, create_customer, create_report, create_user
+
+_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+_PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def traces(tmp_path: Path, monkeypatch) -> Iterator[Path]:
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    path = tmp_path / "traces.ndjson"
+    span_exporter.start(str(path), max_bytes=10 * 1024 * 1024, backup_count=1)
+    install_sql_tracing(conftest.test_engine)
+    try:
+        yield path
+    finally:
+        uninstall_sql_tracing(conftest.test_engine)
+        span_exporter.stop()
+
+
+def _read_spans(path: Path) -> list[list[dict]]:
+    """書き出されたトレースごとのスパンの一覧を返す。"""
+    span_exporter.stop()
+    result = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        request = json.loads(line)
+        (resource_spans,) = request["resourceSpans"]
+        (scope_spans,) = resource_spans["scopeSpans"]
+        result.append(scope_spans["spans"])
+    return result
+
+
+def _attributes(span: dict) -> dict:
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+class TestTracing:
+    async def test_ルートからSQLまでのスパンが親子関係つきで書き出されること(
+        self, db_session: AsyncSession, traces: Path
+    ):
+        user = await create_user(db_session)
+        customer = await create_customer(db_session)
+        report = await create_report(db_session, user)
+
+        async with build_client(
+            db_session, token=create_access_token(user.id)
+        ) as client:
+            response = await client.put(
+                f"/api/v1/reports/{report.id}",
+                json={
+                    "report_date": str(report.report_date),
+                    "problem": "更新後の課題",
+                    "plan": "更新後の計画",
+                    "status": "DRAFT",
+                    "visit_records": [
+                        {
+                            "customer_id": customer.id,
+                            "visit_content": "訪問",
+                            "visited_at": "10:00",
+                        }
+                    ],
+                },
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        (spans,) = _read_spans(traces)
+        by_id = {span["spanId"]: span for span in spans}
+        by_name = {span["name"]: span for span in spans}
+
+        def parent_name(name: str) -> str:
+            return by_id[by_name[name]["parentSpanId"]]["name"]
+
+        root = by_name["PUT /api/v1/reports/{report_id}"]
+        assert "parentSpanId" not in root
+        assert {span["traceId"] for span in spans} == {root["traceId"]}
+        assert _attributes(root)["http.status_code"] == "200"
+        assert parent_name("handler update_report") == root["name"]
+        assert parent_name("endpoint update_report") == "handler update_report"
+        assert parent_name("ReportService.update") == "endpoint update_report"
+        assert parent_name("_build_create_update_response") == (
+            "endpoint update_report"
+        )
+        repository_spans = [
+            span
+            for span in spans
+            if span["name"].startswith(("ReportRepository.", "VisitRecordRepository."))
+        ]
+        assert repository_spans
+        assert all(
+            by_id[span["parentSpanId"]]["name"] == "ReportService.update"
+            for span in repository_spans
+        )
+        sql_spans = [span for span in spans if span["name"].startswith("SQL ")]
+        assert sql_spans
+        assert all(span["kind"] == 3 for span in sql_spans)
+        assert any(
+            by_id[span["parentSpanId"]]["name"].startswith("VisitRecordRepository.")
+            and _attributes(span)["db.statement"].startswith("INSERT INTO visit_")
+            for span in sql_spans
+        )
+
+    async def test_traceparentのトレースIDとサンプリング指定を引き継ぐこと(
+        self, db_session: AsyncSession, traces: Path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "tracing_sample_rate", 0.0)
+        user = await create_user(db_session)
+
+        async with build_client(
+            db_session, token=create_access_token(user.id)
+        ) as client:
+            await client.get(
+                "/api/v1/auth/me",
+                headers={"traceparent": f"00-{_TRACE_ID}-{_PARENT_ID}-01"},
+            )
+            await client.get(
+                "/api/v1/auth/me",
+                headers={"traceparent": f"00-{_TRACE_ID}-{_PARENT_ID}-00"},
+            )
+            await client.get("/api/v1/auth/me")
+
+        (spans,) = _read_spans(traces)
+        assert {span["traceId"] for span in spans} == {_TRACE_ID}
+        root = next(span for span in spans if span["kind"] == 2)
+        assert root["parentSpanId"] == _PARENT_ID
@@ -0,0 +1,123 @@
+import hashlib
+import json
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.security import COOKIE_NAME, create_access_token
+from app.core.traffic_capture import (
+    REDACTED,
+    TrafficCaptureMiddleware,
+    TrafficRecorder,
+)
+
+
+def _app(recorder: TrafficRecorder) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TrafficCaptureMiddleware, recorder=recorder)
+
+    @app.post("/api/v1/items/{item_id}", status_code=201)
+    async def create_item(item_id: int, payload: dict):
+        return {"id": item_id}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "traffic" / "traffic.ndjson"
+
+
+@pytest.fixture
+async def recorder(path: Path) -> AsyncGenerator[TrafficRecorder]:
+    recorder = TrafficRecorder()
+    recorder.start(str(path), max_bytes=1024 * 1024, backup_count=1)
+    yield recorder
+    recorder.stop()
+
+
+async def _post(recorder: TrafficRecorder, body: dict, **kwargs) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=_app(recorder)), base_url="http://test"
+    ) as client:
+        return await client.post("/api/v1/items/7?q=abc", json=body, **kwargs)
+
+
+def _records(recorder: TrafficRecorder, path: Path) -> list[dict]:
+    recorder.stop()
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestTrafficCaptureMiddleware:
+    async def test_パスワードとCookieを除いたリクエストの内容が記録されること(
+        self, recorder: TrafficRecorder, path: Path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "traffic_capture_sample_rate", 1.0)
+        token = create_access_token(42)
+
+        response = await _post(
+            recorder,
+            {"email": "tanaka@example.com", "password": "secret"},
+            headers={"Cookie": f"{COOKIE_NAME}={token}"},
+        )
+
+        assert response.status_code == 201
+        [record] = _records(recorder, path)
+        assert record["method"] == "POST"
+        assert record["path"] == "/api/v1/items/7"
+        assert record["route"] == "/api/v1/items/{item_id}"
+        assert record["query"] == "q=abc"
+        assert record["user_id"] == 42
+        assert record["status"] == 201
+        assert record["body"] == {"email": "tanaka@example.com", "password": REDACTED}
+        assert record["duration_ms"] >= 0
+        assert "secret" not in path.read_text(encoding="utf-8")
+        assert token not in path.read_text(encoding="utf-8")
+
+    async def test_本文を記録しない設定ではSHA256のみ記録されること(
+        self, recorder: TrafficRecorder, path: Path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "traffic_capture_sample_rate", 1.0)
+        monkeypatch.setattr(settings, "traffic_capture_bodies", False)
+
+        await _post(recorder, {"name": "テスト"})
+
+        [record] = _records(recorder, path)
+        assert "body" not in record
+        sent = httpx.Request("POST", "http://test", json={"name": "テスト"}).content
+        assert record["body_sha256"] == hashlib.sha256(sent).hexdigest()
+
+    async def test_サンプリング対象外とAPI以外のリクエストは記録されないこと(
+        self, recorder: TrafficRecorder, path: Path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "traffic_capture_sample_rate", 0.0)
+        await _post(recorder, {"name": "テスト"})
+
+        monkeypatch.setattr(settings, "traffic_capture_sample_rate", 1.0)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=_app(recorder)), base_url="http://test"
+        ) as client:
+            await client.get("/health")
+
+        assert _records(recorder, path) == []
+
+    async def test_記録を開始していない場合は何も記録されないこと(
+        self, path: Path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "traffic_capture_sample_rate", 1.0)
+        recorder = TrafficRecorder()
+
+        response = await _post(recorder, {"name": "テスト"})
+
+        assert response.status_code == 201
+        assert not path.exists()
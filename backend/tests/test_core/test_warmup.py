@@ -0,0 +1,99 @@
+import httpx
+import pytest
+from fastapi import status
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.warmup import Warmup, _open_pool_connections, warmup
+from app.main import app
+from tests import conftest
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+class TestWarmup:
+    async def test_ウォームアップが完了し所要時間が記録されること(self):
+        target = Warmup()
+
+        await target.run(
+            app,
+            db_engine=conftest.test_engine,
+            session_factory=conftest.test_async_session,
+        )
+
+        assert target.ready is True
+        assert target.duration_ms is not None
+        assert target.duration_ms > 0
+
+    async def test_指定数のプール接続が確立されること(self, monkeypatch):
+        monkeypatch.setattr("app.core.warmup.settings.warmup_pool_connections", 3)
+        await conftest.test_engine.dispose()
+
+        await Warmup().run(
+            app,
+            db_engine=conftest.test_engine,
+            session_factory=conftest.test_async_session,
+        )
+
+        assert conftest.test_engine.pool.checkedin() == 3
+
+    async def test_一部の接続に失敗しても確立した接続はプールに戻ること(self):
+        db_engine = create_async_engine(conftest.TEST_DATABASE_URL, pool_size=3)
+        connect = db_engine.connect
+        calls = 0
+
+        class _FailingConnection:
+            async def start(self):
+                raise ConnectionError("DBに接続できません")
+
+        class _FlakyEngine:
+            def connect(self):
+                nonlocal calls
+                calls += 1
+                return _FailingConnection() if calls == 2 else connect()
+
+        try:
+            with pytest.raises(ConnectionError):
+                await _open_pool_connections(_FlakyEngine(), 3)
+
+            assert db_engine.pool.checkedout() == 0
+            assert db_engine.pool.checkedin() == 2
+        finally:
+            await db_engine.dispose()
+
+    async def test_失敗した場合は準備中のまま再試行が予約されること(self, monkeypatch):
+        target = Warmup()
+
+        async def _fail(application):
+            raise ConnectionError("DBに接続できません")
+
+        monkeypatch.setattr(target, "run", _fail)
+
+        await target.start(app)
+
+        assert target.ready is False
+        assert target._retry_task is not None
+        await target.stop()
+
+
+class TestHealthCheck:
+    async def test_ウォームアップ完了前は503が返ること(self, monkeypatch):
+        monkeypatch.setattr(warmup, "ready", False)
+
+        async with _build_client() as client:
+            response = await client.get("/health")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json() == {"status": "starting"}
+
+    async def test_ウォームアップ完了後は200が返ること(self, monkeypatch):
+        monkeypatch.setattr(warmup, "ready", True)
+
+        async with _build_client() as client:
+            response = await client.get("/health")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "ok", "database": "closed"}
@@ -0,0 +1,221 @@
+"""実行計画の回帰テスト用の設定・フィクスチャ。
+
+本番相当の件数のデータを専用DBに投入し、リポジトリ・読み取りモデルが発行する
+SELECT の実行計画（EXPLAIN (FORMAT JSON)）を取得する。投入に時間がかかるため、
+環境変数 PLAN_DATABASE_URL を指定した場合のみ実行する。
+
+    PLAN_DATABASE_URL=<テスト用DBとは別のDBのURL> uv run pytest tests/test_plans
+
+データは次の規模で生成する（テストセッションの開始時に毎回作り直す）。
+
+- 担当者 200人・上長 10人
+- 顧客 50,000件
+- 日報 担当者ごとに過去5年分の平日（約26万件）
+- 訪問記録 日報ごとに3〜7件（平均5件）
+- コメント 日報3件に1件
+"""
+
+import json
+import os
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import psycopg2
+import pytest
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import Base
+from tests.conftest import _extract_sync_params_from_url
+
+PLAN_DATABASE_URL = os.environ.get("PLAN_DATABASE_URL")
+
+SALESPEOPLE = 200
+MANAGERS = 10
+CUSTOMERS = 50_000
+YEARS = 5
+
+_SEED_SQL = [
+    f"""
+    INSERT INTO users (name, email, password_hash, role)
+    SELECT '担当' || i, 'sales' || i || '@example.com', 'x', 'SALES'
+    FROM generate_series(1, {SALESPEOPLE}) AS i
+    """,
+    f"""
+    INSERT INTO users (name, email, password_hash, role)
+    SELECT '上長' || i, 'manager' || i || '@example.com', 'x', 'MANAGER'
+    FROM generate_series(1, {MANAGERS}) AS i
+    """,
+    f"""
+    INSERT INTO customers (company_name, contact_name, phone, email)
+    SELECT '顧客' || lpad(i::text, 5, '0') || '株式会社', '担当者' || i,
+           '03-0000-' || lpad((i % 10000)::text, 4, '0'),
+           'customer' || i || '@example.com'
+    FROM generate_series(1, {CUSTOMERS}) AS i
+    """,
+    # 直近2週間は未提出・未確認を混在させ、それ以前は確認済みとする
+    f"""
+    INSERT INTO daily_reports
+        (salesperson_id, report_date, problem, plan, status, submitted_at)
+    SELECT u.id, d::date, '課題', '計画',
+           CASE
+               WHEN d < current_date - 14 THEN 'REVIEWED'
+               WHEN (u.id + extract(day FROM d)::int) % 3 = 0 THEN 'DRAFT'
+               WHEN (u.id + extract(day FROM d)::int) % 3 = 1 THEN 'SUBMITTED'
+               ELSE 'REVIEWED'
+           END::reportstatus,
+           CASE
+               WHEN d >= current_date - 14
+                    AND (u.id + extract(day FROM d)::int) % 3 = 0 THEN NULL
+               ELSE d + interval '18 hours'
+           END
+    FROM users AS u
+    CROSS JOIN generate_series(
+        current_date - interval '{YEARS} years', current_date, interval '1 day'
+    ) AS d
+    WHERE u.role = 'SALES' AND extract(isodow FROM d) < 6
+    """,
+    """
+    INSERT INTO visit_records
+        (daily_report_id, customer_id, visit_content, visited_at, visit_order)
+    SELECT r.id, c.min_id + (r.id * 7919 + n * 104729) % c.total, '訪問内容',
+           timestamp '1970-01-01 09:00' + n * interval '1 hour', n
+    FROM daily_reports AS r
+    CROSS JOIN (SELECT min(id) AS min_id, count(*) AS total FROM customers) AS c
+    CROSS JOIN LATERAL generate_series(1, 3 + r.id % 5) AS n
+    """,
+    """
+    INSERT INTO comments (daily_report_id, manager_id, target, content)
+    SELECT r.id, m.min_id + r.id % m.total,
+           CASE WHEN r.id % 2 = 0 THEN 'PROBLEM' ELSE 'PLAN' END::commenttarget,
+           'コメント'
+    FROM daily_reports AS r
+    CROSS JOIN (
+        SELECT min(id) AS min_id, count(*) AS total FROM users WHERE role = 'MANAGER'
+    ) AS m
+    WHERE r.id % 3 = 0 AND r.status <> 'DRAFT'
+    """,
+]
+
+
+def _create_database_if_missing(url: str) -> None:
+    params = _extract_sync_params_from_url(url)
+    dbname = params.pop("dbname")
+    conn = psycopg2.connect(**params, dbname="postgres")
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (dbname,))
+        if not cur.fetchone():
+            cur.execute(f"CREATE DATABASE {dbname}")
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def db_transaction():
+    """専用DBを使うため、テスト用DBのトランザクションは開始しない。"""
+    yield
+
+
+@pytest.fixture(scope="session")
+def plan_database() -> str:
+    """専用DBのスキーマを作り直してデータを投入し、統計情報を更新する。"""
+    if PLAN_DATABASE_URL is None:
+        pytest.skip("PLAN_DATABASE_URL が未設定のため実行計画の検証を省略します")
+    _create_database_if_missing(PLAN_DATABASE_URL)
+
+    sync_engine = create_engine(
+        PLAN_DATABASE_URL.replace("+asyncpg", "+psycopg2"),
+        poolclass=NullPool,
+        client_encoding="utf8",
+    )
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        # 剰余演算子の % をパラメータの書式と解釈させないため、DBAPI で直接実行する
+        cursor = conn.connection.cursor()
+        for sql in _SEED_SQL:
+            cursor.execute(sql)
+    # 可視性マップを更新し、本番と同様に Index Only Scan を選べるようにする
+    with sync_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM ANALYZE")
+    sync_engine.dispose()
+    return PLAN_DATABASE_URL
+
+
+@dataclass
+class QueryPlan:
+    """1つのSELECT文の実行計画。"""
+
+    statement: str
+    root: dict[str, Any]
+
+    @property
+    def total_cost(self) -> float:
+        return self.root["Total Cost"]
+
+    def nodes(self) -> Iterator[dict[str, Any]]:
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.get("Plans", []))
+
+    def seq_scanned_tables(self) -> set[str]:
+        return {
+            node["Relation Name"]
+            for node in self.nodes()
+            if node["Node Type"] == "Seq Scan"
+        }
+
+    def index_names(self) -> set[str]:
+        return {node["Index Name"] for node in self.nodes() if "Index Name" in node}
+
+    def describe(self) -> str:
+        return f"{self.statement}\n\n{json.dumps(self.root, indent=2)}"
+
+
+ExplainQueries = Callable[
+    [Callable[[AsyncSession], Awaitable[Any]]], Awaitable[list[QueryPlan]]
+]
+
+
+@pytest.fixture
+async def explain_queries(plan_database: str) -> AsyncGenerator[ExplainQueries]:
+    """処理の中で発行されたSELECTを、同じバインド値で EXPLAIN する。
+
+    リポジトリ・読み取りモデルを実際に呼び出して文を取得するため、
+    検索条件の組み合わせごとに組み立てられる文をそのまま検証できる。
+    """
+    engine = create_async_engine(plan_database, poolclass=NullPool)
+
+    async def _explain(
+        operation: Callable[[AsyncSession], Awaitable[Any]],
+    ) -> list[QueryPlan]:
+        captured: list[tuple[str, Any]] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            async with AsyncSession(engine) as session:
+                await operation(session)
+                plans = []
+                conn = await session.connection()
+                for statement, parameters in captured:
+                    result = await conn.exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                    )
+                    [explained] = result.scalar_one()
+                    plans.append(QueryPlan(statement, explained["Plan"]))
+                await session.rollback()
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+        return plans
+
+    yield _explain
+    await engine.dispose()
@@ -0,0 +1,139 @@
+"""リポジトリ・読み取りモデルが発行するSELECTの実行計画の回帰テスト。
+
+検索条件の組み合わせごとに、次を検証する。
+
+- 日報・訪問記録・コメントを Seq Scan しないこと（インデックスのある条件で検索する）
+- 想定したインデックスが使われること
+- 推定コストが上限以下であること
+
+上限は投入データ（conftest.py）に対する推定コストに余裕を持たせた値とする。
+インデックスや文を変更して計画が変わった場合は、EXPLAIN の結果を確認してから
+更新すること。
+"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.daily_report import ReportStatus
+from app.read_models.customer_read_model import CustomerReadModel
+from app.read_models.report_read_model import ReportReadModel
+from app.read_models.user_read_model import UserReadModel
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
+from tests.test_plans.conftest import ExplainQueries
+
+# 件数が多く、全件走査が許容されないテーブル
+_LARGE_TABLES = {"daily_reports", "visit_records", "comments"}
+
+_TODAY = date.today()
+# 一覧の既定の検索期間（当月）に相当する期間。日付でコストが変わらないよう固定長にする
+_MONTH_AGO = _TODAY - timedelta(days=30)
+# 投入データで最初に作成される担当者・日報・顧客のID
+_SALESPERSON_ID = 1
+_REPORT_ID = 1
+_CUSTOMER_ID = 1
+
+
+@dataclass
+class PlanCase:
+    operation: Callable[[AsyncSession], Awaitable[Any]]
+    max_cost: float
+    indexes: set[str] = field(default_factory=set)
+
+
+_CASES = {
+    "日報一覧_担当者": PlanCase(
+        lambda db: ReportReadModel(db).find_list(
+            salesperson_id=_SALESPERSON_ID, date_from=_MONTH_AGO, date_to=_TODAY
+        ),
+        indexes={"uq_salesperson_date", "ix_visit_records_daily_report_id"},
+        max_cost=500,
+    ),
+    "日報一覧_上長": PlanCase(
+        lambda db: ReportReadModel(db).find_list(date_from=_MONTH_AGO, date_to=_TODAY),
+        indexes={"ix_daily_reports_report_date", "ix_visit_records_daily_report_id"},
+        max_cost=500,
+    ),
+    "日報一覧_上長_ステータス": PlanCase(
+        lambda db: ReportReadModel(db).find_list(
+            date_from=_MONTH_AGO, date_to=_TODAY, status=ReportStatus.SUBMITTED
+        ),
+        indexes={"ix_daily_reports_report_date"},
+        max_cost=6000,
+    ),
+    "日報一覧_上長_提出日時順": PlanCase(
+        lambda db: ReportReadModel(db).find_list(
+            date_from=_MONTH_AGO, date_to=_TODAY, sort="submitted_at", order="asc"
+        ),
+        indexes={"ix_daily_reports_report_date"},
+        max_cost=6000,
+    ),
+    "日報詳細": PlanCase(
+        lambda db: ReportRepository(db).find_by_id(_REPORT_ID),
+        indexes={
+            "daily_reports_pkey",
+            "ix_visit_records_daily_report_id",
+            "ix_comments_daily_report_id",
+        },
+        max_cost=300,
+    ),
+    "日報重複確認": PlanCase(
+        lambda db: ReportRepository(db).find_by_salesperson_and_date(
+            _SALESPERSON_ID, _TODAY
+        ),
+        indexes={"uq_salesperson_date"},
+        max_cost=50,
+    ),
+    "顧客一覧": PlanCase(
+        lambda db: CustomerReadModel(db).find_list(),
+        max_cost=6000,
+    ),
+    "顧客一覧_会社名検索": PlanCase(
+        lambda db: CustomerReadModel(db).find_list(company_name="株式会社"),
+        max_cost=6000,
+    ),
+    "顧客詳細": PlanCase(
+        lambda db: CustomerRepository(db).find_by_id(_CUSTOMER_ID),
+        indexes={"customers_pkey"},
+        max_cost=50,
+    ),
+    "顧客使用中確認": PlanCase(
+        lambda db: CustomerRepository(db).has_visit_records(_CUSTOMER_ID),
+        indexes={"ix_visit_records_customer_id"},
+        max_cost=50,
+    ),
+    "ユーザー取得_メールアドレス": PlanCase(
+        lambda db: UserRepository(db).find_by_email("sales1@example.com"),
+        max_cost=50,
+    ),
+    "ユーザー一覧": PlanCase(
+        lambda db: UserReadModel(db).find_list(),
+        max_cost=100,
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(_CASES))
+async def test_実行計画が基準を満たすこと(name: str, explain_queries: ExplainQueries):
+    case = _CASES[name]
+
+    plans = await explain_queries(case.operation)
+
+    assert plans, "SELECT が発行されていません"
+    for plan in plans:
+        seq_scanned = plan.seq_scanned_tables() & _LARGE_TABLES
+        assert not seq_scanned, (
+            f"{seq_scanned} を Seq Scan しています:\n{plan.describe()}"
+        )
+        assert plan.total_cost <= case.max_cost, (
+            f"推定コスト {plan.total_cost} が上限 {case.max_cost} を超えています:\n"
+            + plan.describe()
+        )
+    used = set().union(*(plan.index_names() for plan in plans))
+    assert case.indexes <= used, f"{case.indexes - used} が使われていません"
@@ -0,0 +1,71 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.read_models.customer_read_model import (
+    CustomerReadModel,
+    _build_list_statements,
+)
+from app.schemas.customer import CustomerListItemResponse
+from tests.helpers import create_customer
+
+
+class TestFindList:
+    async def test_ORM経由のレスポンスと同じ形式に変換されること(
+        self, db_session: AsyncSession
+    ):
+        customer = await create_customer(
+            db_session, phone="03-0000-0000", email="info@example.com"
+        )
+
+        rows, total = await CustomerReadModel(db_session).find_list()
+
+        assert total == 1
+        assert rows[0].to_response() == (
+            CustomerListItemResponse.model_validate(customer).model_dump(mode="json")
+        )
+
+    async def test_会社名の部分一致と並び順が適用されること(
+        self, db_session: AsyncSession
+    ):
+        await create_customer(db_session, company_name="株式会社ABC")
+        await create_customer(db_session, company_name="XYZ商事")
+        await create_customer(db_session, company_name="ABCホールディングス")
+
+        rows, total = await CustomerReadModel(db_session).find_list(
+            company_name="ABC", order="desc"
+        )
+
+        assert total == 2
+        assert [r.company_name for r in rows] == [
+            "株式会社ABC",
+            "ABCホールディングス",
+        ]
+
+    async def test_キャッシュ済みの文でも呼び出しごとの検索語が使われること(
+        self, db_session: AsyncSession
+    ):
+        await create_customer(db_session, company_name="株式会社ABC")
+        await create_customer(db_session, company_name="XYZ商事")
+        read_model = CustomerReadModel(db_session)
+
+        abc, abc_total = await read_model.find_list(company_name="abc")
+        hits = _build_list_statements.cache_info().hits
+        xyz, xyz_total = await read_model.find_list(company_name="XYZ")
+
+        assert _build_list_statements.cache_info().hits == hits + 1
+        assert (abc_total, [c.company_name for c in abc]) == (1, ["株式会社ABC"])
+        assert (xyz_total, [c.company_name for c in xyz]) == (1, ["XYZ商事"])
+
+    async def test_会社名と担当者名の両方で絞り込めること(
+        self, db_session: AsyncSession
+    ):
+        await create_customer(
+            db_session, company_name="株式会社ABC", contact_name="鈴木"
+        )
+        await create_customer(db_session, company_name="ABC商事", contact_name="佐藤")
+
+        rows, total = await CustomerReadModel(db_session).find_list(
+            company_name="ABC", contact_name="佐藤"
+        )
+
+        assert total == 1
+        assert rows[0].company_name == "ABC商事"
@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.reports import _build_list_item
+from app.models.daily_report import ReportStatus
+from app.read_models.report_read_model import ReportReadModel, _build_list_statements
+from app.repositories.report_repository import ReportRepository
+from tests.helpers import (
+    create_customer,
+    create_report,
+    create_user,
+    create_visit_record,
+)
+
+
+class TestFindList:
+    async def test_ORM経由のレスポンスと同じ形式に変換されること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        customer = await create_customer(db_session)
+        report = await create_report(db_session, user, status=ReportStatus.SUBMITTED)
+        await create_visit_record(db_session, report, customer)
+        await create_visit_record(db_session, report, customer, visit_order=2)
+        await create_report(
+            db_session, user, report_date=date.today() - timedelta(days=1)
+        )
+
+        rows, total = await ReportReadModel(db_session).find_list()
+        repo = ReportRepository(db_session)
+        reports = [await repo.find_by_id(r.id) for r in rows]
+
+        assert total == 2
+        assert [r.to_response() for r in rows] == [_build_list_item(r) for r in reports]
+        assert rows[0].visit_count == 2
+
+    async def test_検索条件で絞り込めること(self, db_session: AsyncSession):
+        user1 = await create_user(db_session)
+        user2 = await create_user(db_session, email="other@example.com", name="他人")
+        await create_report(db_session, user1, status=ReportStatus.SUBMITTED)
+        await create_report(
+            db_session, user1, report_date=date.today() - timedelta(days=1)
+        )
+        await create_report(db_session, user2, status=ReportStatus.SUBMITTED)
+
+        rows, total = await ReportReadModel(db_session).find_list(
+            salesperson_id=user1.id, status=ReportStatus.SUBMITTED
+        )
+
+        assert total == 1
+        assert rows[0].salesperson_id == user1.id
+        assert rows[0].status == ReportStatus.SUBMITTED
+
+    async def test_ページネーションが適用されること(self, db_session: AsyncSession):
+        user = await create_user(db_session)
+        for days in range(3):
+            await create_report(
+                db_session, user, report_date=date.today() - timedelta(days=days)
+            )
+
+        rows, total = await ReportReadModel(db_session).find_list(
+            order="asc", page=2, per_page=2
+        )
+
+        assert total == 3
+        assert [r.report_date for r in rows] == [date.today()]
+
+    async def test_キャッシュ済みの文でも呼び出しごとの検索条件が使われること(
+        self, db_session: AsyncSession
+    ):
+        user1 = await create_user(db_session)
+        user2 = await create_user(db_session, email="other@example.com", name="他人")
+        await create_report(db_session, user1)
+        await create_report(
+            db_session, user2, report_date=date.today() - timedelta(days=1)
+        )
+        read_model = ReportReadModel(db_session)
+
+        rows1, total1 = await read_model.find_list(salesperson_id=user1.id)
+        hits = _build_list_statements.cache_info().hits
+        rows2, total2 = await read_model.find_list(salesperson_id=user2.id)
+
+        assert _build_list_statements.cache_info().hits == hits + 1
+        assert (total1, [r.salesperson_id for r in rows1]) == (1, [user1.id])
+        assert (total2, [r.salesperson_id for r in rows2]) == (1, [user2.id])
+
+    async def test_複数の検索条件を組み合わせて絞り込めること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        today = date.today()
+        await create_report(db_session, user, report_date=today)
+        await create_report(
+            db_session,
+            user,
+            report_date=today - timedelta(days=1),
+            status=ReportStatus.SUBMITTED,
+        )
+        await create_report(
+            db_session,
+            user,
+            report_date=today - timedelta(days=10),
+            status=ReportStatus.SUBMITTED,
+        )
+
+        rows, total = await ReportReadModel(db_session).find_list(
+            date_from=today - timedelta(days=5),
+            date_to=today,
+            status=ReportStatus.SUBMITTED,
+        )
+
+        assert total == 1
+        assert rows[0].report_date == today - timedelta(days=1)
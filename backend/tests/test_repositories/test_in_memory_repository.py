@@ -0,0 +1,282 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.comment import Comment, CommentTarget
+from app.models.customer import Customer
+from app.models.daily_report import DailyReport, ReportStatus
+from app.models.user import User, UserRole
+from app.models.visit_record import VisitRecord
+from app.read_models.customer_read_model import CustomerReadModel
+from app.read_models.in_memory import InMemoryCustomerReadModel, InMemoryReportReadModel
+from app.read_models.report_read_model import ReportReadModel
+from app.repositories.in_memory import (
+    InMemoryReportRepository,
+    InMemoryStore,
+    InMemoryUserRepository,
+)
+from tests.helpers import create_customer, create_report, create_user
+
+
+def _user(email: str = "tanaka@example.com", role: UserRole = UserRole.SALES) -> User:
+    return User(name="田中太郎", email=email, password_hash="x", role=role)
+
+
+def _visit(report: DailyReport, customer: Customer) -> VisitRecord:
+    return VisitRecord(
+        daily_report_id=report.id,
+        customer_id=customer.id,
+        visit_content="訪問",
+        visited_at=datetime(1970, 1, 1, 10, 0),
+        visit_order=1,
+    )
+
+
+@pytest.fixture
+def store() -> InMemoryStore:
+    return InMemoryStore()
+
+
+@pytest.fixture
+def seeded(store: InMemoryStore) -> tuple[User, Customer, DailyReport]:
+    user = _user()
+    store.add(user)
+    customer = Customer(company_name="テスト株式会社", contact_name="テスト担当")
+    store.add(customer)
+    report = DailyReport(salesperson_id=user.id, report_date=date.today())
+    store.add(report)
+    return user, customer, report
+
+
+class TestInMemoryStore:
+    def test_採番した主キーと既定値がインスタンスに反映されること(
+        self, seeded: tuple[User, Customer, DailyReport]
+    ):
+        _, _, report = seeded
+
+        assert report.id == 1
+        assert report.status == ReportStatus.DRAFT
+        assert report.created_at is not None
+        assert report.submitted_at is None
+
+    def test_担当者と報告日が重複するとIntegrityErrorが発生すること(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        user, _, _ = seeded
+
+        with pytest.raises(IntegrityError):
+            store.add(DailyReport(salesperson_id=user.id, report_date=date.today()))
+
+    def test_更新で報告日が重複するとIntegrityErrorが発生すること(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        user, _, report = seeded
+        other = DailyReport(
+            salesperson_id=user.id, report_date=date.today() - timedelta(days=1)
+        )
+        store.add(other)
+
+        other.report_date = report.report_date
+        with pytest.raises(IntegrityError):
+            store.update(other)
+
+        saved = store.get(DailyReport, other.id)
+        assert saved.report_date == date.today() - timedelta(days=1)
+
+    def test_メールアドレスが重複するとIntegrityErrorが発生すること(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        with pytest.raises(IntegrityError):
+            store.add(_user())
+
+    def test_存在しない参照先を指定するとIntegrityErrorが発生すること(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        _, customer, report = seeded
+        visit = _visit(report, customer)
+        visit.customer_id = 999
+
+        with pytest.raises(IntegrityError):
+            store.add(visit)
+
+    def test_必須の列がNoneの場合はIntegrityErrorが発生すること(
+        self, store: InMemoryStore
+    ):
+        with pytest.raises(IntegrityError):
+            store.add(Customer(company_name="テスト株式会社"))
+
+    def test_日報を削除すると訪問記録とコメントも削除されること(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        user, customer, report = seeded
+        manager = _user("manager@example.com", UserRole.MANAGER)
+        store.add(manager)
+        store.add(_visit(report, customer))
+        store.add(
+            Comment(
+                daily_report_id=report.id,
+                manager_id=manager.id,
+                target=CommentTarget.PROBLEM,
+                content="確認しました",
+            )
+        )
+
+        store.delete(DailyReport, report.id)
+
+        assert store.get(DailyReport, report.id) is None
+        assert store.find_by(VisitRecord, "daily_report_id", report.id) == []
+        assert store.find_by(Comment, "daily_report_id", report.id) == []
+        assert store.count_by(VisitRecord, "customer_id", customer.id) == 0
+
+    def test_参照されている行を削除するとIntegrityErrorが発生し何も削除されないこと(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        user, customer, report = seeded
+        store.add(_visit(report, customer))
+
+        with pytest.raises(IntegrityError):
+            store.delete(Customer, customer.id)
+        with pytest.raises(IntegrityError):
+            store.delete(User, user.id)
+
+        assert store.get(Customer, customer.id) is not None
+        assert store.count_by(VisitRecord, "daily_report_id", report.id) == 1
+
+    def test_updateを呼ぶまで変更が保存されないこと(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        _, _, report = seeded
+
+        report.problem = "変更後"
+        assert store.get(DailyReport, report.id).problem is None
+
+        store.update(report)
+        assert store.get(DailyReport, report.id).problem == "変更後"
+
+
+class TestInMemoryRepositories:
+    async def test_日報詳細にDB版と同じリレーションが設定されること(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        user, customer, report = seeded
+        store.add(_visit(report, customer))
+
+        found = await InMemoryReportRepository(store).find_by_id(report.id)
+
+        assert found.salesperson.name == user.name
+        assert [vr.customer.company_name for vr in found.visit_records] == [
+            customer.company_name
+        ]
+        assert found.comments == []
+
+    async def test_顧客の部分一致検索は大文字小文字を区別しないこと(
+        self, store: InMemoryStore
+    ):
+        store.add(Customer(company_name="ABC Trading", contact_name="担当"))
+        store.add(Customer(company_name="XYZ", contact_name="担当"))
+
+        customers, total = await InMemoryCustomerReadModel(store).find_list(
+            company_name="abc"
+        )
+
+        assert total == 1
+        assert customers[0].company_name == "ABC Trading"
+
+    async def test_ユーザーをメールアドレスとIDで取得できること(
+        self, store: InMemoryStore, seeded: tuple[User, Customer, DailyReport]
+    ):
+        user, _, _ = seeded
+        repo = InMemoryUserRepository(store)
+
+        assert (await repo.find_by_email(user.email)).id == user.id
+        assert (await repo.find_by_id(user.id)).email == user.email
+        assert await repo.find_by_email("notexist@example.com") is None
+
+
+class TestDatabaseParity:
+    """同じデータに対してDB版と同じ結果を返すこと。"""
+
+    @pytest.mark.parametrize(
+        "criteria",
+        [
+            {},
+            {"sort": "status", "order": "asc"},
+            {"sort": "status", "order": "desc"},
+            {"sort": "submitted_at", "order": "asc"},
+            {"sort": "submitted_at", "order": "desc"},
+            {"status": ReportStatus.SUBMITTED},
+            {"date_from": date.today() - timedelta(days=1), "per_page": 1},
+            {"page": 2, "per_page": 2, "order": "asc"},
+        ],
+    )
+    async def test_日報一覧の絞り込みと並び順がDB版と一致すること(
+        self, db_session: AsyncSession, store: InMemoryStore, criteria: dict
+    ):
+        db_user = await create_user(db_session)
+        memory_user = _user()
+        store.add(memory_user)
+        for days, status, submitted_hour in (
+            (0, ReportStatus.DRAFT, None),
+            (1, ReportStatus.SUBMITTED, 9),
+            (2, ReportStatus.REVIEWED, 18),
+        ):
+            report_date = date.today() - timedelta(days=days)
+            submitted_at = (
+                None
+                if submitted_hour is None
+                else datetime.combine(report_date, datetime.min.time()).replace(
+                    hour=submitted_hour
+                )
+            )
+            db_report = await create_report(
+                db_session, db_user, report_date=report_date, status=status
+            )
+            db_report.submitted_at = submitted_at
+            store.add(
+                DailyReport(
+                    salesperson_id=memory_user.id,
+                    report_date=report_date,
+                    status=status,
+                    submitted_at=submitted_at,
+                )
+            )
+        await db_session.commit()
+
+        def _summary(reports):
+            return [(r.report_date, r.status, r.submitted_at) for r in reports]
+
+        db_rows, db_total = await ReportReadModel(db_session).find_list(**criteria)
+        memory_rows, memory_total = await InMemoryReportReadModel(store).find_list(
+            **criteria
+        )
+
+        assert _summary(memory_rows) == _summary(db_rows)
+        assert memory_total == db_total
+
+    async def test_顧客一覧の検索とソートがDB版と一致すること(
+        self, db_session: AsyncSession, store: InMemoryStore
+    ):
+        for company_name, contact_name in (
+            ("ABC商事", "佐藤"),
+            ("abc工業", "伊藤"),
+            ("XYZ", "渡辺"),
+        ):
+            await create_customer(
+                db_session, company_name=company_name, contact_name=contact_name
+            )
+            store.add(Customer(company_name=company_name, contact_name=contact_name))
+
+        criteria = {"company_name": "aBc", "sort": "contact_name", "order": "desc"}
+        db_customers, db_total = await CustomerReadModel(db_session).find_list(
+            **criteria
+        )
+        memory_customers, memory_total = await InMemoryCustomerReadModel(
+            store
+        ).find_list(**criteria)
+
+        assert [c.company_name for c in memory_customers] == [
+            c.company_name for c in db_customers
+        ]
+        assert memory_total == db_total
@@ -0,0 +1,202 @@
+"""インメモリのリポジトリでDBを使わずにサービスを実行するテスト。"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.core.exceptions import ConflictError
+from app.models.customer import Customer
+from app.models.daily_report import ReportStatus
+from app.models.user import User, UserRole
+from app.models.visit_record import VisitRecord
+from app.read_models.in_memory import (
+    InMemoryCustomerReadModel,
+    InMemoryReportReadModel,
+)
+from app.repositories.in_memory import (
+    InMemoryCommentRepository,
+    InMemoryCustomerRepository,
+    InMemoryReportRepository,
+    InMemoryStore,
+    InMemoryVisitRecordRepository,
+)
+from app.schemas.comment import CommentCreateRequest
+from app.schemas.report import (
+    ReportCreateRequest,
+    ReportUpdateRequest,
+    VisitRecordRequest,
+)
+from app.services.comment_service import CommentService
+from app.services.customer_service import CustomerService
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def store() -> InMemoryStore:
+    return InMemoryStore()
+
+
+@pytest.fixture
+def users(store: InMemoryStore) -> tuple[User, User]:
+    sales = User(
+        name="田中太郎",
+        email="tanaka@example.com",
+        password_hash="x",
+        role=UserRole.SALES,
+    )
+    manager = User(
+        name="山田部長",
+        email="yamada@example.com",
+        password_hash="x",
+        role=UserRole.MANAGER,
+    )
+    store.add(sales)
+    store.add(manager)
+    return sales, manager
+
+
+@pytest.fixture
+def customer(store: InMemoryStore) -> Customer:
+    customer = Customer(company_name="テスト株式会社", contact_name="テスト担当")
+    store.add(customer)
+    return customer
+
+
+def _report_service(store: InMemoryStore) -> ReportService:
+    return ReportService(
+        InMemoryReportRepository(store),
+        InMemoryVisitRecordRepository(store),
+        InMemoryReportReadModel(store),
+    )
+
+
+def _create_request(
+    customer: Customer, *, status: str = "DRAFT"
+) -> ReportCreateRequest:
+    return ReportCreateRequest(
+        report_date=date.today(),
+        visit_records=[
+            VisitRecordRequest(
+                customer_id=customer.id, visit_content="訪問", visited_at="10:00"
+            )
+        ],
+        problem="課題",
+        plan="計画",
+        status=status,
+    )
+
+
+class TestReportService:
+    async def test_作成した日報が訪問記録と担当者込みで返ること(
+        self, store: InMemoryStore, users: tuple[User, User], customer: Customer
+    ):
+        sales, _ = users
+
+        report = await _report_service(store).create(_create_request(customer), sales)
+
+        assert report.salesperson.name == sales.name
+        assert [vr.customer.id for vr in report.visit_records] == [customer.id]
+        assert report.status == ReportStatus.DRAFT
+
+    async def test_同じ日付の日報を作成するとConflictErrorが発生すること(
+        self, store: InMemoryStore, users: tuple[User, User], customer: Customer
+    ):
+        sales, _ = users
+        service = _report_service(store)
+        await service.create(_create_request(customer), sales)
+
+        with pytest.raises(ConflictError):
+            await service.create(_create_request(customer), sales)
+
+    async def test_更新で訪問記録が洗い替えされること(
+        self, store: InMemoryStore, users: tuple[User, User], customer: Customer
+    ):
+        sales, _ = users
+        service = _report_service(store)
+        report = await service.create(_create_request(customer), sales)
+
+        updated = await service.update(
+            report.id,
+            ReportUpdateRequest(
+                report_date=date.today() - timedelta(days=1),
+                visit_records=[
+                    VisitRecordRequest(
+                        customer_id=customer.id,
+                        visit_content=f"訪問{i}",
+                        visited_at=f"1{i}:00",
+                    )
+                    for i in range(2)
+                ],
+                problem="課題",
+                plan="計画",
+                status="SUBMITTED",
+            ),
+            sales,
+        )
+
+        assert [vr.visit_content for vr in updated.visit_records] == ["訪問0", "訪問1"]
+        assert store.count_by(VisitRecord, "daily_report_id", report.id) == 2
+        assert updated.submitted_at is not None
+
+    async def test_提出と確認でステータスが遷移すること(
+        self, store: InMemoryStore, users: tuple[User, User], customer: Customer
+    ):
+        sales, manager = users
+        service = _report_service(store)
+        report = await service.create(_create_request(customer), sales)
+
+        await service.submit(report.id, sales)
+        reviewed = await service.review(report.id, manager)
+
+        assert reviewed.status == ReportStatus.REVIEWED
+        rows, total = await service.get_list_rows(manager, status="REVIEWED")
+        assert total == 1
+        assert rows[0].visit_count == 1
+
+    async def test_日報を削除すると訪問記録も削除されること(
+        self, store: InMemoryStore, users: tuple[User, User], customer: Customer
+    ):
+        sales, _ = users
+        service = _report_service(store)
+        report = await service.create(_create_request(customer), sales)
+
+        await service.delete(report.id, sales)
+
+        assert store.count_by(VisitRecord, "customer_id", customer.id) == 0
+
+
+class TestCommentService:
+    async def test_コメントが投稿者込みで返ること(
+        self, store: InMemoryStore, users: tuple[User, User], customer: Customer
+    ):
+        sales, manager = users
+        report = await _report_service(store).create(
+            _create_request(customer, status="SUBMITTED"), sales
+        )
+        service = CommentService(
+            InMemoryCommentRepository(store), InMemoryReportRepository(store)
+        )
+
+        comment = await service.create(
+            report.id,
+            CommentCreateRequest(target="PROBLEM", content="確認しました"),
+            manager,
+        )
+
+        assert comment.id is not None
+        assert comment.manager.name == manager.name
+        assert isinstance(comment.created_at, datetime)
+
+
+class TestCustomerService:
+    async def test_訪問記録で使用中の顧客を削除するとConflictErrorが発生すること(
+        self, store: InMemoryStore, users: tuple[User, User], customer: Customer
+    ):
+        sales, _ = users
+        await _report_service(store).create(_create_request(customer), sales)
+        service = CustomerService(
+            InMemoryCustomerRepository(store), InMemoryCustomerReadModel(store)
+        )
+
+        with pytest.raises(ConflictError):
+            await service.delete(customer.id)
@@ -1,16 +1,19 @@
 from datetime import date, timedelta
 
 import pytest
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import (
     ConflictError,
     ForbiddenError,
     NotFoundError,
+    ServiceUnavailableError,
     ValidationError,
 )
 from app.models.daily_report import ReportStatus
 from app.models.user import UserRole
+from app.read_models.report_read_model import ReportReadModel
 from app.repositories.report_repository import ReportRepository
 from app.repositories.visit_record_repository import (
     VisitRecordRepository,
@@ -25,26 +28,27 @@ from tests.helpers import create_customer, create_report, create_user
 
 
 def _build_service(db: AsyncSession) -> ReportService:
-    return ReportService(ReportRepository(db), VisitRecordRepository(db))
+    return ReportService(
+        ReportRepository(db),
+        VisitRecordRepository(db),
+        ReportReadModel(db),
+    )
 
 
-class TestGetList:
-    async def test_SALESは自分の日報のみ取得できること(self, db_session: AsyncSession):
+class TestGetListRows:
+    async def test_SALESは自分の日報のレコードのみ取得できること(
+        self, db_session: AsyncSession
+    ):
         user1 = await create_user(db_session)
         user2 = await create_user(db_session, email="other@example.com", name="他人")
         await create_report(db_session, user1)
-        await create_report(
-            db_session,
-            user2,
-            report_date=date.today() - timedelta(days=1),
-        )
+        await create_report(db_session, user2)
         service = _build_service(db_session)
 
-        reports, total = await service.get_list(user1)
+        rows, total = await service.get_list_rows(user1, salesperson_id=user2.id)
 
         assert total == 1
-        assert len(reports) == 1
-        assert reports[0].salesperson_id == user1.id
+        assert rows[0].salesperson_id == user1.id
 
     async def test_MANAGERは全件取得できること(self, db_session: AsyncSession):
         user1 = await create_user(db_session)
@@ -63,7 +67,7 @@ class TestGetList:
         )
         service = _build_service(db_session)
 
-        reports, total = await service.get_list(manager)
+        rows, total = await service.get_list_rows(manager)
 
         assert total == 2
 
@@ -78,10 +82,19 @@ class TestGetList:
         )
         service = _build_service(db_session)
 
-        reports, total = await service.get_list(user, status="SUBMITTED")
+        rows, total = await service.get_list_rows(user, status="SUBMITTED")
 
         assert total == 1
-        assert reports[0].status == ReportStatus.SUBMITTED
+        assert rows[0].status == ReportStatus.SUBMITTED
+
+    async def test_無効なステータスでValidationErrorが発生すること(
+        self, db_session: AsyncSession
+    ):
+        user = await create_user(db_session)
+        service = _build_service(db_session)
+
+        with pytest.raises(ValidationError):
+            await service.get_list_rows(user, status="INVALID")
 
 
 class TestCreate:
@@ -258,6 +271,29 @@ class TestUpdate:
 
         assert "自分の日報" in exc_info.value.message
 
+    async def test_コミット後の一時的な障害は再実行せず503になること(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        user = await create_user(db_session)
+        report = await create_report(db_session, user)
+        service = _build_service(db_session)
+        update = service.report_repository.update
+
+        async def update_then_disconnect(target):
+            await update(target)
+            raise DBAPIError(
+                "SELECT 1", None, ConnectionError(), connection_invalidated=True
+            )
+
+        monkeypatch.setattr(service.report_repository, "update", update_then_disconnect)
+        request = ReportUpdateRequest(
+            report_date=report.report_date, status="SUBMITTED"
+        )
+
+        # 再実行すると提出済みの日報として ForbiddenError になる
+        with pytest.raises(ServiceUnavailableError):
+            await service.update(report.id, request, user)
+
 
 class TestDelete:
     async def test_DRAFT日報を削除できること(self, db_session: AsyncSession):
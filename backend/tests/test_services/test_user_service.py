@@ -24,7 +24,7 @@ class TestGetList:
         manager = _make_user(role=UserRole.MANAGER)
         mock_repo = AsyncMock()
         mock_repo.find_list.return_value = [manager]
-        service = UserService(mock_repo)
+        service = UserService(mock_repo, AsyncMock())
 
         result = await service.get_list(current_user=manager)
 
@@ -35,7 +35,7 @@ class TestGetList:
         manager = _make_user(role=UserRole.MANAGER)
         mock_repo = AsyncMock()
         mock_repo.find_list.return_value = []
-        service = UserService(mock_repo)
+        service = UserService(mock_repo, AsyncMock())
 
         await service.get_list(current_user=manager, role=UserRole.SALES)
 
@@ -44,7 +44,7 @@ class TestGetList:
     async def test_SALESがアクセスするとForbiddenErrorが発生すること(self):
         sales = _make_user(role=UserRole.SALES)
         mock_repo = AsyncMock()
-        service = UserService(mock_repo)
+        service = UserService(mock_repo, AsyncMock())
 
         with pytest.raises(ForbiddenError):
             await service.get_list(current_user=sales)